@@ -0,0 +1,83 @@
+"""Time syllable alignment as the syllable count grows.
+
+Usage::
+
+    python benchmarks/bench_alignment.py --sizes 100 1000 5000
+
+For each size the benchmark builds ``0.75 * size`` random notes and aligns
+``size`` syllables with the heap-based greedy splitter, a reference quadratic
+list scan (the previous implementation, skipped above ``--reference-limit``)
+and the banded dynamic-programming aligner.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from tts2sv import align
+from tts2sv.notetable import NoteTable
+
+TIMEBASE = 480
+MIN_TICKS = 120
+
+
+def make_table(count: int, seed: int = 0) -> NoteTable:
+    rng = np.random.default_rng(seed)
+    durations = rng.choice([240, 480, 960, 1920], size=count)
+    pitches = rng.integers(55, 75, size=count)
+    return NoteTable.from_durations(durations, pitches, timebase=TIMEBASE)
+
+
+def reference_expand(durations: List[int], target: int, min_ticks: int) -> List[int]:
+    """Halve the longest note by rescanning a Python list, as align.py used to."""
+    pieces = list(durations)
+    while len(pieces) < target:
+        idx = max(range(len(pieces)), key=lambda i: pieces[i])
+        longest = pieces[idx]
+        half = longest // 2
+        if longest < 2 * min_ticks or half == 0:
+            break
+        pieces[idx : idx + 1] = [longest - half, half]
+    return pieces
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 3000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--reference-limit", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'syllables':>10} {'greedy ms':>10} {'list ms':>10} {'dp ms':>10}")
+    for size in args.sizes:
+        table = make_table(max(1, int(size * 0.75)))
+        syllables = ["la"] * size
+
+        def run(mode: str):
+            return align.align_syllables_to_notes(table, syllables, bpm=120.0, min_note_beats=0.25, mode=mode)
+
+        greedy = timed(lambda: run("greedy"), args.repeat)
+        dp = timed(lambda: run("dp"), args.repeat)
+        if size <= args.reference_limit:
+            durations = table.duration.tolist()
+            reference = timed(lambda: reference_expand(durations, size, MIN_TICKS), args.repeat)
+            reference_text = f"{reference * 1e3:10.1f}"
+        else:
+            reference_text = f"{'-':>10}"
+        print(f"{size:>10} {greedy * 1e3:10.1f} {reference_text} {dp * 1e3:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
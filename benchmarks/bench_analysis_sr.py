@@ -0,0 +1,85 @@
+"""Speed and pitch agreement of analysis-rate decimation across input rates.
+
+Usage::
+
+    python benchmarks/bench_analysis_sr.py --duration 10 --engine pyin
+
+A voice-like clip (vibrato, harmonics, breath noise, pauses) is synthesised
+at 16, 22.05, 44.1 and 48 kHz. Each is analysed at its own rate and again with
+``analysis_sr`` set to 16 and 22.05 kHz (``notes.analyze``: decimation, pitch
+tracking and RMS). Agreement is measured against the native-rate analysis of
+the same input after mapping frames by time: voicing is the share of frames
+with the same voiced decision, pitch the share of frames voiced in both whose
+f0 is within 50 cents.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from tts2sv import notes
+
+INPUT_RATES = (16000, 22050, 44100, 48000)
+ANALYSIS_RATES = (None, 22050, 16000)
+
+
+def voice_clip(duration: float, sr: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(duration * sr)) / sr
+    base = 160.0 * 2 ** (np.array([0, 3, 5, 7, 5, 3]) / 12.0)[(t * 2).astype(int) % 6]
+    freq = base * 2 ** (0.4 * np.sin(2 * np.pi * 5.5 * t) / 12.0)
+    phase = 2 * np.pi * np.cumsum(freq) / sr
+    clip = sum(0.2 / k * np.sin(k * phase) for k in range(1, 8)) + 0.005 * rng.standard_normal(len(t))
+    clip[(t % 1.5) > 1.2] *= 0.02
+    return clip.astype(np.float32)
+
+
+def agreement(reference: notes.Analysis, candidate: notes.Analysis) -> tuple[float, float]:
+    ref_times = np.arange(len(reference.f0)) * reference.frame_duration
+    idx = np.clip(np.rint(ref_times / candidate.frame_duration).astype(int), 0, len(candidate.f0) - 1)
+    cand_f0 = candidate.f0[idx]
+    ref_voiced = ~np.isnan(reference.f0)
+    cand_voiced = ~np.isnan(cand_f0)
+    voicing = float(np.mean(ref_voiced == cand_voiced))
+    both = ref_voiced & cand_voiced
+    if not both.any():
+        return voicing, float("nan")
+    cents = 1200.0 * np.abs(np.log2(cand_f0[both] / reference.f0[both]))
+    return voicing, float(np.mean(cents < 50.0))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--engine", default="nccf")
+    parser.add_argument("--runs", type=int, default=1, help="Timed runs per setting (best is reported)")
+    args = parser.parse_args()
+
+    notes.analyze(voice_clip(0.5, 22050), 22050, f0_engine=args.engine)  # imports and JIT warm-up
+    print(f"{'input':>7} {'analysis':>9} {'hop':>5} {'seconds':>8} {'speed-up':>9} {'voicing':>8} {'pitch':>7}")
+    for sr in INPUT_RATES:
+        clip = voice_clip(args.duration, sr)
+        reference = None
+        native_seconds = None
+        for analysis_sr in ANALYSIS_RATES:
+            if analysis_sr is not None and analysis_sr >= sr:
+                continue
+            best = float("inf")
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                result = notes.analyze(clip, sr, f0_engine=args.engine, analysis_sr=analysis_sr)
+                best = min(best, time.perf_counter() - started)
+            if reference is None:
+                reference, native_seconds = result, best
+            voicing, pitch = agreement(reference, result)
+            label = "native" if analysis_sr is None else str(analysis_sr)
+            print(
+                f"{sr:>7} {label:>9} {result.hop_length:>5} {best:8.3f} "
+                f"{native_seconds / best:8.1f}x {voicing:8.3f} {pitch:7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Peak memory of audio loading against file length.
+
+Usage::
+
+    python benchmarks/bench_audio_memory.py --minutes 1 5 15 [--channels 2]
+
+Writes stereo 16-bit test files of each length to a temporary directory and
+loads every file in a fresh subprocess, reporting the growth of peak RSS over
+the interpreter's baseline (after numpy/soundfile are imported). ``legacy``
+is the previous float64 loader with its full-signal temporaries, ``mmap``
+the current default, ``read`` the current loader with memory mapping off.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+SR = 44100
+
+PROBE = r"""
+import json, resource, sys, time
+import numpy as np, soundfile as sf
+from tts2sv import audio
+
+def legacy(path):
+    data, sr = sf.read(path, always_2d=False)
+    if data.ndim > 1:
+        data = np.mean(data, axis=1)
+    data = data.astype(np.float32)
+    peak = float(np.max(np.abs(data)) + audio.EPS)
+    data = data / peak * audio.MAX_PEAK
+    rms = float(np.sqrt(np.mean(np.square(data)) + audio.EPS))
+    return np.clip(data * (audio.TARGET_RMS / rms), -1.0, 1.0), sr
+
+path, mode = sys.argv[1], sys.argv[2]
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+if mode == "legacy":
+    samples, sr = legacy(path)
+else:
+    samples, sr = audio.load_audio(path, mmap=(mode == "mmap"))
+elapsed = time.perf_counter() - started
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"delta_mb": (peak - base) / 1024.0, "seconds": elapsed, "output_mb": samples.nbytes / 2**20}))
+"""
+
+MODES = ("legacy", "mmap", "read")
+
+
+def write_clip(path: Path, minutes: float, channels: int) -> None:
+    rng = np.random.default_rng(0)
+    frames = int(minutes * 60 * SR)
+    with sf.SoundFile(str(path), "w", samplerate=SR, channels=channels, subtype="PCM_16") as handle:
+        for start in range(0, frames, SR * 10):
+            count = min(SR * 10, frames - start)
+            handle.write(rng.normal(0.0, 0.1, size=(count, channels)).clip(-1, 1))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1.0, 5.0, 15.0])
+    parser.add_argument("--channels", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'minutes':>8} {'file MB':>8} " + " ".join(f"{mode + ' MB':>10} {mode + ' s':>8}" for mode in MODES))
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in args.minutes:
+            path = Path(tmp) / f"clip_{minutes:g}.wav"
+            write_clip(path, minutes, args.channels)
+            row = f"{minutes:>8g} {path.stat().st_size / 2**20:8.1f} "
+            for mode in MODES:
+                completed = subprocess.run(
+                    [sys.executable, "-c", PROBE, str(path), mode],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                report = json.loads(completed.stdout)
+                row += f"{report['delta_mb']:10.1f} {report['seconds']:8.2f} "
+            print(row.rstrip())
+
+
+if __name__ == "__main__":
+    main()
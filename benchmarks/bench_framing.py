@@ -0,0 +1,85 @@
+"""Analysis front end: separate framing and full tracking versus one gated framing pass.
+
+Usage::
+
+    python benchmarks/bench_framing.py --seconds 120 --silence 0.2 0.4 0.6 [--engine nccf]
+
+Synthesises phrases separated by digital silence (``--silence`` is its share
+of the clip) and times, best of ``--repeat`` runs:
+
+* ``separate``: ``librosa.feature.rms`` plus the engine over every frame,
+  each framing the signal on its own (the previous front end);
+* ``fused``: :func:`tts2sv.notes.analyze_block`, which frames once and only
+  tracks the frames note building can use.
+
+Both must yield the same notes.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from tts2sv import f0 as f0_engines, notes
+
+SR = 22050
+
+
+def phrases(seconds: float, silence: float) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    freq = 150.0 * 2 ** ((np.floor(t * 3) * 7 % 12) / 12.0)
+    clip = 0.2 * np.sin(2 * np.pi * np.cumsum(freq) / SR)
+    clip[(t % 2.0) >= 2.0 * (1.0 - silence)] = 0.0
+    return clip.astype(np.float32)
+
+
+def best_of(repeat: int, func, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - started)
+    return result, min(timings)
+
+
+def separate(audio: np.ndarray, engine: str) -> notes.Analysis:
+    librosa = notes._load_librosa()
+    hop = notes.HOP_LENGTH
+    rms = librosa.feature.rms(y=audio, frame_length=notes.rms_frame_length_for(SR), hop_length=hop)[0]
+    fmin = float(f0_engines.midi_to_hz(notes.FMIN_MIDI))
+    fmax = float(f0_engines.midi_to_hz(notes.FMAX_MIDI))
+    track = f0_engines.get_engine(engine)(audio, SR, fmin, fmax, hop)
+    return notes.Analysis(f0=track.f0, voiced_prob=track.voiced_prob, rms=rms, sr=SR, hop_length=hop)
+
+
+def pairs(analysis: notes.Analysis, seconds: float) -> list:
+    return [(n.midi_pitch, n.duration_beats) for n in notes.build_notes(analysis, seconds, 120.0, 0.125).notes]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=120.0)
+    parser.add_argument("--silence", type=float, nargs="+", default=[0.2, 0.4, 0.6])
+    parser.add_argument("--engine", default="nccf", choices=sorted(f0_engines.FRAME_KERNELS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'silence':>8} {'tracked':>8} {'separate':>10} {'fused':>10} {'speed-up':>9}")
+    for silence in args.silence:
+        audio = phrases(args.seconds, silence)
+        separate(audio[:SR], args.engine)  # import librosa outside the timings
+
+        before, separate_sec = best_of(args.repeat, separate, audio, args.engine)
+        after, fused_sec = best_of(args.repeat, notes.analyze_block, audio, SR, args.engine)
+
+        assert pairs(before, args.seconds) == pairs(after, args.seconds), "gated tracking changed the notes"
+        tracked = notes.tracking_mask(after.rms, after.frame_duration).mean()
+        print(
+            f"{silence:>8.0%} {tracked:>8.0%} {separate_sec * 1e3:>8.0f}ms "
+            f"{fused_sec * 1e3:>8.0f}ms {separate_sec / fused_sec:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
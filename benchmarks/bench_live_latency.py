@@ -0,0 +1,98 @@
+"""Note latency of ``--stdin-pcm`` live analysis at several analysis steps.
+
+Usage::
+
+    python benchmarks/bench_live_latency.py --seconds 30 --steps 20 50 100 [--engine nccf] [--realtime]
+
+Synthesises short phrases separated by pauses and feeds them to a
+:class:`tts2sv.live.LiveSession` one step at a time. By default the stream
+is simulated: each chunk "arrives" at its audio time (or when the previous
+chunk's analysis finished, if that is later), so latencies include the
+processing time without sleeping; ``--realtime`` paces the feed with the
+wall clock instead. Reports the mean and worst latency from a note's last
+sample to its emission, the fixed look-ahead, and the share of real time
+spent analysing. The rebuilt notes must match an offline analysis.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from tts2sv import f0 as f0_engines, live, notes
+
+SR = 22050
+
+
+def phrases(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    freq = 150.0 * 2 ** ((np.floor(t * 3) * 7 % 12) / 12.0)
+    clip = 0.2 * np.sin(2 * np.pi * np.cumsum(freq) / SR)
+    clip[(t % (1 / 3)) >= 0.25] = 0.0  # 83 ms pause after every 250 ms syllable
+    return clip.astype(np.float32)
+
+
+class SimulatedClock:
+    """Stream time: a chunk arrives at its audio time, or once the previous one has been analysed."""
+
+    def __init__(self) -> None:
+        self.base = 0.0
+        self.started = time.perf_counter()
+
+    def arrive(self, audio_time: float) -> None:
+        self.base = max(audio_time, self())
+        self.started = time.perf_counter()
+
+    def __call__(self) -> float:
+        return self.base + time.perf_counter() - self.started
+
+
+def run(audio: np.ndarray, engine: str, step: int, realtime: bool) -> tuple[live.LiveSession, float]:
+    clock = time.perf_counter if realtime else SimulatedClock()
+    session = live.LiveSession(SR, f0_engine=engine, clock=clock)
+    busy = 0.0
+    started = time.perf_counter()
+    for first in range(0, audio.size, step):
+        block = audio[first : first + step]
+        due = (first + block.size) / SR
+        if realtime:
+            time.sleep(max(started + due - time.perf_counter(), 0.0))
+        else:
+            clock.arrive(due)
+        tick = time.perf_counter()
+        session.feed(block)
+        busy += time.perf_counter() - tick
+    tick = time.perf_counter()
+    session.finish()
+    busy += time.perf_counter() - tick
+    return session, busy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--steps", type=float, nargs="+", default=[20.0, 50.0, 100.0], help="Analysis steps in ms")
+    parser.add_argument("--engine", default="nccf", choices=sorted(f0_engines.FRAME_KERNELS))
+    parser.add_argument("--realtime", action="store_true", help="Feed at wall-clock pace instead of simulating it")
+    args = parser.parse_args()
+
+    audio = phrases(args.seconds)
+    offline = notes.build_notes(notes.analyze(audio, SR, f0_engine=args.engine), args.seconds, 120.0, 0.125)
+    expected = list(zip(offline.notes.pitch.tolist(), offline.notes.duration.tolist()))
+
+    print(f"{'step':>6} {'look-ahead':>11} {'notes':>6} {'mean':>9} {'max':>9} {'busy':>6}")
+    for step_ms in args.steps:
+        step = max(int(round(step_ms * SR / 1000.0)), 1)
+        session, busy = run(audio, args.engine, step, args.realtime)
+        rebuilt = notes.build_notes(session.analysis(), session.duration_sec, 120.0, 0.125)
+        assert list(zip(rebuilt.notes.pitch.tolist(), rebuilt.notes.duration.tolist())) == expected, "notes differ"
+        latency = session.latency()
+        print(
+            f"{step_ms:>4.0f}ms {session.lookahead_ms:>9.0f}ms {len(session.notes):>6} "
+            f"{latency['mean_ms']:>7.1f}ms {latency['max_ms']:>7.1f}ms {busy / args.seconds:>6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
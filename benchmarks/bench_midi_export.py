@@ -0,0 +1,62 @@
+"""Compare the native SMF writer with the music21 MIDI path.
+
+Usage::
+
+    python benchmarks/bench_midi_export.py --sizes 100 1000 10000
+
+Both writers receive the same random :class:`~tts2sv.notetable.NoteTable`
+with lyrics; the music21 timing includes building its score. music21 is
+imported once before timing so import cost is not counted.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from tts2sv import export_midi, export_musicxml
+from tts2sv.notetable import NoteTable
+
+BPM = 120.0
+
+
+def make_table(count: int, seed: int = 0) -> NoteTable:
+    rng = np.random.default_rng(seed)
+    durations = rng.choice([120, 240, 480, 960], size=count)
+    pitches = rng.integers(55, 75, size=count)
+    table = NoteTable.from_durations(durations, pitches, bpm=BPM)
+    return table.with_lyrics([f"la{idx % 7}" for idx in range(count)])
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    export_musicxml._load_music21()
+    print(f"{'notes':>8} {'native ms':>10} {'music21 ms':>11} {'speed-up':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        native_path = Path(tmp) / "native.mid"
+        m21_path = Path(tmp) / "music21.mid"
+        for size in args.sizes:
+            table = make_table(size)
+            native = timed(lambda: export_midi.export_midi(table, BPM, native_path), args.repeat)
+            m21 = timed(lambda: export_midi.export_midi_music21(table, BPM, m21_path), args.repeat)
+            print(f"{size:>8} {native * 1e3:10.1f} {m21 * 1e3:11.1f} {m21 / native:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare the streaming MusicXML writer with the music21 path.
+
+Usage::
+
+    python benchmarks/bench_musicxml_export.py --sizes 1000 10000 50000
+
+Both writers receive the same random :class:`~tts2sv.notetable.NoteTable`
+with lyrics (durations from a sixteenth to a dotted half, so many notes are
+tied across barlines). Wall time is the best of ``--repeat`` runs; peak
+memory is traced separately with ``tracemalloc``. The music21 numbers
+include building its score; music21 is imported once before timing.
+Pass ``--skip-music21-above N`` to time only the native writer on larger
+inputs (music21 needs over a minute for 10k notes and grows faster than linearly).
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from tts2sv import export_musicxml
+from tts2sv.notetable import NoteTable
+
+BPM = 120.0
+
+
+def make_table(count: int, seed: int = 0) -> NoteTable:
+    rng = np.random.default_rng(seed)
+    durations = rng.choice([120, 240, 360, 480, 600, 720, 960, 1440], size=count)
+    pitches = rng.integers(48, 76, size=count)
+    table = NoteTable.from_durations(durations, pitches, bpm=BPM)
+    return table.with_lyrics([f"la{idx % 7}" for idx in range(count)])
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_mib(func) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-music21-above", type=int, default=10000)
+    args = parser.parse_args()
+
+    export_musicxml._load_music21()
+    print(f"{'notes':>8} {'native ms':>10} {'MiB':>6} {'music21 ms':>11} {'MiB':>7} {'speed-up':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        native_path = Path(tmp) / "native.musicxml"
+        m21_path = Path(tmp) / "music21.musicxml"
+        for size in args.sizes:
+            table = make_table(size)
+            native = lambda: export_musicxml.export_musicxml(table, BPM, native_path)  # noqa: E731
+            native_sec, native_mib = timed(native, args.repeat), peak_mib(native)
+            if size > args.skip_music21_above:
+                print(f"{size:>8} {native_sec * 1e3:10.1f} {native_mib:6.1f} {'-':>11} {'-':>7} {'-':>9}")
+                continue
+            m21 = lambda: export_musicxml.export_musicxml_music21(table, BPM, m21_path)  # noqa: E731
+            m21_sec, m21_mib = timed(m21, 1), peak_mib(m21)
+            print(
+                f"{size:>8} {native_sec * 1e3:10.1f} {native_mib:6.1f} {m21_sec * 1e3:11.1f} "
+                f"{m21_mib:7.1f} {m21_sec / native_sec:8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Pitch-curve export size and speed: every frame versus the simplified curve.
+
+Usage::
+
+    python benchmarks/bench_pitch_curve.py --seconds 60 --cents 5 10 20 [--engine nccf]
+
+Analyses a synthetic melody with vibrato and glides, then exports UST and
+MIDI with one bend point per voiced frame (tolerance 0) and with the curve
+simplified at each ``--cents`` tolerance. Reports points per second, file
+sizes and the time spent simplifying and writing.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from tts2sv import export, notes, pitchcurve
+from tts2sv.align import align_syllables_to_notes
+
+SR = 22050
+BPM = 120.0
+
+
+def expressive_melody(seconds: float) -> np.ndarray:
+    """Half-second notes with 5.5 Hz vibrato and a glide into each note."""
+    t = np.arange(int(seconds * SR)) / SR
+    step, within = np.divmod(t, 0.5)
+    base = 220.0 * 2 ** ((step.astype(int) * 5 % 12) / 12.0)
+    glide = 2 ** (-np.clip(0.08 - within, 0, None) * 12.0 / 12.0)
+    freq = base * glide * 2 ** (0.3 * np.sin(2 * np.pi * 5.5 * t) / 12.0)
+    audio = 0.2 * np.sin(2 * np.pi * np.cumsum(freq) / SR)
+    audio[within > 0.45] = 0.0
+    return audio.astype(np.float32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--cents", type=float, nargs="+", default=[5.0, 10.0, 20.0])
+    parser.add_argument("--engine", default="nccf")
+    args = parser.parse_args()
+
+    audio = expressive_melody(args.seconds)
+    analysis = notes.analyze(audio, sr=SR, f0_engine=args.engine)
+    extraction = notes.build_notes(analysis, args.seconds, bpm=BPM, min_note_beats=0.125, pitch_curve=True)
+    syllables = ["la"] * len(extraction.notes)
+    table = align_syllables_to_notes(extraction.notes, syllables, bpm=BPM, min_note_beats=0.125).notes
+
+    print(f"{'tolerance':>10} {'points':>8} {'per sec':>8} {'ust KiB':>8} {'midi KiB':>9} {'simplify':>9} {'write':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for cents in [1e-9] + list(args.cents):
+            started = time.perf_counter()
+            bends = pitchcurve.note_bends(extraction.curve, table, epsilon_cents=cents, max_points_per_sec=None)
+            simplified = time.perf_counter() - started
+            started = time.perf_counter()
+            result = export.export_all(table, BPM, Path(tmp) / f"curve{cents:g}", formats=("midi", "ust"), bends=bends)
+            written = time.perf_counter() - started
+            sizes = {fmt: path.stat().st_size / 1024 for fmt, path in result.outputs.items()}
+            label = "per frame" if cents < 1e-6 else f"{cents:g} cents"
+            print(
+                f"{label:>10} {bends.points:>8} {bends.points_per_sec:>8.1f} {sizes['ust']:>8.1f} "
+                f"{sizes['midi']:>9.1f} {simplified * 1e3:>7.1f}ms {written * 1e3:>6.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
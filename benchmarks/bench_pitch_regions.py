@@ -0,0 +1,75 @@
+"""Wall time of gated, region-parallel pitch tracking against the serial path.
+
+Usage::
+
+    python benchmarks/bench_pitch_regions.py --duration 120 --engine pyin --workers 1 2 4 8
+
+A narration-like clip (phrases of a few seconds separated by pauses) is
+analysed once over the whole signal and then with ``pitch_workers`` set to
+each value of ``--workers``. The shared worker pool is started and warmed
+first (``start``, paid once per process) so ``seconds`` is the steady-state
+cost of an analysis. Agreement is reported on frames that pass the energy
+gate, the only ones note building looks at.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from tts2sv import notes, regions
+
+SR = 22050
+
+
+def narration_clip(duration: float, sr: int = SR) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(duration * sr)) / sr
+    base = 150.0 * 2 ** (np.array([0, 2, 4, 2, 0, -3]) / 12.0)[(t * 3).astype(int) % 6]
+    freq = base * 2 ** (0.3 * np.sin(2 * np.pi * 5.0 * t) / 12.0)
+    phase = 2 * np.pi * np.cumsum(freq) / sr
+    clip = sum(0.2 / k * np.sin(k * phase) for k in range(1, 6))
+    clip = clip + 0.003 * rng.standard_normal(len(t))
+    clip[(t % 4.0) > 2.5] = 0.002 * rng.standard_normal(int(((t % 4.0) > 2.5).sum()))
+    return clip.astype(np.float32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--engine", default="pyin")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    clip = narration_clip(args.duration)
+    notes.analyze(clip[:SR], SR, f0_engine=args.engine)  # imports and JIT warm-up
+
+    started = time.perf_counter()
+    serial = notes.analyze(clip, SR, f0_engine=args.engine)
+    serial_seconds = time.perf_counter() - started
+    gated = serial.rms >= notes.energy_gate(serial.rms)
+    print(f"{os.cpu_count()} CPUs, {args.duration:g}s clip, {gated.mean():.0%} of frames pass the gate")
+    print(f"{'mode':>10} {'start':>6} {'seconds':>8} {'speed-up':>9} {'voicing':>8} {'pitch':>7}")
+    print(f"{'serial':>10} {0.0:6.2f} {serial_seconds:8.2f} {1.0:8.1f}x {1.0:8.3f} {1.0:7.3f}")
+
+    for workers in args.workers:
+        started = time.perf_counter()
+        regions.warm_pool(workers)
+        start_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        result = notes.analyze(clip, SR, f0_engine=args.engine, pitch_workers=workers)
+        seconds = time.perf_counter() - started
+        voiced_serial = ~np.isnan(serial.f0) & gated
+        voiced_result = ~np.isnan(result.f0) & gated
+        both = voiced_serial & voiced_result
+        cents = 1200.0 * np.abs(np.log2(result.f0[both] / serial.f0[both]))
+        print(
+            f"{f'{workers} proc':>10} {start_seconds:6.2f} {seconds:8.2f} {serial_seconds / seconds:8.1f}x "
+            f"{np.mean(voiced_serial == voiced_result):8.3f} {np.mean(cents < 50.0):7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
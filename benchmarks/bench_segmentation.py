@@ -0,0 +1,104 @@
+"""Segmentation speed on long contours: the old frame loop versus the NumPy pass.
+
+Usage::
+
+    python benchmarks/bench_segmentation.py --hours 1 [--split-semitones 1.0 --split-frames 8]
+
+Builds a synthetic speech-like f0/RMS contour (short voiced words with
+glides, pauses and unvoiced frames) at the default ~11.6 ms hop, then times
+the original per-frame segmentation loop with per-segment medians against
+:func:`tts2sv.notes.find_note_segments`, with and without change-point
+splitting. Both must agree on every note when splitting is off.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from tts2sv import f0 as f0_engines, notes
+
+SR = 22050
+
+
+def speech_contour(frames: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Words of 10-60 frames with a glide of up to four semitones, separated by pauses."""
+    rng = np.random.default_rng(seed)
+    f0 = np.full(frames, np.nan)
+    rms = np.full(frames, 0.001, dtype=np.float32)
+    pos = 0
+    while pos < frames:
+        word = int(rng.integers(10, 60))
+        stop = min(pos + word, frames)
+        base = rng.uniform(45, 70)
+        glide = np.linspace(0, rng.uniform(-4, 4), stop - pos)
+        f0[pos:stop] = f0_engines.midi_to_hz(base + glide + rng.normal(0, 0.1, stop - pos))
+        rms[pos:stop] = rng.uniform(0.05, 0.3)
+        pos = stop + int(rng.integers(2, 40))
+    f0[rng.random(frames) < 0.05] = np.nan
+    return f0, rms
+
+
+def reference(f0: np.ndarray, rms: np.ndarray, frame_duration: float) -> list[tuple[int, int, int]]:
+    voiced = (~np.isnan(f0)) & (rms >= notes.energy_gate(rms))
+    runs, start = [], None
+    for idx, is_voiced in enumerate(voiced):
+        if is_voiced and start is None:
+            start = idx
+        elif not is_voiced and start is not None:
+            runs.append((start, idx - 1))
+            start = None
+    if start is not None:
+        runs.append((start, len(voiced) - 1))
+    merged = runs[:1]
+    for start, end in runs[1:]:
+        if (start - merged[-1][1] - 1) * frame_duration <= notes.GAP_TOLERANCE:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    kept = []
+    for start, end in merged:
+        values = f0[start : end + 1][~np.isnan(f0[start : end + 1])]
+        if end - start + 1 >= notes.MIN_FRAMES and values.size:
+            kept.append((start, end, int(np.round(f0_engines.hz_to_midi(float(np.median(values)))))))
+    return kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--split-semitones", type=float, default=1.0)
+    parser.add_argument("--split-frames", type=int, default=notes.DEFAULT_SPLIT_FRAMES)
+    args = parser.parse_args()
+
+    frames = int(args.hours * 3600 * SR / notes.HOP_LENGTH)
+    f0, rms = speech_contour(frames)
+    analysis = notes.Analysis(f0=f0, voiced_prob=np.zeros(frames), rms=rms, sr=SR)
+    seconds = frames * analysis.frame_duration
+
+    started = time.perf_counter()
+    expected = reference(f0, rms, analysis.frame_duration)
+    loop = time.perf_counter() - started
+
+    started = time.perf_counter()
+    segments = notes.find_note_segments(analysis, seconds)
+    vectorised = time.perf_counter() - started
+    got = [tuple(b) + (p,) for b, p in zip(segments.bounds.tolist(), segments.pitch.tolist())]
+    assert got == expected, "vectorised segmentation disagrees with the frame loop"
+
+    started = time.perf_counter()
+    split = notes.find_note_segments(analysis, seconds, args.split_semitones, args.split_frames)
+    splitting = time.perf_counter() - started
+
+    print(f"{frames} frames ({args.hours:g} h), {len(expected)} notes")
+    print(f"frame loop          {loop * 1e3:>9.1f} ms")
+    print(f"vectorised          {vectorised * 1e3:>9.1f} ms  ({loop / vectorised:.0f}x)")
+    print(
+        f"with splitting      {splitting * 1e3:>9.1f} ms  "
+        f"({len(split.pitch)} notes at {args.split_semitones:g} st / {args.split_frames} frames)"
+    )
+
+
+if __name__ == "__main__":
+    main()
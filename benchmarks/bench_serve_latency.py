@@ -0,0 +1,95 @@
+"""Compare cold CLI runs against requests to a warm ``tts2sv serve`` process.
+
+Usage::
+
+    python benchmarks/bench_serve_latency.py --runs 5
+
+Each cold run spawns ``python -m tts2sv.cli`` from scratch (imports, numba
+compilation and all); each warm run sends the same options to one long-lived
+server over stdio.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _write_line(path: Path, sr: int = 22050, duration: float = 2.0) -> None:
+    t = np.arange(int(sr * duration)) / sr
+    freqs = np.where(t < duration / 2, 220.0, 330.0)
+    phase = 2 * np.pi * np.cumsum(freqs) / sr
+    sf.write(path, (0.2 * np.sin(phase)).astype(np.float32), sr)
+
+
+def _cold(argv: list[str], runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "tts2sv.cli", *argv], cwd=ROOT, check=True, capture_output=True)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _warm(argv: list[str], runs: int) -> tuple[float, list[float]]:
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "tts2sv.cli", "serve"],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert proc.stdin is not None and proc.stdout is not None
+    ready = json.loads(proc.stdout.readline())
+    assert ready.get("event") == "ready", ready
+    startup = time.perf_counter() - started
+
+    timings = []
+    try:
+        for idx in range(runs):
+            started = time.perf_counter()
+            proc.stdin.write(json.dumps({"id": idx, "argv": argv}) + "\n")
+            proc.stdin.flush()
+            response = json.loads(proc.stdout.readline())
+            timings.append(time.perf_counter() - started)
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+    finally:
+        proc.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+        proc.stdin.close()
+        proc.wait(timeout=30)
+    return startup, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Conversions per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wav = Path(tmp) / "line.wav"
+        _write_line(wav)
+        argv = ["--wav", str(wav), "--text", "Hello, world!", "--out-prefix", str(Path(tmp) / "out" / "line")]
+
+        cold = _cold(argv, args.runs)
+        startup, warm = _warm(argv, args.runs)
+
+    print(f"cold CLI     : median {statistics.median(cold):.3f}s  (runs: {', '.join(f'{t:.3f}' for t in cold)})")
+    print(f"server start : {startup:.3f}s (one-off, includes warm-up)")
+    print(f"warm request : median {statistics.median(warm):.3f}s  (runs: {', '.join(f'{t:.3f}' for t in warm)})")
+    print(f"speed-up     : {statistics.median(cold) / statistics.median(warm):.1f}x per conversion")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Cost of a tempo/grid sweep versus a single conversion.
+
+Usage::
+
+    python benchmarks/bench_sweep.py --seconds 30 --points 200 [--engine nccf]
+
+Times one ``pipeline.convert`` run, one ``pipeline.run_sweep`` over
+``--points`` tempos (exporting only the winner), and the naive alternative of
+``--points`` separate conversions, estimated from the per-run time.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import soundfile as sf
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "examples"))
+
+import make_hello_wav  # noqa: E402
+
+from tts2sv import cli, pipeline  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--points", type=int, default=200)
+    parser.add_argument("--engine", default="nccf")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wav = Path(tmp) / "melody.wav"
+        sf.write(wav, make_hello_wav.generate_melody(args.seconds, 22050), 22050)
+        words = " ".join(["la"] * int(args.seconds * 2))
+        common = ["--wav", str(wav), "--text", words, "--f0-engine", args.engine, "--formats", "midi,ust"]
+
+        pipeline.warm_up()
+        started = time.perf_counter()
+        pipeline.convert(cli.parse_args(common + ["--out-prefix", str(Path(tmp) / "single")]))
+        single = time.perf_counter() - started
+
+        bpm_range = f"60:{60 + (args.points - 1) * 0.5:g}:0.5"
+        started = time.perf_counter()
+        outcome = pipeline.run_sweep(
+            cli.parse_args(common + ["--out-prefix", str(Path(tmp) / "sweep"), "--sweep-bpm", bpm_range])
+        )
+        swept = time.perf_counter() - started
+
+    best = outcome.candidates[0]
+    print(f"single run:              {single:.3f}s")
+    print(f"sweep of {len(outcome.candidates)} points:     {swept:.3f}s ({swept / single:.2f}x a single run)")
+    print(f"{len(outcome.candidates)} separate runs (est.): {single * len(outcome.candidates):.1f}s")
+    print(f"best: bpm {best.bpm:g}, grid {best.grid:g}, score {best.score:.4f}")
+
+
+if __name__ == "__main__":
+    main()
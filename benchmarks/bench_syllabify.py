@@ -0,0 +1,109 @@
+"""Syllabification throughput on a large synthetic script.
+
+Usage::
+
+    python benchmarks/bench_syllabify.py --lines 50000 [--script lines.txt]
+
+The default corpus draws words from a built-in list of common English words
+and their inflections with a Zipf distribution (fixed seed), so common words
+repeat as they do in real scripts. ``--script`` reads one line per text line instead.
+``legacy`` re-creates the pre-cache behaviour: a fresh syllabifier per line,
+uncompiled patterns, and pyphen on every word.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from typing import List
+
+import numpy as np
+
+from tts2sv import text
+
+SEED_WORDS = (
+    "the of and to a in is you that it he was for on are as with his they I at be this have from or one had by "
+    "word but not what all were we when your can said there use an each which she do how their if will up other "
+    "about out many then them these so some her would make like him into time has look two more write go see "
+    "number no way could people my than first water been call who oil its now find long down day did get come "
+    "made may part over new sound take only little work know place year live me back give most very after thing "
+    "our just name good sentence man think say great where help through much before line right too mean old any "
+    "same tell boy follow came want show also around form three small set put end does another well large must "
+    "big even such because turn here why ask went men read need land different home us move try kind hand picture "
+    "again change off play spell air away animal house point page letter mother answer found study still learn "
+    "should America world beautiful wonderful tomorrow remember together everybody understanding imagination "
+    "extraordinary conversation information dictionary melody harmony vocalist synthesizer"
+).split()
+
+
+def make_corpus(lines: int, words_per_line: int = 10, seed: int = 0) -> List[str]:
+    rng = np.random.default_rng(seed)
+    vocabulary = list(SEED_WORDS)
+    # Derived words widen the vocabulary the way inflections do in real scripts.
+    vocabulary += [word + suffix for word in SEED_WORDS for suffix in ("s", "ing", "ed")]
+    ranks = np.minimum(rng.zipf(1.3, size=lines * words_per_line), len(vocabulary)) - 1
+    words = [vocabulary[idx] for idx in ranks]
+    corpus = []
+    for start in range(0, len(words), words_per_line):
+        chunk = words[start : start + words_per_line]
+        corpus.append(" ".join(chunk).capitalize() + ".")
+    return corpus
+
+
+def legacy_syllabify(line: str, lang: str) -> List[str]:
+    dictionary = text.get_pyphen_dict(lang)
+    tokens: List[str] = []
+    for match in re.finditer(r"\w+|[^\w\s]", line.strip(), flags=re.UNICODE):
+        token = match.group(0)
+        if not re.fullmatch(r"[A-Za-z]+(?:'[A-Za-z]+)?", token):
+            tokens.append(token)
+            continue
+        hyphenated = dictionary.inserted(token) if dictionary is not None else token
+        if hyphenated != token:
+            tokens.extend(segment for segment in hyphenated.split("-") if segment)
+            continue
+        syllables = re.findall(r"[^aeiouy]*[aeiouy]+(?:[^aeiouy](?=[^aeiouy]|$))?", token, flags=re.IGNORECASE)
+        if not syllables:
+            tokens.append(token)
+            continue
+        consumed = sum(len(part) for part in syllables)
+        if consumed < len(token):
+            syllables[-1] += token[consumed:]
+        tokens.extend(syllables)
+    return tokens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--script", help="Text file with one line per TTS line")
+    parser.add_argument("--lang", default="en")
+    args = parser.parse_args()
+
+    if args.script:
+        with open(args.script, encoding="utf-8") as handle:
+            corpus = [line for line in handle if line.strip()]
+    else:
+        corpus = make_corpus(args.lines)
+    text.preload_dictionaries([args.lang])
+
+    started = time.perf_counter()
+    legacy = [legacy_syllabify(line, args.lang) for line in corpus]
+    legacy_seconds = time.perf_counter() - started
+
+    text.clear_cache()
+    started = time.perf_counter()
+    cached = text.syllabify_many(corpus, lang=args.lang)
+    cached_seconds = time.perf_counter() - started
+    stats = text.cache_stats()
+
+    assert cached == legacy, "syllabify_many disagrees with the legacy path"
+    print(f"{len(corpus)} lines, {sum(len(line) for line in legacy)} syllables")
+    print(f"legacy         {legacy_seconds:7.3f}s  {len(corpus) / legacy_seconds:10.0f} lines/s")
+    print(f"syllabify_many {cached_seconds:7.3f}s  {len(corpus) / cached_seconds:10.0f} lines/s")
+    print(f"speed-up {legacy_seconds / cached_seconds:.1f}x; word cache {stats.hits} hits / {stats.misses} misses "
+          f"({stats.hit_rate:.1%}), {stats.size} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Per-stage benchmark suite over synthetic corpora, with regression checks.
+
+Usage::
+
+    python benchmarks/suite.py run --preset standard --out results/main.json
+    python benchmarks/suite.py run --preset quick --out results/branch.json
+    python benchmarks/suite.py compare results/main.json results/branch.json --threshold 10
+
+``run`` writes each corpus WAV with the generators in
+``examples/make_hello_wav.py`` (pitch sweeps, stepped melodies, noisy
+melodies) and times every pipeline stage separately: ``load_audio``,
+``extract_notes``, ``syllabify_text``, ``align_syllables_to_notes`` and each
+exporter. The best of ``--repeat`` runs is kept. Results are saved as JSON
+keyed ``<corpus>/<stage>``.
+
+``compare`` prints the ratio of every shared key. It exits with status 1 when
+any stage is slower than the baseline by more than ``--threshold`` percent
+and by more than ``--min-seconds``, which filters out timer noise on
+sub-millisecond stages.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import soundfile as sf
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "examples"))
+
+import make_hello_wav  # noqa: E402
+
+from tts2sv import align, audio, export_midi, export_musicxml, export_ust, notes, text  # noqa: E402
+
+CHUNK_SECONDS = 60.0
+BPM = 120.0
+MIN_NOTE_BEATS = 0.125
+LYRICS = "la li lu le lo".split()
+
+
+@dataclass(frozen=True)
+class Corpus:
+    kind: str
+    duration: float
+    sr: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}-{self.duration:g}s-{self.sr // 1000 if self.sr % 1000 == 0 else self.sr / 1000:g}k"
+
+
+def _grid(kinds, durations, rates) -> List[Corpus]:
+    return [Corpus(kind, duration, sr) for duration in durations for sr in rates for kind in kinds]
+
+
+KINDS = ("sweep", "melody", "noisy")
+PRESETS: Dict[str, List[Corpus]] = {
+    "quick": _grid(KINDS, (1.0, 10.0), (22050,)),
+    "standard": _grid(KINDS, (1.0, 10.0, 60.0), (16000, 22050, 44100, 48000)),
+    "full": _grid(KINDS, (1.0, 10.0, 60.0, 600.0, 3600.0), (16000, 22050, 44100, 48000)),
+}
+
+
+def generate_chunk(corpus: Corpus, duration: float, offset: float) -> np.ndarray:
+    if corpus.kind == "sweep":
+        return make_hello_wav.generate_sweep(duration, corpus.sr, offset=offset)
+    melody = make_hello_wav.generate_melody(duration, corpus.sr, offset=offset)
+    if corpus.kind == "noisy":
+        return make_hello_wav.add_noise(melody, level=0.02, seed=int(offset))
+    return melody
+
+
+def write_corpus(corpus: Corpus, directory: Path) -> Path:
+    path = directory / f"{corpus.name}.wav"
+    if path.exists():
+        return path
+    with sf.SoundFile(str(path), "w", samplerate=corpus.sr, channels=1, subtype="PCM_16") as handle:
+        offset = 0.0
+        while offset < corpus.duration:
+            length = min(CHUNK_SECONDS, corpus.duration - offset)
+            handle.write(generate_chunk(corpus, length, offset))
+            offset += length
+    return path
+
+
+def best_of(func: Callable[[], object], repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def bench_corpus(corpus: Corpus, path: Path, out_dir: Path, engine: str, repeat: int) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    timings["load_audio"], (samples, sr) = best_of(lambda: audio.load_audio(path), repeat)
+    timings["extract_notes"], extraction = best_of(
+        lambda: notes.extract_notes(samples, sr=sr, bpm=BPM, min_note_beats=MIN_NOTE_BEATS, f0_engine=engine),
+        repeat,
+    )
+    # Roughly one syllable per detected note, plus some slack so splitting is exercised.
+    words = [LYRICS[idx % len(LYRICS)] for idx in range(int(len(extraction.notes) * 1.2) + 1)]
+    line = " ".join(words)
+
+    def syllabify():
+        text.clear_cache()
+        return text.syllabify_text(line)
+
+    timings["syllabify_text"], syllables = best_of(syllabify, repeat)
+    timings["align_syllables_to_notes"], alignment = best_of(
+        lambda: align.align_syllables_to_notes(extraction.notes, syllables, bpm=BPM, min_note_beats=MIN_NOTE_BEATS),
+        repeat,
+    )
+    prefix = out_dir / corpus.name
+    timings["export_musicxml"], _ = best_of(
+        lambda: export_musicxml.export_musicxml(alignment.notes, bpm=BPM, out_path=prefix.with_suffix(".musicxml")),
+        repeat,
+    )
+    timings["export_midi"], _ = best_of(
+        lambda: export_midi.export_midi(alignment.notes, bpm=BPM, out_path=prefix.with_suffix(".mid")),
+        repeat,
+    )
+    timings["export_ust"], _ = best_of(
+        lambda: export_ust.export_ust(alignment.notes, bpm=BPM, timebase=480, out_path=prefix.with_suffix(".ust")),
+        repeat,
+    )
+    return timings
+
+
+def run(args: argparse.Namespace) -> int:
+    corpora = PRESETS[args.preset]
+    if args.max_duration is not None:
+        corpora = [corpus for corpus in corpora if corpus.duration <= args.max_duration]
+
+    # Warm up imports and JIT compilation so the first corpus is not penalised.
+    warm = make_hello_wav.generate_sine(0.5)
+    notes.extract_notes(warm, sr=22050, bpm=BPM, min_note_beats=MIN_NOTE_BEATS, f0_engine=args.engine)
+    text.preload_dictionaries()
+
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = Path(args.corpus_dir) if args.corpus_dir else Path(tmp) / "corpora"
+        corpus_dir.mkdir(parents=True, exist_ok=True)
+        out_dir = Path(tmp) / "out"
+        out_dir.mkdir()
+        for corpus in corpora:
+            path = write_corpus(corpus, corpus_dir)
+            timings = bench_corpus(corpus, path, out_dir, args.engine, args.repeat)
+            for stage, seconds in timings.items():
+                results[f"{corpus.name}/{stage}"] = seconds
+            summary = "  ".join(f"{stage} {seconds * 1e3:.1f}ms" for stage, seconds in timings.items())
+            print(f"{corpus.name:<22} {summary}", flush=True)
+
+    report = {
+        "meta": {
+            "preset": args.preset,
+            "engine": args.engine,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Wrote {len(results)} timings to {out_path}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))["results"]
+    shared = sorted(set(baseline) & set(current))
+    if not shared:
+        print("No benchmarks in common between the two result files.")
+        return 1
+
+    limit = 1.0 + args.threshold / 100.0
+    regressions = []
+    width = max(len(key) for key in shared)
+    print(f"{'benchmark':<{width}} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for key in shared:
+        before, after = baseline[key], current[key]
+        ratio = after / before if before > 0 else float("inf")
+        regressed = after > before * limit and after - before > args.min_seconds
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{key:<{width}} {before * 1e3:9.2f}ms {after * 1e3:9.2f}ms {ratio:6.2f}x{marker}")
+        if regressed:
+            regressions.append(key)
+
+    for key in sorted(set(baseline) ^ set(current)):
+        print(f"{key:<{width}} only in {'baseline' if key in baseline else 'current'}")
+    if regressions:
+        print(f"{len(regressions)} of {len(shared)} benchmarks regressed by more than {args.threshold:g}%.")
+        return 1
+    print(f"No regressions beyond {args.threshold:g}% across {len(shared)} benchmarks.")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Time every stage over a corpus preset")
+    run_parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    run_parser.add_argument("--max-duration", type=float, help="Skip corpora longer than this many seconds")
+    run_parser.add_argument("--engine", default="nccf", help="f0 engine used by extract_notes")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the best is kept")
+    run_parser.add_argument("--corpus-dir", help="Keep generated WAVs here and reuse them across runs")
+    run_parser.add_argument("--out", help="Write results JSON to this path")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="Fail when a stage got slower than the baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.002, help="Ignore absolute slowdowns below this")
+    compare_parser.set_defaults(func=compare)
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
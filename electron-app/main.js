@@ -1,6 +1,7 @@
 const { app, BrowserWindow, ipcMain, dialog } = require('electron');
 const path = require('path');
 const { spawn } = require('child_process');
+const readline = require('readline');
 
 const createWindow = () => {
   const win = new BrowserWindow({
@@ -31,7 +32,7 @@ app.on('window-all-closed', () => {
 });
 
 const buildArgs = (options) => {
-  const args = ['-m', 'tts2sv.cli'];
+  const args = [];
   args.push('--wav', options.wavPath);
   args.push('--text', options.text);
   args.push('--out-prefix', options.outputPrefix);
@@ -45,47 +46,199 @@ const buildArgs = (options) => {
   return args;
 };
 
-ipcMain.handle('run-tts2sv', async (event, options) => {
-  const pythonCmd = options.pythonCommand || process.env.TTS2SV_PYTHON || 'python';
-  const args = buildArgs(options);
+// A single warm `tts2sv serve` process answers JSON-line requests so each
+// conversion skips Python start-up, imports, and numba compilation.
+let daemon = null;
 
-  event.sender.send('tts2sv-log', `$ ${pythonCmd} ${args.join(' ')}\n`);
+// Cancels the conversion in flight (a cancel op to the server, or SIGTERM to a
+// one-off process); both stop at the next analysis chunk and discard outputs.
+let cancelCurrent = null;
+
+const CANCELLED_EXIT_CODE = 130;
+
+const stopDaemon = () => {
+  if (daemon) {
+    daemon.child.kill();
+    daemon = null;
+  }
+};
+
+const startDaemon = (pythonCmd, cwd) => {
+  const child = spawn(pythonCmd, ['-m', 'tts2sv.cli', 'serve'], { cwd, env: process.env });
+  const state = {
+    child,
+    pythonCmd,
+    nextId: 1,
+    pending: new Map(),
+    ready: null,
+  };
+
+  state.ready = new Promise((resolve, reject) => {
+    const lines = readline.createInterface({ input: child.stdout });
+    lines.on('line', (line) => {
+      let message;
+      try {
+        message = JSON.parse(line);
+      } catch (err) {
+        return;
+      }
+      if (message.event === 'ready') {
+        resolve();
+        return;
+      }
+      const request = state.pending.get(message.id);
+      if (request && message.event === 'progress') {
+        request.sender.send('tts2sv-progress', message);
+        return;
+      }
+      if (request) {
+        state.pending.delete(message.id);
+        request.resolve(message);
+      }
+    });
+
+    child.stderr.on('data', (data) => {
+      state.pending.forEach((request) => request.sender.send('tts2sv-error', data.toString()));
+    });
+
+    const fail = (err) => {
+      if (daemon === state) {
+        daemon = null;
+      }
+      reject(err);
+      state.pending.forEach((request) => request.reject(err));
+      state.pending.clear();
+    };
+    child.on('error', fail);
+    child.on('close', (code) => fail(new Error(`tts2sv server exited with code ${code}`)));
+  });
 
-  return new Promise((resolve) => {
-    try {
-      const child = spawn(pythonCmd, args, {
-        cwd: options.workingDirectory || process.cwd(),
-        env: process.env,
-      });
-
-      child.stdout.on('data', (data) => {
-        event.sender.send('tts2sv-log', data.toString());
-      });
-
-      child.stderr.on('data', (data) => {
-        event.sender.send('tts2sv-error', data.toString());
-      });
-
-      child.on('close', (code) => {
-        event.sender.send('tts2sv-complete', { code });
-        resolve({ code });
-      });
-
-      child.on('error', (err) => {
-        const message = `Failed to start Python process: ${err.message}\n`;
-        event.sender.send('tts2sv-error', message);
-        event.sender.send('tts2sv-complete', { code: -1 });
-        resolve({ code: -1, error: message });
-      });
-    } catch (err) {
-      const message = `Unexpected error: ${err.message}\n`;
+  return state;
+};
+
+const getDaemon = (pythonCmd, cwd) => {
+  if (daemon && daemon.pythonCmd !== pythonCmd) {
+    stopDaemon();
+  }
+  if (!daemon) {
+    daemon = startDaemon(pythonCmd, cwd);
+  }
+  return daemon;
+};
+
+const runWithDaemon = async (event, pythonCmd, options) => {
+  const state = getDaemon(pythonCmd, options.workingDirectory || process.cwd());
+  await state.ready;
+
+  const id = state.nextId++;
+  const request = {
+    id,
+    argv: buildArgs(options),
+    cwd: options.workingDirectory || process.cwd(),
+    progress: true,
+  };
+  cancelCurrent = () => {
+    state.child.stdin.write(`${JSON.stringify({ id: state.nextId++, op: 'cancel', target: id })}\n`);
+  };
+  const response = await new Promise((resolve, reject) => {
+    state.pending.set(id, { resolve, reject, sender: event.sender });
+    state.child.stdin.write(`${JSON.stringify(request)}\n`);
+  }).finally(() => {
+    cancelCurrent = null;
+  });
+
+  if (response.cancelled) {
+    event.sender.send('tts2sv-log', 'Cancelled.\n');
+    event.sender.send('tts2sv-complete', { code: CANCELLED_EXIT_CODE, cancelled: true });
+    return { code: CANCELLED_EXIT_CODE, cancelled: true };
+  }
+  if (response.ok) {
+    event.sender.send('tts2sv-log', `${response.result.summary}\n`);
+    event.sender.send('tts2sv-complete', { code: 0 });
+    return { code: 0 };
+  }
+  event.sender.send('tts2sv-error', `${response.error}\n`);
+  event.sender.send('tts2sv-complete', { code: 1 });
+  return { code: 1, error: response.error };
+};
+
+const runOneShot = (event, pythonCmd, args, options) => new Promise((resolve) => {
+  try {
+    const child = spawn(pythonCmd, args, {
+      cwd: options.workingDirectory || process.cwd(),
+      env: process.env,
+    });
+
+    cancelCurrent = () => child.kill('SIGTERM');
+
+    // With --progress-json, progress arrives as JSON lines between the regular output.
+    const lines = readline.createInterface({ input: child.stdout });
+    lines.on('line', (line) => {
+      let message = null;
+      try {
+        message = JSON.parse(line);
+      } catch (err) {
+        // Not an event; fall through to the log.
+      }
+      if (message && message.event === 'progress') {
+        event.sender.send('tts2sv-progress', message);
+      } else if (message && message.event === 'cancelled') {
+        event.sender.send('tts2sv-log', 'Cancelled.\n');
+      } else {
+        event.sender.send('tts2sv-log', `${line}\n`);
+      }
+    });
+
+    child.stderr.on('data', (data) => {
+      event.sender.send('tts2sv-error', data.toString());
+    });
+
+    child.on('close', (code) => {
+      cancelCurrent = null;
+      const cancelled = code === CANCELLED_EXIT_CODE;
+      event.sender.send('tts2sv-complete', { code, cancelled });
+      resolve({ code, cancelled });
+    });
+
+    child.on('error', (err) => {
+      cancelCurrent = null;
+      const message = `Failed to start Python process: ${err.message}\n`;
       event.sender.send('tts2sv-error', message);
       event.sender.send('tts2sv-complete', { code: -1 });
       resolve({ code: -1, error: message });
-    }
-  });
+    });
+  } catch (err) {
+    const message = `Unexpected error: ${err.message}\n`;
+    event.sender.send('tts2sv-error', message);
+    event.sender.send('tts2sv-complete', { code: -1 });
+    resolve({ code: -1, error: message });
+  }
+});
+
+ipcMain.handle('run-tts2sv', async (event, options) => {
+  const pythonCmd = options.pythonCommand || process.env.TTS2SV_PYTHON || 'python';
+  const args = ['-m', 'tts2sv.cli', ...buildArgs(options)];
+
+  event.sender.send('tts2sv-log', `$ ${pythonCmd} ${args.join(' ')}\n`);
+
+  try {
+    return await runWithDaemon(event, pythonCmd, options);
+  } catch (err) {
+    event.sender.send('tts2sv-log', `Warm server unavailable (${err.message}); running a one-off process.\n`);
+    return runOneShot(event, pythonCmd, [...args, '--progress-json'], options);
+  }
 });
 
+ipcMain.handle('cancel-tts2sv', () => {
+  if (!cancelCurrent) {
+    return false;
+  }
+  cancelCurrent();
+  return true;
+});
+
+app.on('before-quit', stopDaemon);
+
 ipcMain.handle('choose-wav', async () => {
   const result = await dialog.showOpenDialog({
     properties: ['openFile'],
@@ -4,6 +4,7 @@ const removeExistingListeners = () => {
   ipcRenderer.removeAllListeners('tts2sv-log');
   ipcRenderer.removeAllListeners('tts2sv-error');
   ipcRenderer.removeAllListeners('tts2sv-complete');
+  ipcRenderer.removeAllListeners('tts2sv-progress');
 };
 
 contextBridge.exposeInMainWorld('tts2sv', {
@@ -11,6 +12,7 @@ contextBridge.exposeInMainWorld('tts2sv', {
   chooseOutputPrefix: () => ipcRenderer.invoke('choose-output-prefix'),
   choosePython: () => ipcRenderer.invoke('choose-python'),
   run: async (options) => ipcRenderer.invoke('run-tts2sv', options),
+  cancel: async () => ipcRenderer.invoke('cancel-tts2sv'),
   subscribe: (handlers) => {
     removeExistingListeners();
     if (handlers.onLog) {
@@ -19,6 +21,9 @@ contextBridge.exposeInMainWorld('tts2sv', {
     if (handlers.onError) {
       ipcRenderer.on('tts2sv-error', (_event, message) => handlers.onError(message));
     }
+    if (handlers.onProgress) {
+      ipcRenderer.on('tts2sv-progress', (_event, payload) => handlers.onProgress(payload));
+    }
     if (handlers.onComplete) {
       ipcRenderer.on('tts2sv-complete', (_event, payload) => handlers.onComplete(payload));
     }
@@ -1,5 +1,9 @@
 const form = document.getElementById('conversion-form');
 const runButton = document.getElementById('run-button');
+const cancelButton = document.getElementById('cancel-button');
+const progressBox = document.getElementById('progress');
+const progressBar = document.getElementById('progress-bar');
+const progressLabel = document.getElementById('progress-label');
 const clearLogButton = document.getElementById('clear-log');
 const logOutput = document.getElementById('log-output');
 const browseWavButton = document.getElementById('browse-wav');
@@ -16,19 +20,38 @@ const resetLog = () => {
   logOutput.textContent = '';
 };
 
+const STAGE_NAMES = { analyze: 'Analysing pitch', export: 'Writing files' };
+
+const showProgress = ({ stage, fraction, eta_sec: eta }) => {
+  progressBox.hidden = false;
+  progressBar.value = fraction;
+  const percent = Math.round(fraction * 100);
+  const remaining = eta != null && fraction < 1 ? `, ~${Math.ceil(eta)}s left` : '';
+  progressLabel.textContent = `${STAGE_NAMES[stage] || stage}: ${percent}%${remaining}`;
+};
+
+const setRunning = (running) => {
+  runButton.disabled = running;
+  cancelButton.disabled = !running;
+};
+
 window.tts2sv.subscribe({
   onLog: (message) => appendLog(message),
   onError: (message) => appendLog(message, 'error'),
-  onComplete: ({ code }) => {
-    appendLog(`\nProcess finished with exit code ${code}.\n`);
-    runButton.disabled = false;
+  onProgress: (payload) => showProgress(payload),
+  onComplete: ({ code, cancelled }) => {
+    appendLog(cancelled ? '\nConversion cancelled; no files were written.\n' : `\nProcess finished with exit code ${code}.\n`);
+    progressBox.hidden = true;
+    setRunning(false);
   },
 });
 
 form.addEventListener('submit', async (event) => {
   event.preventDefault();
-  runButton.disabled = true;
+  setRunning(true);
   resetLog();
+  progressBar.value = 0;
+  progressLabel.textContent = '';
 
   const wavPath = document.getElementById('wav-path').value.trim();
   const text = document.getElementById('text-input').value.trim();
@@ -42,7 +65,7 @@ form.addEventListener('submit', async (event) => {
 
   if (!wavPath || !text || !outputPrefix) {
     appendLog('Please provide WAV, text, and output prefix before running.\n', 'error');
-    runButton.disabled = false;
+    setRunning(false);
     return;
   }
 
@@ -60,7 +83,14 @@ form.addEventListener('submit', async (event) => {
     });
   } catch (err) {
     appendLog(`Run failed: ${err.message}\n`, 'error');
-    runButton.disabled = false;
+    setRunning(false);
+  }
+});
+
+cancelButton.addEventListener('click', async () => {
+  cancelButton.disabled = true;
+  if (await window.tts2sv.cancel()) {
+    appendLog('Cancelling…\n');
   }
 });
 
@@ -1,4 +1,9 @@
-"""Utility to generate the example hello.wav file used in documentation."""
+"""Utility to generate the example hello.wav file used in documentation.
+
+The other generators (sweeps, stepped melodies, noise) build the synthetic
+corpora of ``benchmarks/suite.py``. They take an ``offset`` in seconds so long
+files can be produced chunk by chunk with continuous phase.
+"""
 from __future__ import annotations
 
 import math
@@ -28,6 +33,53 @@ def generate_sine(
     return waveform.astype(np.float32)
 
 
+C_MAJOR_HZ = (261.63, 293.66, 329.63, 349.23, 392.0, 440.0, 493.88, 523.25)
+
+
+def generate_sweep(
+    duration: float = 4.0,
+    sample_rate: int = 22050,
+    low_hz: float = 110.0,
+    high_hz: float = 880.0,
+    period: float = 4.0,
+    amplitude: float = 0.2,
+    offset: float = 0.0,
+) -> np.ndarray:
+    """Exponential upward pitch sweeps from ``low_hz`` to ``high_hz``, repeating every ``period`` seconds."""
+    t = offset + np.arange(int(sample_rate * duration)) / sample_rate
+    cycles, within = np.divmod(t, period)
+    ratio = math.log(high_hz / low_hz)
+    # Closed-form phase integral keeps chunks generated at different offsets continuous.
+    per_cycle = period * (high_hz - low_hz) / ratio
+    phase = cycles * per_cycle + period * low_hz / ratio * (np.exp(ratio * within / period) - 1.0)
+    return (amplitude * np.sin(2.0 * math.pi * phase)).astype(np.float32)
+
+
+def generate_melody(
+    duration: float = 4.0,
+    sample_rate: int = 22050,
+    frequencies: tuple[float, ...] = C_MAJOR_HZ,
+    note_seconds: float = 0.5,
+    gap_seconds: float = 0.05,
+    amplitude: float = 0.2,
+    offset: float = 0.0,
+) -> np.ndarray:
+    """Stepped melody cycling through ``frequencies``, with a short silence closing each note."""
+    t = offset + np.arange(int(sample_rate * duration)) / sample_rate
+    index, within = np.divmod(t, note_seconds)
+    freqs = np.asarray(frequencies)[index.astype(np.int64) % len(frequencies)]
+    waveform = amplitude * np.sin(2.0 * math.pi * freqs * within)
+    waveform[within > note_seconds - gap_seconds] = 0.0
+    return waveform.astype(np.float32)
+
+
+def add_noise(waveform: np.ndarray, level: float = 0.02, seed: int = 0) -> np.ndarray:
+    """Add white noise at ``level`` (linear amplitude) to ``waveform``."""
+    rng = np.random.default_rng(seed)
+    noisy = waveform + level * rng.standard_normal(len(waveform)).astype(np.float32)
+    return noisy.astype(np.float32)
+
+
 def main() -> None:
     output = Path(__file__).with_name("hello.wav")
     waveform = generate_sine()
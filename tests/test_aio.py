@@ -0,0 +1,77 @@
+import asyncio
+
+import numpy as np
+import soundfile as sf
+
+from tts2sv import aio, cli, pipeline
+
+
+def _write_tone(path, freq=440.0, sr=22050, duration=0.5):
+    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
+    sf.write(path, (0.2 * np.sin(2 * np.pi * freq * t)).astype(np.float32), sr)
+
+
+def _args(tmp_path, name, wav=None):
+    return cli.parse_args(
+        [
+            "--wav", str(wav or tmp_path / f"{name}.wav"),
+            "--text", "Hello world",
+            "--out-prefix", str(tmp_path / "aio" / name),
+            "--f0-engine", "nccf",
+            "--formats", "midi,ust",
+        ]
+    )
+
+
+def test_convert_many_matches_sync_outputs(tmp_path):
+    for idx, freq in enumerate((220.0, 330.0, 440.0)):
+        _write_tone(tmp_path / f"line{idx}.wav", freq=freq)
+    jobs = [_args(tmp_path, f"line{idx}") for idx in range(3)]
+    jobs.insert(1, _args(tmp_path, "missing"))
+
+    async def collect():
+        return [outcome async for outcome in aio.convert_many(jobs, concurrency=2, prefetch=1)]
+
+    outcomes = sorted(asyncio.run(collect()), key=lambda outcome: outcome.index)
+    assert [outcome.ok for outcome in outcomes] == [True, False, True, True]
+    assert outcomes[1].result is None and outcomes[1].error
+
+    for idx in range(3):
+        sync_args = _args(tmp_path, f"line{idx}")
+        sync_args.out_prefix = str(tmp_path / "sync" / f"line{idx}")
+        expected = pipeline.convert(sync_args)
+        for suffix in (".mid", ".ust"):
+            assert (tmp_path / "aio" / f"line{idx}{suffix}").read_bytes() == (
+                tmp_path / "sync" / f"line{idx}{suffix}"
+            ).read_bytes()
+        assert outcomes[[0, 2, 3][idx]].result.note_count == expected.note_count
+
+
+def test_convert_single_line(tmp_path):
+    _write_tone(tmp_path / "one.wav")
+    result = asyncio.run(aio.convert(_args(tmp_path, "one")))
+    assert [path.name for path in result.outputs] == ["one.mid", "one.ust"]
+
+
+def test_backpressure_and_early_close(tmp_path):
+    _write_tone(tmp_path / "tone.wav")
+    pulled = []
+
+    def jobs():
+        for idx in range(20):
+            pulled.append(idx)
+            yield _args(tmp_path, f"job{idx}", wav=tmp_path / "tone.wav")
+
+    async def first_then_close():
+        stream = aio.convert_many(jobs(), concurrency=1, prefetch=1)
+        first = await stream.__anext__()
+        seen_at_first = len(pulled)
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        return first, seen_at_first
+
+    first, seen_at_first = asyncio.run(first_then_close())
+    assert first.ok
+    # Bounded queues keep the reader only a handful of lines ahead of the consumer.
+    assert seen_at_first <= 8
+    assert len(pulled) == seen_at_first
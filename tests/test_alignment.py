@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 from tts2sv import align
 from tts2sv.utils import Note
 
@@ -22,3 +25,77 @@ def test_alignment_splits_notes():
     assert len(result.notes) == 3
     assert result.splits_applied >= 2
     assert [n.lyric for n in result.notes] == syllables
+
+
+def _reference_expand(durations, target, min_ticks):
+    pieces = [[d] for d in durations]
+    splits = 0
+    while sum(len(p) for p in pieces) < target:
+        flat = [(d, i, k) for i, p in enumerate(pieces) for k, d in enumerate(p)]
+        d, i, k = max(flat, key=lambda item: (item[0], -item[1], -item[2]))
+        half = d // 2
+        if d < 2 * min_ticks or half == 0:
+            break
+        pieces[i][k : k + 1] = [d - half, half]
+        splits += 1
+    return [d for p in pieces for d in p], splits
+
+
+def test_heap_expansion_matches_linear_scan_on_ties():
+    durations = np.array([480, 960, 960, 240, 960])
+    got, pitches, splits = align._expand_notes(durations, np.arange(5), 11, 60)
+    expected, expected_splits = _reference_expand(durations.tolist(), 11, 60)
+    assert got.tolist() == expected
+    assert splits == expected_splits
+    assert pitches.tolist() == sorted(pitches.tolist())
+
+
+def test_dp_merges_extra_notes():
+    notes = [
+        Note(start_sec=0.0, duration_beats=1.0, midi_pitch=60),
+        Note(start_sec=0.0, duration_beats=1.0, midi_pitch=62),
+        Note(start_sec=0.0, duration_beats=1.0, midi_pitch=64),
+    ]
+    result = align.align_syllables_to_notes(notes, ["la", "la"], bpm=120.0, min_note_beats=0.25, mode="dp")
+    assert [n.lyric for n in result.notes] == ["la", "la"]
+    assert result.merges_applied == 1
+    assert result.filler_notes == 0
+    assert result.notes.end_tick == 3 * 480
+
+
+def test_dp_respects_onset_cues_when_merging():
+    notes = [Note(start_sec=0.0, duration_beats=1.0, midi_pitch=p) for p in (60, 62, 64)]
+    cues = align.NoteCues(onset=np.array([1.0, 1.0, 0.0]), energy=np.array([1.0, 0.2, 1.0]))
+    result = align.align_syllables_to_notes(
+        notes, ["la", "la"], bpm=120.0, min_note_beats=0.25, mode="dp", cues=cues
+    )
+    # The weak onset before the third note is the one to merge across.
+    assert result.notes.duration.tolist() == [480, 960]
+
+
+def test_dp_splits_on_the_quantisation_grid():
+    notes = [Note(start_sec=0.0, duration_beats=2.0, midi_pitch=60)]
+    result = align.align_syllables_to_notes(
+        notes, ["a", "won", "der"], bpm=120.0, min_note_beats=0.25, mode="dp"
+    )
+    assert [n.lyric for n in result.notes] == ["a", "won", "der"]
+    assert result.splits_applied == 2
+    assert result.notes.end_tick == 960
+    assert all(int(d) % 120 == 0 and d >= 120 for d in result.notes.duration)
+    assert result.notes.duration[0] < result.notes.duration[1]
+
+
+def test_dp_handles_long_sequences():
+    rng = np.random.default_rng(0)
+    notes = [Note(start_sec=0.0, duration_beats=float(b), midi_pitch=60) for b in rng.choice([0.5, 1.0, 2.0], 1500)]
+    syllables = ["la"] * 2000
+    result = align.align_syllables_to_notes(notes, syllables, bpm=120.0, min_note_beats=0.25, mode="dp")
+    assert [n.lyric for n in result.notes if n.lyric != align.FILLER_LYRIC] == syllables
+    assert result.notes.end_tick == int(sum(n.duration_beats for n in notes) * 480)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        align.align_syllables_to_notes(
+            [Note(start_sec=0.0, duration_beats=1.0, midi_pitch=60)], ["la"], bpm=120.0, min_note_beats=0.25, mode="x"
+        )
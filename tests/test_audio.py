@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from tts2sv import audio
+
+SR = 22050
+
+
+def _noise(channels):
+    rng = np.random.default_rng(0)
+    return rng.normal(0.0, 0.2, size=(SR, channels)).clip(-1.0, 1.0)
+
+
+def _legacy_load(path):
+    data, sr = sf.read(str(path), always_2d=False)
+    if data.ndim > 1:
+        data = np.mean(data, axis=1)
+    data = data.astype(np.float32)
+    data = data / (np.max(np.abs(data)) + audio.EPS) * audio.MAX_PEAK
+    rms = np.sqrt(np.mean(np.square(data)) + audio.EPS)
+    return np.clip(data * (audio.TARGET_RMS / rms), -1.0, 1.0)
+
+
+@pytest.mark.parametrize(
+    "subtype,channels,mapped",
+    [("PCM_16", 1, True), ("PCM_16", 2, True), ("PCM_32", 3, True), ("FLOAT", 2, True), ("PCM_24", 2, False)],
+)
+def test_load_audio_matches_reference(tmp_path, subtype, channels, mapped):
+    path = tmp_path / "clip.wav"
+    sf.write(path, _noise(channels), SR, subtype=subtype)
+
+    assert (audio._wav_layout(path) is not None) == mapped
+    loaded, sr = audio.load_audio(path)
+    read, _ = audio.load_audio(path, mmap=False)
+
+    assert sr == SR
+    assert loaded.dtype == np.float32 and loaded.flags.writeable
+    np.testing.assert_allclose(loaded, _legacy_load(path), atol=1e-6)
+    np.testing.assert_allclose(loaded, read, atol=1e-6)
+
+
+def test_float_mono_without_gain_is_a_read_only_view(tmp_path):
+    path = tmp_path / "clip.wav"
+    sf.write(path, _noise(1)[:, 0], SR, subtype="FLOAT")
+
+    raw, _ = audio.load_audio(path, normalise=False)
+
+    assert not raw.flags.writeable
+    assert not raw.flags.owndata
+    np.testing.assert_array_equal(raw, sf.read(str(path), dtype="float32")[0])
+
+
+def test_non_wav_falls_back_to_soundfile(tmp_path):
+    path = tmp_path / "clip.flac"
+    sf.write(path, _noise(2), SR)
+
+    loaded, sr = audio.load_audio(path)
+
+    assert sr == SR
+    np.testing.assert_allclose(loaded, _legacy_load(path), atol=1e-6)
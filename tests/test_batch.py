@@ -0,0 +1,93 @@
+import json
+
+import numpy as np
+import soundfile as sf
+
+from tts2sv import batch, cli
+
+
+def _write_tone(path, freq=440.0, sr=22050, duration=1.0):
+    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
+    sf.write(path, (0.2 * np.sin(2 * np.pi * freq * t)).astype(np.float32), sr)
+
+
+def test_read_manifest_csv_with_overrides(tmp_path):
+    manifest = tmp_path / "lines.csv"
+    manifest.write_text(
+        "wav,text,out_prefix,bpm,strict\n"
+        "a.wav,Hello,out/a,90,true\n"
+        "b.wav,World,out/b,,\n",
+        encoding="utf-8",
+    )
+    entries = batch.read_manifest(manifest)
+
+    assert [entry.line for entry in entries] == [2, 3]
+    args = cli.build_parser().parse_args(entries[0].argv)
+    assert args.wav == str(tmp_path / "a.wav")
+    assert args.out_prefix == str(tmp_path / "out" / "a")
+    assert args.bpm == 90.0
+    assert args.strict is True
+    assert "--no-strict" in entries[1].argv
+    assert "--bpm" not in entries[1].argv
+
+
+def test_read_manifest_rejects_unknown_columns(tmp_path):
+    manifest = tmp_path / "lines.jsonl"
+    manifest.write_text(json.dumps({"wav": "a.wav", "text": "Hi", "tempo": 90}) + "\n", encoding="utf-8")
+    try:
+        batch.read_manifest(manifest)
+    except batch.ManifestError as exc:
+        assert "tempo" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("unknown column accepted")
+
+
+def test_run_batch_reports_failures_without_stopping(tmp_path):
+    _write_tone(tmp_path / "good.wav")
+    manifest = tmp_path / "lines.jsonl"
+    rows = [
+        {"wav": "missing.wav", "text": "Hello", "out_prefix": "out/missing"},
+        {"wav": "good.wav", "text": "Hello", "out_prefix": "out/good", "bpm": 100},
+        {"wav": "good.wav", "text": "Hello", "out_prefix": "out/typo", "f0_engine": "ncff"},
+        {"wav": "good.wav", "text": "Hello", "out_prefix": "out/streamed", "stream": True},
+        {"wav": "good.wav", "text": "Hello", "out_prefix": "out/still", "bpm": 0},
+    ]
+    manifest.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+
+    defaults = cli.parse_args(["--manifest", str(manifest), "--coarse-to-fine"])
+    summary = batch.run_manifest(manifest, defaults=defaults, workers=1)
+
+    assert len(summary.outcomes) == 5
+    assert [outcome.line for outcome in summary.failed] == [1, 3, 4, 5]
+    assert "FileNotFoundError" in summary.failed[0].error
+    assert all("invalid options" in outcome.error for outcome in summary.failed[1:])
+    assert not (tmp_path / "out" / "streamed.ust").exists()
+    assert (tmp_path / "out" / "good.ust").exists()
+    assert "lines/sec" in summary.report()
+
+
+def test_manifest_rows_can_toggle_streaming(tmp_path):
+    manifest = tmp_path / "lines.jsonl"
+    rows = [{"wav": "a.wav", "text": "Hi", "stream": True}, {"wav": "b.wav", "text": "Hi", "stream": False}]
+    manifest.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    entries = batch.read_manifest(manifest)
+
+    assert [cli.parse_args(entry.argv).stream for entry in entries] == [True, False]
+
+
+def test_batch_workers_cap_pitch_workers_to_their_share(tmp_path, monkeypatch):
+    manifest = tmp_path / "lines.jsonl"
+    rows = [{"wav": "a.wav", "text": "Hi"}, {"wav": "b.wav", "text": "Hi", "pitch_workers": 1}]
+    manifest.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    seen = []
+    monkeypatch.setattr(batch.pipeline, "convert", lambda args: seen.append(args.pitch_workers))
+
+    defaults = cli.parse_args(["--manifest", str(manifest), "--pitch-workers", "8"])
+    batch._init_worker(defaults, warm=False, pitch_cap=2)
+    try:
+        for entry in batch.read_manifest(manifest):
+            assert batch._convert_entry(entry).ok
+    finally:
+        batch._init_worker(None, warm=False)
+
+    assert seen == [2, 1]
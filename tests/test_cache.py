@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+
+from tts2sv import notes
+from tts2sv.cache import AnalysisCache
+
+SR = 22050
+
+
+def _tone(freq=440.0, duration=1.0):
+    t = np.arange(int(SR * duration)) / SR
+    return (0.2 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_key_depends_on_audio_and_params(tmp_path):
+    cache = AnalysisCache(tmp_path)
+    audio = _tone()
+    params = notes.analysis_params(SR, "nccf")
+
+    assert cache.key(audio, params) == cache.key(audio.copy(), params)
+    assert cache.key(audio, params) != cache.key(audio, notes.analysis_params(SR, "yin"))
+    assert cache.key(audio, params) != cache.key(_tone(441.0), params)
+
+
+def test_extract_notes_hits_cache_with_identical_result(tmp_path):
+    cache = AnalysisCache(tmp_path)
+    audio = _tone()
+
+    first = notes.extract_notes(audio, sr=SR, bpm=120.0, min_note_beats=0.25, f0_engine="nccf", cache=cache)
+    second = notes.extract_notes(audio, sr=SR, bpm=90.0, min_note_beats=0.25, f0_engine="nccf", cache=cache)
+
+    assert first.cache_hit is False
+    assert second.cache_hit is True
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.writes) == (1, 1, 1)
+    assert [n.midi_pitch for n in first.notes] == [n.midi_pitch for n in second.notes]
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = AnalysisCache(tmp_path)
+    arrays = {"f0": np.random.default_rng(0).random(4096)}
+    old = cache.store("aa" + "0" * 38, arrays)
+    new = cache.store("bb" + "0" * 38, arrays)
+    os.utime(old, (1, 1))
+    cache.load("bb" + "0" * 38)
+
+    cache.max_bytes = new.stat().st_size
+    assert cache.evict() == 1
+    assert not old.exists() and new.exists()
+    assert cache.stats.evictions == 1
+
+
+def test_corrupt_entry_counts_as_miss(tmp_path):
+    cache = AnalysisCache(tmp_path)
+    key = "cc" + "0" * 38
+    path = cache.path_for(key)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a zip")
+
+    assert cache.load(key) is None
+    assert not path.exists()
+    assert cache.stats.misses == 1
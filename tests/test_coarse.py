@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from tts2sv import cli, coarse, f0, notes
+
+SR = 22050
+
+
+def _clip():
+    t = np.arange(5 * SR) / SR
+    rng = np.random.default_rng(0)
+    tone = lambda freq: 0.2 * np.sin(2 * np.pi * freq * t)  # noqa: E731
+    clip = np.where(t < 0.8, tone(200.0), 0.0)
+    clip = np.where((t > 1.8) & (t < 2.4), 0.2 * rng.standard_normal(t.size), clip)  # breath noise
+    clip = np.where((t > 3.4) & (t < 3.8), tone(100.0), clip)
+    clip = np.where((t >= 3.8) & (t < 4.2), tone(500.0), clip)  # a jump the coarse pass cannot bound
+    return clip.astype(np.float32)
+
+
+def test_regions_are_narrowed_skipped_or_fall_back():
+    analysis = notes.analyze(_clip(), SR, f0_engine="yin", coarse_to_fine=True)
+    assert analysis.coarse == {
+        "regions_narrowed": 1,
+        "regions_fallback": 1,
+        "regions_unvoiced": 1,
+        "narrowed_semitones": pytest.approx(2 * coarse.MARGIN_SEMITONES, abs=0.5),
+    }
+    t = np.arange(analysis.f0.size) * analysis.frame_duration
+    assert np.nanmedian(analysis.f0[t < 0.7]) == pytest.approx(200.0, rel=0.01)
+    assert np.isnan(analysis.f0[(t > 1.9) & (t < 2.3)]).all()
+    assert np.nanmax(analysis.f0[(t > 3.9) & (t < 4.1)]) == pytest.approx(500.0, rel=0.01)
+
+
+def test_ranges_bound_the_coarse_estimate():
+    fmin, fmax = (float(f0.midi_to_hz(m)) for m in (notes.FMIN_MIDI, notes.FMAX_MIDI))
+    ranges = coarse.CoarseRanges(_clip(), SR, 256, np.ones(1 + 5 * SR // 256, dtype=bool), fmin, fmax)
+    low, high = ranges(0, 60)
+    assert low < 200.0 < high and 12.0 * np.log2(high / low) < 8.0
+    assert ranges(0, 0) is None and ranges.regions[-1].status == "unvoiced"
+
+
+def test_pyin_agrees_with_the_full_range_pass():
+    t = np.arange(3 * SR) / SR
+    freq = 180.0 * 2 ** (np.floor(t * 2) % 5 / 12.0)
+    clip = 0.2 * np.sin(2 * np.pi * np.cumsum(freq) / SR)
+    clip[(t % 1.5) > 1.0] = 0.0
+    agreement = coarse.compare(clip.astype(np.float32), SR, f0_engine="pyin")
+    assert agreement.counts["regions_narrowed"] == 2
+    assert agreement.voicing >= 0.98 and agreement.pitch >= 0.99 and agreement.notes >= 0.98
+    assert "narrowed" in agreement.report()
+
+
+@pytest.mark.parametrize("option", [["--coarse-to-fine"], ["--pitch-workers", "4"]])
+def test_in_memory_speed_ups_are_rejected_with_stream(option):
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--wav", "a.wav", "--text", "hi", "--stream", *option])
+    assert cli.parse_args(["--wav", "a.wav", "--text", "hi", *option]).stream is False
@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tts2sv import export
+from tts2sv.utils import Note
+
+ROOT = Path(__file__).resolve().parent.parent
+
+NOTES = [
+    Note(start_sec=0.0, duration_beats=1.0, midi_pitch=60, lyric="hel"),
+    Note(start_sec=0.0, duration_beats=0.5, midi_pitch=62, lyric="lo"),
+]
+
+
+def test_parse_formats_normalises_aliases_and_order():
+    assert export.parse_formats("ust, mid") == ("midi", "ust")
+    assert export.parse_formats(["xml", ".ust", "musicxml"]) == ("musicxml", "ust")
+    with pytest.raises(ValueError):
+        export.parse_formats("pdf")
+    with pytest.raises(ValueError):
+        export.parse_formats(" , ")
+
+
+def test_export_all_writes_every_format(tmp_path):
+    result = export.export_all(NOTES, bpm=120.0, out_prefix=tmp_path / "out" / "demo")
+    assert list(result.outputs) == ["musicxml", "midi", "ust"]
+    assert [path.name for path in result.outputs.values()] == ["demo.musicxml", "demo.mid", "demo.ust"]
+    assert all(path.exists() for path in result.outputs.values())
+    assert set(result.seconds) == set(result.outputs)
+    assert "midi" in result.timings()
+
+
+def test_subset_skips_unused_exporters(tmp_path):
+    probe = f"""
+import json, sys
+from tts2sv import export
+from tts2sv.utils import Note
+result = export.export_all([Note(0.0, 1.0, 60, "la")], bpm=120.0, out_prefix={str(tmp_path / "demo")!r}, formats="midi,ust")
+print(json.dumps({{"files": [p.name for p in result.outputs.values()], "loaded": [m for m in ("music21", "tts2sv.export_musicxml") if m in sys.modules]}}))
+"""
+    completed = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    report = json.loads(completed.stdout)
+    assert report == {"files": ["demo.mid", "demo.ust"], "loaded": []}
+    assert not (tmp_path / "demo.musicxml").exists()
@@ -0,0 +1,50 @@
+import pytest
+
+from tts2sv import export_midi
+from tts2sv.utils import Note
+
+
+NOTES = [
+    Note(start_sec=0.0, duration_beats=1.5, midi_pitch=60, lyric="la"),
+    Note(start_sec=0.0, duration_beats=0.5, midi_pitch=62, lyric="—"),
+    Note(start_sec=0.0, duration_beats=1.0, midi_pitch=64),
+]
+
+
+def test_encode_midi_bytes():
+    data = export_midi.encode_midi(NOTES, bpm=100.0, timebase=480)
+    expected = bytes.fromhex(
+        "4d546864 00000006 0000 0001 01e0"  # MThd, format 0, one track, 480 ticks/quarter
+        "4d54726b 00000044"
+        "00 ff0305 566f696365"  # track name "Voice"
+        "00 ff5804 04021808"  # 4/4
+        "00 ff5103 0927c0"  # 600000 us per quarter = 100 bpm
+        "00 ff0502 6c61 00 903c5a 8550 803c00"  # "la", 720 ticks
+        "00 ff0503 e28094 00 903e5a 8170 803e00"  # filler lyric, 240 ticks
+        "00 90405a 8360 804000"  # no lyric, 480 ticks
+        "00 ff2f00"
+    )
+    assert data == expected
+
+
+def test_export_midi_uses_timebase(tmp_path):
+    out = export_midi.export_midi(NOTES, bpm=120.0, out_path=tmp_path / "demo.mid", timebase=960)
+    data = out.read_bytes()
+    assert data[12:14] == (960).to_bytes(2, "big")
+    assert bytes((0x90, 60, export_midi.VELOCITY)) + export_midi._varlen(1440) in data
+
+
+def test_varlen():
+    assert export_midi._varlen(0) == b"\x00"
+    assert export_midi._varlen(0x7F) == b"\x7f"
+    assert export_midi._varlen(0x80) == b"\x81\x00"
+    assert export_midi._varlen(0x0FFFFFFF) == b"\xff\xff\xff\x7f"
+
+
+def test_music21_reads_native_midi(tmp_path):
+    converter = pytest.importorskip("music21.converter")
+    out = export_midi.export_midi(NOTES, bpm=100.0, out_path=tmp_path / "demo.mid")
+    parsed = list(converter.parse(str(out)).flatten().notes)
+    assert [n.pitch.midi for n in parsed] == [60, 62, 64]
+    assert [float(n.quarterLength) for n in parsed] == [1.5, 0.5, 1.0]
+    assert [n.lyric for n in parsed] == ["la", "—", None]
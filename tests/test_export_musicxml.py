@@ -0,0 +1,86 @@
+import io
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from tts2sv import export_musicxml
+from tts2sv.notetable import NoteTable
+from tts2sv.utils import Note
+
+NOTES = [
+    Note(start_sec=0.0, duration_beats=1.5, midi_pitch=60, lyric="la"),
+    Note(start_sec=0.0, duration_beats=0.5, midi_pitch=61, lyric="—"),
+    Note(start_sec=0.0, duration_beats=2.5, midi_pitch=63, lyric="R&B"),  # crosses the first barline
+    Note(start_sec=0.0, duration_beats=1.25, midi_pitch=70),  # quarter tied to a sixteenth
+]
+
+
+def _score(notes, bpm=100.0):
+    stream = io.StringIO()
+    export_musicxml.write_musicxml(notes, bpm, stream)
+    return ET.fromstring(stream.getvalue().split("\n", 2)[2])  # skip the XML and DOCTYPE declarations
+
+
+def test_ties_split_notes_at_barlines():
+    measures = _score(NOTES).findall("part/measure")
+    assert [m.get("number") for m in measures] == ["1", "2"]
+    assert measures[0].findtext("attributes/divisions") == "480"
+    assert measures[0].findtext("direction/sound[@tempo]") is not None
+
+    def notes_of(measure):
+        return [
+            (n.findtext("pitch/step"), n.findtext("duration"), n.findtext("type"), [t.get("type") for t in n.findall("tie")])
+            for n in measure.findall("note")
+        ]
+
+    assert notes_of(measures[0]) == [
+        ("C", "720", "quarter", []),
+        ("C", "240", "eighth", []),
+        ("E", "960", "half", ["start"]),
+    ]
+    assert notes_of(measures[1]) == [
+        ("E", "240", "eighth", ["stop"]),
+        ("B", "480", "quarter", ["start"]),
+        ("B", "120", "16th", ["stop"]),
+    ]
+    lyrics = [n.findtext("lyric/text") for n in measures[0].findall("note") + measures[1].findall("note")]
+    assert lyrics == ["la", "—", "R&B", None, None, None]
+    assert measures[1].find("barline/bar-style").text == "light-heavy"
+
+
+def test_odd_durations_keep_their_length():
+    table = NoteTable.from_durations([7, 480 * 4 + 1], [60, 62], timebase=480)
+    durations = [int(n.findtext("duration")) for n in _score(table).iter("note")]
+    assert sum(durations) == 7 + 480 * 4 + 1 and durations[0] == 7
+
+
+def test_round_trip_matches_music21(tmp_path):
+    converter = pytest.importorskip("music21.converter")
+    rng = np.random.default_rng(1)
+    count = 300
+    table = NoteTable.from_durations(
+        rng.choice([120, 240, 360, 480, 600, 720, 960, 1440, 2400], size=count),
+        rng.integers(40, 80, size=count),
+        bpm=96.0,
+    ).with_lyrics([f"la{idx}" if idx % 5 else "<&>" for idx in range(count - 10)])
+
+    # Semantic content only: how a note is cut into tied values inside a measure is notation.
+    def parsed(path):
+        score = converter.parse(str(path))
+        notes = []
+        for n in score.flatten().notes:
+            tie = n.tie.type if n.tie else None
+            if tie in ("stop", "continue") and notes and notes[-1][2] == n.pitch.nameWithOctave:
+                notes[-1][1] += float(n.quarterLength)
+            else:
+                notes.append([float(n.offset), float(n.quarterLength), n.pitch.nameWithOctave, n.lyric])
+        flat = score.flatten()
+        signatures = [ts.ratioString for ts in flat.getElementsByClass("TimeSignature")]
+        tempos = [mark.number for mark in flat.getElementsByClass("MetronomeMark")]
+        return notes, signatures, tempos, len(score.parts[0].getElementsByClass("Measure"))
+
+    native = export_musicxml.export_musicxml(table, 96.0, tmp_path / "native.musicxml")
+    reference = export_musicxml.export_musicxml_music21(table, 96.0, tmp_path / "music21.musicxml")
+    expected = parsed(reference)
+    assert parsed(native) == expected and len(expected[0]) == count
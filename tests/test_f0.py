@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from tts2sv import cli, f0, notes
+
+SR = 22050
+
+
+def _tone(freq, duration=0.5):
+    t = np.arange(int(SR * duration)) / SR
+    return 0.2 * np.sin(2 * np.pi * freq * t)
+
+
+def test_unknown_engine_lists_available():
+    with pytest.raises(ValueError, match="nccf"):
+        f0.get_engine("crepe")
+
+
+def test_cli_rejects_unknown_engine_while_parsing(capsys):
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--wav", "a.wav", "--text", "hi", "--f0-engine", "ncff"])
+    assert "nccf" in capsys.readouterr().err
+    assert cli.parse_args(["--wav", "a.wav", "--text", "hi", "--f0-engine", "yin"]).f0_engine == "yin"
+
+
+@pytest.mark.parametrize("engine", ["yin", "nccf"])
+def test_numpy_engines_track_tone_on_hop_grid(engine):
+    audio = np.concatenate([_tone(220.0), np.zeros(SR // 4), _tone(330.0)])
+    track = f0.track_pitch(audio, sr=SR, fmin=65.4, fmax=2093.0, hop_length=256, engine=engine)
+
+    assert track.f0.shape == track.voiced_prob.shape == (1 + len(audio) // 256,)
+    first = track.f0[5:35]
+    silence = track.f0[55:60]
+    last = track.f0[-30:-5]
+    assert np.all(np.abs(f0.hz_to_midi(first) - f0.hz_to_midi(220.0)) < 0.1)
+    assert np.all(np.isnan(silence))
+    assert np.all(np.abs(f0.hz_to_midi(last) - f0.hz_to_midi(330.0)) < 0.1)
+
+
+def test_extract_notes_with_nccf_engine():
+    audio = np.concatenate([_tone(440.0, 1.0), np.zeros(int(0.1 * SR)), _tone(660.0, 1.0)]).astype(np.float32)
+    summary = notes.extract_notes(audio, sr=SR, bpm=120.0, min_note_beats=0.25, f0_engine="nccf")
+    assert [n.midi_pitch for n in summary.notes][:2] == [69, 76]
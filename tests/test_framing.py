@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from tts2sv import f0, notes
+from tts2sv.framing import Framing, dilate
+
+SR = 22050
+
+
+def _speech(seconds=2.0):
+    t = np.arange(int(seconds * SR)) / SR
+    clip = 0.2 * np.sin(2 * np.pi * 200.0 * t) * ((t % 0.5) < 0.3)
+    return clip.astype(np.float32)
+
+
+@pytest.mark.parametrize("frame_length", [2048, 743])
+def test_rms_matches_librosa(frame_length):
+    librosa = notes._load_librosa()
+    audio = _speech()
+    expected = librosa.feature.rms(y=audio, frame_length=frame_length, hop_length=256)[0]
+    np.testing.assert_allclose(Framing(audio, 256, 2048).rms(frame_length), expected, atol=1e-6)
+
+
+def test_frames_are_centred_views_of_one_buffer():
+    framing = Framing(np.arange(10.0), hop_length=4, max_frame_length=8)
+    frames = framing.frames(4)
+    assert frames.shape == (3, 4) and not frames.flags.writeable
+    assert frames.dtype == np.float32  # one float32 padded copy, like the loaded audio
+    assert frames[1].tolist() == [2.0, 3.0, 4.0, 5.0]  # frame 1 is centred on sample 4
+    assert np.shares_memory(frames, framing.frames(8))
+
+
+def test_dilate():
+    mask = np.zeros(12, dtype=bool)
+    mask[[2, 9]] = True
+    assert np.flatnonzero(dilate(mask, 2)).tolist() == [0, 1, 2, 3, 4, 7, 8, 9, 10, 11]
+
+
+@pytest.mark.parametrize("engine", ["yin", "nccf"])
+def test_selected_frames_match_whole_signal_tracking(engine):
+    audio = _speech()
+    fmin, fmax = float(f0.midi_to_hz(notes.FMIN_MIDI)), float(f0.midi_to_hz(notes.FMAX_MIDI))
+    whole = f0.track_pitch(audio, SR, fmin, fmax, 256, engine=engine)
+    select = np.zeros(whole.f0.size, dtype=bool)
+    select[::3] = True
+    part = f0.track_pitch(audio, SR, fmin, fmax, 256, engine=engine, select=select)
+
+    np.testing.assert_array_equal(part.f0[select], whole.f0[select])
+    assert np.isnan(part.f0[~select]).all() and not part.voiced_prob[~select].any()
+
+
+def test_gated_analysis_keeps_the_notes():
+    audio = _speech(4.0)
+    analysis = notes.analyze(audio, SR, f0_engine="nccf")
+    mask = notes.tracking_mask(analysis.rms, analysis.frame_duration)
+    assert 0.3 < mask.mean() < 0.9 and np.isnan(analysis.f0[~mask]).all()
+
+    fmin, fmax = float(f0.midi_to_hz(notes.FMIN_MIDI)), float(f0.midi_to_hz(notes.FMAX_MIDI))
+    track = f0.track_pitch(audio, SR, fmin, fmax, 256, engine="nccf")
+    full = notes.Analysis(f0=track.f0, voiced_prob=track.voiced_prob, rms=analysis.rms, sr=SR)
+
+    def pairs(result):
+        return [(n.midi_pitch, n.duration_beats) for n in notes.build_notes(result, 4.0, 120.0, 0.125).notes]
+
+    assert pairs(analysis) == pairs(full)
@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["librosa", "numba", "scipy", "music21", "numpy", "soundfile"]
+IMPORT_BUDGET_SEC = 0.5
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import tts2sv
+from tts2sv.utils import Note
+from tts2sv import cli
+cli.parse_args(["--wav", "line.wav", "--text", "Hello"])
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def test_import_and_argument_parsing_stay_light():
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(completed.stdout)
+
+    assert report["loaded"] == []
+    assert report["elapsed"] < IMPORT_BUDGET_SEC
+
+
+def test_lazy_submodule_access():
+    import tts2sv
+
+    assert tts2sv.notes.HOP_LENGTH > 0
+    assert callable(tts2sv.main)
+    assert "export_ust" in dir(tts2sv)
@@ -0,0 +1,91 @@
+import json
+import time
+
+import numpy as np
+import soundfile as sf
+
+from tts2sv import cli, instrumentation
+from tts2sv.instrumentation import NULL_RECORDER, Recorder, StageRecord
+
+
+def _write_tone(path, freq=440.0, sr=22050, duration=1.0):
+    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
+    sf.write(path, (0.2 * np.sin(2 * np.pi * freq * t)).astype(np.float32), sr)
+
+
+def test_recorder_collects_stages_and_counts():
+    seen = []
+    recorder = Recorder(on_record=seen.append)
+    with recorder.stage("first") as stage:
+        time.sleep(0.01)
+        stage.count(items=2)
+        stage.count(items=3, extra=1)
+    with recorder.stage("second"):
+        pass
+
+    assert [record.stage for record in recorder.records] == ["first", "second"]
+    assert seen == recorder.records
+    first = recorder.records[0]
+    assert first.wall_sec >= 0.01
+    assert first.counts == {"items": 5, "extra": 1}
+    assert first.peak_bytes is None
+    payload = recorder.to_dict()
+    assert payload["total_wall_sec"] >= first.wall_sec
+    assert payload["stages"][0]["stage"] == "first"
+
+
+def test_recorder_traces_stage_peak_memory():
+    recorder = Recorder(trace_memory=True)
+    with recorder.stage("alloc"):
+        block = np.ones(1_000_000)
+        del block
+    with recorder.stage("idle"):
+        pass
+    alloc, idle = recorder.records
+    assert alloc.peak_bytes >= 8_000_000
+    assert idle.peak_bytes < 1_000_000
+
+
+def test_null_recorder_is_a_no_op():
+    with NULL_RECORDER.stage("anything") as stage:
+        stage.count(items=1)
+    assert not NULL_RECORDER.enabled
+    assert NULL_RECORDER.records == []
+
+
+def test_aggregate_sums_runs_per_stage():
+    runs = [
+        [StageRecord("align", wall_sec=1.0, cpu_sec=0.5, peak_bytes=10, counts={"splits": 2})],
+        [{"stage": "align", "wall_sec": 3.0, "cpu_sec": 1.5, "peak_bytes": 30, "counts": {"splits": 1}}],
+    ]
+    totals = instrumentation.aggregate(runs)
+    assert totals["align"] == {
+        "runs": 2,
+        "wall_sec": 4.0,
+        "cpu_sec": 2.0,
+        "max_wall_sec": 3.0,
+        "mean_wall_sec": 2.0,
+        "peak_bytes": 30,
+        "counts": {"splits": 3},
+    }
+
+
+def test_cli_writes_timings_json(tmp_path):
+    _write_tone(tmp_path / "tone.wav")
+    report = tmp_path / "report" / "timings.json"
+    cli.main(
+        [
+            "--wav", str(tmp_path / "tone.wav"),
+            "--text", "Hello world",
+            "--out-prefix", str(tmp_path / "out" / "tone"),
+            "--f0-engine", "nccf",
+            "--formats", "midi,ust",
+            "--timings-json", str(report),
+        ]
+    )
+    payload = json.loads(report.read_text(encoding="utf-8"))
+    stages = [record["stage"] for record in payload["stages"]]
+    assert stages == ["syllabify", "load_audio", "analyze", "build_notes", "align", "export"]
+    by_stage = {record["stage"]: record for record in payload["stages"]}
+    assert by_stage["analyze"]["counts"]["frames"] > 0
+    assert by_stage["export"]["counts"]["bytes_written"] > 0
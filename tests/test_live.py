@@ -0,0 +1,126 @@
+import io
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from tts2sv import audio, cli, live, notes, pipeline
+
+SR = 22050
+
+
+def _clip(seconds=3.0):
+    t = np.arange(int(SR * seconds)) / SR
+    freqs = np.where((t % 1.0) < 0.5, 220.0, 330.0)
+    clip = 0.2 * np.sin(2 * np.pi * np.cumsum(freqs) / SR)
+    clip[(t % 1.0) > 0.85] = 0.0
+    return (clip * 32767).astype("<i2")
+
+
+def _pairs(summary):
+    return [(n.midi_pitch, n.duration_beats) for n in summary.notes]
+
+
+class _StepClock:
+    """Audio time of the last chunk fed, so latencies are measured in stream time."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize("engine", ["nccf", "yin"])
+def test_live_notes_match_offline_run(tmp_path, engine):
+    pcm = _clip()
+    path = tmp_path / "clip.wav"
+    sf.write(path, pcm, SR, subtype="PCM_16")
+    full, sr = audio.load_audio(path)
+    offline = notes.build_notes(notes.analyze(full, sr, f0_engine=engine), len(full) / sr, 120.0, 0.125)
+
+    session = live.LiveSession(SR, ["a", "b"], f0_engine=engine)
+    emitted = []
+    for block in live.read_pcm(io.BytesIO(pcm.tobytes()), block_frames=1000):
+        emitted += session.feed(block)
+    emitted += session.finish()
+
+    rebuilt = notes.build_notes(session.analysis(), session.duration_sec, 120.0, 0.125)
+    assert _pairs(rebuilt) == _pairs(offline)
+    assert [(n.pitch, n.duration_ticks) for n in emitted] == list(
+        zip(offline.notes.pitch.tolist(), offline.notes.duration.tolist())
+    )
+    assert [n.lyric for n in emitted] == ["a", "b", live.FILLER_LYRIC]
+    assert [n.start_tick for n in emitted] == [0, 720, 1440]
+
+
+def test_notes_are_emitted_within_the_lookahead():
+    pcm = _clip()
+    clock = _StepClock()
+    session = live.LiveSession(SR, f0_engine="nccf", clock=clock)
+    step = SR // 20
+    emitted_at = []
+    for block in live.read_pcm(io.BytesIO(pcm.tobytes()), block_frames=step):
+        clock.now += len(block) / SR
+        emitted_at += [(note, clock.now) for note in session.feed(block)]
+
+    # Every note is followed by 150 ms of silence, so all close before the stream ends.
+    assert len(emitted_at) == 3
+    bound = session.lookahead_ms + 1000.0 * step / SR
+    for note, now in emitted_at:
+        assert now < pcm.size / SR
+        assert 0 < note.latency_ms <= bound
+        assert 1000.0 * now - note.end_sec * 1000.0 <= bound + 1000.0 * session.frame_duration
+
+
+def test_read_pcm_downmixes_and_keeps_partial_frames():
+    frames = np.array([[0.5, -0.25], [0.25, 0.25], [-1.0, 0.5]], dtype="<f4")
+
+    class Trickle(io.RawIOBase):
+        def __init__(self, data):
+            self.data = data
+
+        def read(self, size=-1):
+            chunk, self.data = self.data[:5], self.data[5:]  # never a whole frame at once
+            return chunk
+
+    blocks = list(live.read_pcm(Trickle(frames.tobytes()), "f32le", channels=2, block_frames=2))
+    np.testing.assert_allclose(np.concatenate(blocks), frames.mean(axis=1))
+
+    pcm = np.array([16384, -32768], dtype="<i2")
+    np.testing.assert_allclose(next(live.read_pcm(io.BytesIO(pcm.tobytes() + b"\x01"))), [0.5, -1.0])
+
+
+def test_run_writes_the_same_files_as_an_offline_conversion(tmp_path):
+    pcm = _clip()
+    path = tmp_path / "clip.wav"
+    sf.write(path, pcm, SR, subtype="PCM_16")
+    common = ["--text", "one two three", "--f0-engine", "nccf"]
+
+    pipeline.convert(cli.parse_args(["--wav", str(path), "--out-prefix", str(tmp_path / "offline" / "line"), *common]))
+    args = cli.parse_args(["--stdin-pcm", "--pcm-rate", str(SR), "--out-prefix", str(tmp_path / "live" / "line"), *common])
+    out = io.StringIO()
+    result = live.run(args, source=io.BytesIO(pcm.tobytes()), out=out)
+
+    events = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [event["event"] for event in events] == ["ready", "note", "note", "note", "final"]
+    final = events[-1]
+    assert final["revised"] == 0
+    assert len(final["notes"]) == result.note_count
+    for ext in ("musicxml", "mid", "ust"):
+        assert (tmp_path / "live" / f"line.{ext}").read_bytes() == (tmp_path / "offline" / f"line.{ext}").read_bytes()
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--stdin-pcm", "--text", "hi", "--f0-engine", "nccf"],
+        ["--stdin-pcm", "--text", "hi", "--pcm-rate", "22050"],
+        ["--stdin-pcm", "--text", "hi", "--pcm-rate", "22050", "--f0-engine", "nccf", "--wav", "a.wav"],
+        ["--stdin-pcm", "--text", "hi", "--pcm-rate", "22050", "--f0-engine", "nccf", "--progress-json"],
+    ],
+)
+def test_stdin_pcm_option_validation(argv):
+    with pytest.raises(SystemExit):
+        cli.parse_args(argv)
@@ -1,6 +1,7 @@
 import numpy as np
+import pytest
 
-from tts2sv import notes
+from tts2sv import cli, notes
 
 
 def test_extract_notes_from_sine_wave():
@@ -19,3 +20,93 @@ def test_extract_notes_from_sine_wave():
     assert midi_pitches[0] in (69, 70)  # A4
     assert midi_pitches[1] in (76, 77)  # E5 approx
     assert summary.notes[0].duration_beats >= 1.75
+
+
+def test_hop_follows_frame_period():
+    assert notes.hop_length_for(notes.REFERENCE_SR) == notes.HOP_LENGTH
+    assert notes.hop_length_for(44100) == 2 * notes.HOP_LENGTH
+    assert notes.hop_length_for(16000, hop_ms=10.0) == 160
+    assert notes.analysis_rate(48000, 16000) == 16000
+    assert notes.analysis_rate(16000, 22050) == 16000  # never upsampled
+
+
+def test_analysis_sr_keeps_note_timing_in_file_seconds():
+    sr = 48000
+    t = np.arange(int(1.5 * sr)) / sr
+    audio = np.concatenate([0.2 * np.sin(2 * np.pi * 440 * t), np.zeros(sr // 4)]).astype(np.float32)
+
+    native = notes.extract_notes(audio, sr=sr, bpm=120.0, min_note_beats=0.25, f0_engine="nccf")
+    decimated = notes.extract_notes(
+        audio, sr=sr, bpm=120.0, min_note_beats=0.25, f0_engine="nccf", analysis_sr=16000
+    )
+
+    assert [n.midi_pitch for n in decimated.notes] == [n.midi_pitch for n in native.notes] == [69]
+    assert decimated.notes.duration.tolist() == native.notes.duration.tolist()
+
+
+def _reference_segments(f0, rms, frame_duration):
+    """The original frame-by-frame segmentation, kept as an oracle."""
+    voiced = (~np.isnan(f0)) & (rms >= notes.energy_gate(rms))
+    runs, start = [], None
+    for idx, is_voiced in enumerate(voiced):
+        if is_voiced and start is None:
+            start = idx
+        elif not is_voiced and start is not None:
+            runs.append((start, idx - 1))
+            start = None
+    if start is not None:
+        runs.append((start, len(voiced) - 1))
+    merged = runs[:1]
+    for start, end in runs[1:]:
+        if (start - merged[-1][1] - 1) * frame_duration <= notes.GAP_TOLERANCE:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    kept = []
+    for start, end in merged:
+        values = f0[start : end + 1][~np.isnan(f0[start : end + 1])]
+        if end - start + 1 >= notes.MIN_FRAMES and values.size:
+            kept.append((start, end, int(np.round(notes.f0_engines.hz_to_midi(float(np.median(values)))))))
+    return kept
+
+
+def test_vectorised_segmentation_matches_the_frame_loop():
+    rng = np.random.default_rng(5)
+    n = 20000
+    f0 = 110.0 * 2 ** rng.uniform(0, 3, size=n)
+    f0[rng.random(n) < 0.3] = np.nan
+    f0[np.repeat(rng.random(n // 50) < 0.4, 50)] = np.nan  # long silences
+    rms = rng.uniform(0, 1, size=n).astype(np.float32)
+    analysis = notes.Analysis(f0=f0, voiced_prob=np.zeros(n), rms=rms, sr=22050)
+
+    segments = notes.find_note_segments(analysis, n * analysis.frame_duration)
+    expected = _reference_segments(f0, rms, analysis.frame_duration)
+    assert [tuple(b) + (p,) for b, p in zip(segments.bounds.tolist(), segments.pitch.tolist())] == expected
+    first, last = segments.bounds[0]
+    assert np.isclose(segments.energy[0], np.mean(rms[first : last + 1]))
+
+
+def test_change_points_split_a_voiced_run():
+    f0 = np.full(200, np.nan)
+    f0[10:60] = 220.0
+    f0[60:63] = 233.0  # a short blip is not a new note
+    f0[63:110] = 220.0
+    f0[110:170] = 220.0 * 2 ** (3 / 12)  # a sustained minor-third leap is
+    rms = np.ones(200, dtype=np.float32)
+    analysis = notes.Analysis(f0=f0, voiced_prob=np.zeros(200), rms=rms, sr=22050)
+
+    whole = notes.find_note_segments(analysis, 2.3)
+    split = notes.find_note_segments(analysis, 2.3, split_semitones=1.0, split_frames=8)
+    assert whole.bounds.tolist() == [[10, 169]]
+    assert split.bounds.tolist() == [[10, 109], [110, 169]]
+    assert split.pitch.tolist() == [57, 60] and split.gap_sec[1] == 0.0
+
+
+@pytest.mark.parametrize("bpm", [0.0, -60.0])
+def test_non_positive_bpm_is_rejected(bpm):
+    sr = 22050
+    tone = (0.2 * np.sin(2 * np.pi * 220 * np.arange(sr // 2) / sr)).astype(np.float32)
+    with pytest.raises(ValueError, match="BPM must be positive"):
+        notes.extract_notes(tone, sr=sr, bpm=bpm, min_note_beats=0.25, f0_engine="nccf")
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--wav", "a.wav", "--text", "hi", "--bpm", str(bpm)])
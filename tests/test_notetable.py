@@ -0,0 +1,37 @@
+import numpy as np
+
+from tts2sv.notetable import NoteTable, quantize_ticks
+from tts2sv.utils import Note, quantize_beats
+
+
+def test_round_trip_through_note_views():
+    notes = [
+        Note(start_sec=0.0, duration_beats=1.5, midi_pitch=60, lyric="la"),
+        Note(start_sec=0.75, duration_beats=0.5, midi_pitch=62),
+    ]
+    table = NoteTable.from_notes(notes, timebase=480, bpm=120.0)
+
+    assert table.start.tolist() == [0, 720]
+    assert table.duration.tolist() == [720, 240]
+    assert table.to_notes() == notes
+    assert table[-1].lyric is None
+    assert len(table[1:]) == 1 and table[1:][0].midi_pitch == 62
+
+
+def test_reflow_is_exact_for_long_scores():
+    count = 50_000
+    table = NoteTable.from_durations(np.full(count, 160), np.full(count, 60), timebase=480, bpm=120.0)
+
+    assert table.start[-1] == 160 * (count - 1)
+    assert table[count - 1].start_sec == (count - 1) / 3 * 0.5
+
+
+def test_with_lyrics_leaves_extra_notes_empty():
+    table = NoteTable.from_durations([480, 480, 480], [60, 62, 64]).with_lyrics(["a", "b"])
+    assert table.lyric_list() == ["a", "b", None]
+
+
+def test_quantize_ticks_matches_scalar_quantize_beats():
+    beats = np.array([-1.0, 0.0, 0.05, 0.124, 0.13, 0.375, 0.625, 1.1, 7.9])
+    expected = [round(quantize_beats(b, 0.125) * 480) for b in beats]
+    assert quantize_ticks(beats, 0.125, 480).tolist() == expected
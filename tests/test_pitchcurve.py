@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from tts2sv import export_midi, export_ust, pitchcurve
+from tts2sv.notetable import NoteTable
+
+
+def _reference_rdp(x, y, lo, hi, epsilon, keep):
+    if hi - lo < 2:
+        return
+    t = (x[lo + 1 : hi] - x[lo]) / (x[hi] - x[lo])
+    error = np.abs(y[lo + 1 : hi] - (y[lo] + t * (y[hi] - y[lo])))
+    worst = int(np.argmax(error))
+    if error[worst] > epsilon:
+        split = lo + 1 + worst
+        keep[split] = True
+        _reference_rdp(x, y, lo, split, epsilon, keep)
+        _reference_rdp(x, y, split, hi, epsilon, keep)
+
+
+def test_simplify_matches_recursive_rdp_per_group():
+    rng = np.random.default_rng(3)
+    group = np.repeat([0, 1, 2], [40, 1, 60])
+    x = np.concatenate([np.linspace(0, 1, 40), [0.5], np.linspace(0, 1, 60)])
+    y = np.cumsum(rng.normal(0, 8, size=x.size))
+
+    keep = pitchcurve.simplify(x, y, group, epsilon=10.0)
+
+    expected = np.zeros(x.size, dtype=bool)
+    for lo, hi in ((0, 39), (40, 40), (41, 100)):
+        expected[[lo, hi]] = True
+        _reference_rdp(x, y, lo, hi, 10.0, expected)
+    assert np.array_equal(keep, expected)
+    # Every dropped point is within tolerance of the kept polyline.
+    for g in (0, 2):
+        members = group == g
+        rebuilt = np.interp(x[members], x[members & keep], y[members & keep])
+        assert np.max(np.abs(rebuilt - y[members])) <= 10.0 + 1e-9
+
+
+def test_contour_spreads_segment_frames_over_note_ticks():
+    table = NoteTable.from_durations([480, 240], [69, 72])
+    f0 = np.array([440.0, 440.0, np.nan, 440.0, 523.25, 523.25])
+    curve = pitchcurve.contour(f0, [(0, 3), (4, 5)], table)
+    assert curve.end_tick == 720
+    assert np.allclose(curve.tick, [60, 180, 420, 540, 660])  # the unvoiced frame is dropped
+    assert np.allclose(curve.pitch[:3], 69.0)
+
+
+def test_note_bends_respects_point_budget():
+    table = NoteTable.from_durations([960, 960], [60, 62], bpm=120.0)
+    tick = np.linspace(0, 1919, 400)
+    pitch = 61 + np.sin(tick / 40.0)  # a fast vibrato needs many points
+    curve = pitchcurve.PitchCurve(tick=tick, pitch=pitch, end_tick=1920)
+
+    loose = pitchcurve.note_bends(curve, table, epsilon_cents=5.0, max_points_per_sec=None)
+    tight = pitchcurve.note_bends(curve, table, epsilon_cents=5.0, max_points_per_sec=10.0)
+    assert loose.seconds == pytest.approx(2.0)
+    assert loose.epsilon_cents == 5.0 and loose.points > 20
+    assert tight.points <= 20 and tight.epsilon_cents > 5.0
+    assert tight.offsets.tolist()[0] == 0 and tight.offsets[-1] == tight.points
+    position, cents = tight.note(1)
+    assert np.all((position >= 0) & (position < 1))
+    assert np.all(np.abs(cents + 100) <= 100 + 1e-9)  # relative to the note's own pitch (62)
+
+
+def _bends():
+    return pitchcurve.NoteBends(
+        offsets=np.array([0, 2, 2]),
+        position=np.array([0.0, 0.5]),
+        cents=np.array([0.0, 50.0]),
+        epsilon_cents=10.0,
+    )
+
+
+def test_ust_gets_mode2_pitch_points(tmp_path):
+    table = NoteTable.from_durations([480, 480], [60, 62]).with_lyrics(["la", "li"])
+    out = export_ust.export_ust(table, bpm=120.0, timebase=480, out_path=tmp_path / "bend.ust", bends=_bends())
+    text = out.read_text(encoding="utf-8")
+    assert "PBS=0;0\nPBW=250\nPBY=5\nPBM=s\n" in text
+    assert text.count("PBS=") == 1  # the second note has no points
+
+
+def test_midi_pitch_bends_are_valid_and_optional(tmp_path):
+    music21 = pytest.importorskip("music21")
+    table = NoteTable.from_durations([480, 480], [60, 62]).with_lyrics(["la", "li"])
+
+    def bend_events(bends, name):
+        path = export_midi.export_midi(table, bpm=120.0, out_path=tmp_path / name, bends=bends)
+        midi = music21.midi.MidiFile()
+        midi.open(str(path))
+        midi.read()
+        midi.close()
+        kind = music21.midi.ChannelVoiceMessages.PITCH_BEND
+        return [event for event in midi.tracks[0].events if event.type == kind]
+
+    assert bend_events(None, "plain.mid") == []
+    # 0 -> 50 cents ramps up in 10-cent steps, then the second note resets to the centre.
+    bends = bend_events(_bends(), "bend.mid")
+    assert len(bends) == 6
+    values = [event.parameter1 | (event.parameter2 << 7) for event in bends]
+    assert values[-1] == export_midi.BEND_CENTER
+    assert values[:-1] == sorted(values[:-1]) and values[-2] == export_midi._bend_value(50.0)
+
+
+def test_pipeline_exports_a_simplified_glide(tmp_path):
+    sf = pytest.importorskip("soundfile")
+    from tts2sv import cli, pipeline
+
+    sr = 22050
+    t = np.arange(sr) / sr
+    freq = 220.0 * 2 ** (t / 12.0 * 2)  # two-semitone glide over one second
+    sf.write(tmp_path / "glide.wav", (0.2 * np.sin(2 * np.pi * np.cumsum(freq) / sr)).astype(np.float32), sr)
+    common = ["--wav", str(tmp_path / "glide.wav"), "--text", "Hello", "--f0-engine", "nccf", "--formats", "ust"]
+
+    plain = pipeline.convert(cli.parse_args(common + ["--out-prefix", str(tmp_path / "plain")]))
+    curved = pipeline.convert(cli.parse_args(common + ["--out-prefix", str(tmp_path / "curved"), "--pitch-curve"]))
+
+    assert plain.curve_points == 0 and "Pitch curve" not in plain.summary()
+    assert 2 <= curved.curve_points <= 40
+    assert "Pitch curve" in curved.summary() and curved.output_bytes["ust"] > 0
+    lines = lambda name: (tmp_path / name).read_text(encoding="utf-8").splitlines()  # noqa: E731
+    assert [line for line in lines("curved.ust") if not line.startswith("PB") or line == "PBType=5"] == [
+        line.replace("plain", "curved") for line in lines("plain.ust")
+    ]
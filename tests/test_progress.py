@@ -0,0 +1,116 @@
+import io
+import json
+import signal
+
+import numpy as np
+import pytest
+
+from tts2sv import cli, notes, pipeline, progress, server
+
+
+def _events(**kwargs):
+    events = []
+    return progress.Progress(on_event=events.append, min_interval=0, **kwargs), events
+
+
+def test_spans_scale_onto_the_stage_total_and_top_up():
+    reporter, events = _events()
+    with reporter.stage("analyze", total=100) as task:
+        with progress.span(60, 6):  # e.g. a block of 6 local frames covering 60 global ones
+            progress.advance(3)
+            assert task.done == pytest.approx(30)
+        assert task.done == pytest.approx(60)  # the unreported rest is filled in when the span closes
+        with progress.span(40, 4):
+            pass
+    assert [round(event.fraction, 2) for event in events] == [0.0, 0.3, 0.6, 1.0, 1.0]
+    assert events[1].eta_sec is not None and events[-1].to_dict()["event"] == "progress"
+    progress.advance(5)  # no active stage: a no-op
+
+
+def test_cancel_stops_at_the_next_checkpoint():
+    token = progress.CancelToken()
+    reporter, _ = _events(cancel=token)
+    with reporter.stage("analyze", total=10):
+        progress.advance(1)
+        token.cancel()
+        with pytest.raises(progress.Cancelled):
+            progress.advance(1)
+    with pytest.raises(progress.Cancelled):
+        with reporter.stage("export"):
+            pass
+
+
+@pytest.mark.parametrize("options", [{}, {"pitch_workers": 1}])
+def test_analysis_reports_every_frame(options):
+    sr = 22050
+    t = np.arange(3 * sr) / sr
+    audio = (0.2 * np.sin(2 * np.pi * 220 * t) * (t < 2.0)).astype(np.float32)
+    reporter, events = _events()
+    with reporter.stage("analyze"):
+        analysis = notes.analyze(audio, sr=sr, f0_engine="yin", **options)
+    assert events[-1].total == len(analysis.f0) and events[-1].fraction == 1.0
+    fractions = [event.fraction for event in events]
+    assert fractions == sorted(fractions) and len(fractions) > 3  # one event per 512-frame chunk
+
+
+def _wav(tmp_path, seconds=2.0):
+    sf = pytest.importorskip("soundfile")
+    sr = 22050
+    t = np.arange(int(seconds * sr)) / sr
+    sf.write(tmp_path / "line.wav", (0.2 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), sr)
+    return str(tmp_path / "line.wav")
+
+
+@pytest.mark.parametrize("stage", ["analyze", "export"])
+def test_cancelled_conversion_leaves_no_outputs(tmp_path, stage):
+    token = progress.CancelToken()
+
+    def on_event(event):
+        if event.stage == stage and event.fraction == 0.0:
+            token.cancel()
+
+    args = cli.parse_args(
+        ["--wav", _wav(tmp_path), "--text", "Hello", "--f0-engine", "yin", "--out-prefix", str(tmp_path / "out"),
+         "--formats", "midi,ust", "--stream", "--block-seconds", "0.5"]
+    )
+    with pytest.raises(progress.Cancelled):
+        pipeline.convert(args, progress=progress.Progress(on_event=on_event, cancel=token))
+    assert not list(tmp_path.glob("out*"))
+
+
+def test_server_streams_progress_and_cancels(tmp_path):
+    wav = _wav(tmp_path)
+    lines = [
+        {"id": 1, "argv": ["--wav", wav, "--text", "Hello", "--f0-engine", "yin", "--out-prefix", str(tmp_path / "a")]},
+        {"id": 2, "op": "cancel", "target": 1},
+        {"id": 3, "progress": True, "argv": ["--wav", wav, "--text", "Hello", "--out-prefix", str(tmp_path / "b")]},
+        {"id": 4, "op": "cancel", "target": 99},
+        {"id": 5, "op": "shutdown"},
+    ]
+    writer = io.StringIO()
+    server.serve_stream(io.StringIO("".join(json.dumps(line) + "\n" for line in lines)), writer)
+    messages = [json.loads(line) for line in writer.getvalue().splitlines()]
+
+    by_id = {message["id"]: message for message in messages if "event" not in message}
+    assert by_id[1]["cancelled"] and not by_id[1]["ok"]
+    assert by_id[2]["ok"] and not by_id[4]["ok"]
+    assert by_id[3]["ok"] and messages[-1] == {"id": 5, "ok": True}
+    stages = {message["stage"] for message in messages if message.get("event") == "progress"}
+    assert stages == {"analyze", "export"}
+    assert all(message["id"] == 3 for message in messages if message.get("event") == "progress")
+    assert not list(tmp_path.glob("a.*")) and (tmp_path / "b.ust").exists()
+
+
+def test_cli_progress_json(tmp_path, capsys):
+    handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        cli.main(["--wav", _wav(tmp_path), "--text", "Hello", "--f0-engine", "nccf", "--formats", "ust",
+                  "--out-prefix", str(tmp_path / "out"), "--progress-json"])
+    finally:
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+    out = capsys.readouterr().out.splitlines()
+    events = [json.loads(line) for line in out if line.startswith("{")]
+    assert {event["stage"] for event in events} == {"analyze", "export"}
+    assert events[-1] == {**events[-1], "stage": "export", "fraction": 1.0, "done": 1, "total": 1, "unit": "files"}
+    assert out[-1].startswith("Exported")
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from tts2sv import notes, regions
+
+SR = 22050
+
+
+def _phrases(seconds=4.0):
+    t = np.arange(int(seconds * SR)) / SR
+    freq = 180.0 * 2 ** (np.floor(t * 2) % 5 / 12.0)
+    clip = 0.2 * np.sin(2 * np.pi * np.cumsum(freq) / SR)
+    clip[(t % 2.0) > 1.3] = 0.0  # pauses long enough to form separate regions
+    return clip.astype(np.float32)
+
+
+def test_candidate_regions_merge_when_padding_touches():
+    mask = np.zeros(40, dtype=bool)
+    mask[2:5] = mask[7:9] = mask[30:33] = True
+    assert regions.candidate_regions(mask, context_frames=2) == [(2, 9), (30, 33)]
+    assert regions.candidate_regions(np.zeros(5, dtype=bool), context_frames=2) == []
+
+
+def test_split_regions_bounds_piece_length():
+    pieces = regions.split_regions([(0, 10), (20, 23)], max_frames=4)
+    assert pieces == [(0, 3), (3, 7), (7, 10), (20, 23)]
+
+
+@pytest.mark.parametrize("engine,workers", [("nccf", 2), ("pyin", 2), ("yin", 1)])
+def test_region_tracking_matches_serial_on_gated_frames(monkeypatch, engine, workers):
+    monkeypatch.setattr(regions, "MAX_PIECE_SECONDS", 0.5)
+    clip = _phrases()
+
+    serial = notes.analyze(clip, SR, f0_engine=engine)
+    parallel = notes.analyze(clip, SR, f0_engine=engine, pitch_workers=workers)
+
+    gated = serial.rms >= notes.energy_gate(serial.rms)
+    voiced_serial = ~np.isnan(serial.f0) & gated
+    voiced_parallel = ~np.isnan(parallel.f0) & gated
+    assert np.mean(voiced_serial == voiced_parallel) >= 0.99
+    both = voiced_serial & voiced_parallel
+    cents = 1200.0 * np.abs(np.log2(parallel.f0[both] / serial.f0[both]))
+    assert np.mean(cents < 10.0) >= 0.99
+
+    def pairs(analysis):
+        return [(n.midi_pitch, n.duration_beats) for n in notes.build_notes(analysis, 4.0, 120.0, 0.125).notes]
+
+    assert pairs(parallel) == pairs(serial)
+
+
+def test_worker_pool_is_shared_across_analyses():
+    clip = _phrases()
+    regions.warm_pool(2)
+    pool = regions.worker_pool(2)
+
+    first = notes.analyze(clip, SR, f0_engine="nccf", pitch_workers=2)
+    second = notes.analyze(clip, SR, f0_engine="nccf", pitch_workers=2)
+
+    assert regions.worker_pool(2) is pool
+    np.testing.assert_array_equal(first.f0, second.f0)
+    regions.shutdown_pool()
+    assert regions._POOL is None
@@ -0,0 +1,53 @@
+import io
+import json
+
+import numpy as np
+import soundfile as sf
+
+from tts2sv import server
+
+
+def _run(lines):
+    reader = io.StringIO("".join(json.dumps(line) + "\n" if not isinstance(line, str) else line for line in lines))
+    writer = io.StringIO()
+    server.serve_stream(reader, writer)
+    return [json.loads(line) for line in writer.getvalue().splitlines()]
+
+
+def test_serve_stream_ping_and_errors():
+    responses = _run([{"id": 1, "op": "ping"}, "not json\n", {"id": 2}, {"id": 3, "op": "bogus"}])
+    assert responses[0]["ok"] and responses[0]["id"] == 1
+    assert not responses[1]["ok"] and "Malformed" in responses[1]["error"]
+    assert not responses[2]["ok"] and "argv" in responses[2]["error"]
+    assert not responses[3]["ok"] and "bogus" in responses[3]["error"]
+
+
+def test_serve_stream_converts_with_options_and_stops_on_shutdown(tmp_path):
+    sr = 22050
+    t = np.linspace(0, 1.0, sr, endpoint=False)
+    sf.write(tmp_path / "line.wav", (0.2 * np.sin(2 * np.pi * 440 * t)).astype(np.float32), sr)
+
+    request = {
+        "id": "a",
+        "cwd": str(tmp_path),
+        "options": {"wav": "line.wav", "text": "Hello", "out_prefix": "out/line", "bpm": 100, "stream": True},
+    }
+    responses = _run([request, {"op": "shutdown"}, {"id": "never", "op": "ping"}])
+
+    assert len(responses) == 2
+    assert responses[0]["ok"], responses[0]
+    assert responses[0]["result"]["syllables"] == 2
+    assert (tmp_path / "out" / "line.ust").exists()
+
+
+def test_requests_reject_options_the_server_cannot_honour():
+    base = ["--wav", "a.wav", "--text", "hi"]
+    responses = _run(
+        [
+            {"id": 1, "argv": [*base, "--sweep-bpm", "80:120:10"]},
+            {"id": 2, "argv": [*base, "--timings-json", "t.json"]},
+        ]
+    )
+    assert [response["ok"] for response in responses] == [False, False]
+    assert "--sweep-*" in responses[0]["error"]
+    assert "--timings-json" in responses[1]["error"]
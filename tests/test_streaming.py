@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from tts2sv import audio, notes, streaming
+
+SR = 22050
+
+
+def _write_clip(path, channels=1, sr=SR):
+    t = np.arange(sr * 3) / sr
+    freqs = np.where((t % 1.0) < 0.5, 220.0, 330.0)
+    clip = 0.2 * np.sin(2 * np.pi * np.cumsum(freqs) / sr)
+    clip[(t % 1.0) > 0.85] = 0.0
+    if channels == 2:
+        clip = np.stack([clip, 0.5 * clip], axis=1)
+    sf.write(path, clip, sr)
+
+
+def _pairs(summary):
+    return [(n.midi_pitch, n.duration_beats) for n in summary.notes]
+
+
+def test_read_normalised_matches_load_audio(tmp_path):
+    path = tmp_path / "clip.wav"
+    _write_clip(path, channels=2)
+    full, sr = audio.load_audio(path)
+    stats = audio.scan_audio(path, block_size=4096)
+
+    assert (stats.sr, stats.length) == (sr, len(full))
+    np.testing.assert_allclose(audio.read_normalised(stats, 1000, 9000), full[1000:9000], atol=1e-6)
+
+
+@pytest.mark.parametrize("engine", ["nccf", "yin"])
+def test_streaming_contours_match_in_memory_across_seams(tmp_path, engine):
+    path = tmp_path / "clip.wav"
+    _write_clip(path)
+    full, sr = audio.load_audio(path)
+
+    offline = notes.analyze(full, sr, f0_engine=engine)
+    streamed, _ = streaming.analyze_file(path, f0_engine=engine, block_seconds=0.3)
+
+    np.testing.assert_array_equal(np.isnan(offline.f0), np.isnan(streamed.f0))
+    np.testing.assert_allclose(streamed.f0, offline.f0, rtol=1e-5, equal_nan=True)
+    np.testing.assert_allclose(streamed.rms, offline.rms, atol=1e-6)
+    assert _pairs(notes.build_notes(streamed, 3.0, 120.0, 0.125)) == _pairs(notes.build_notes(offline, 3.0, 120.0, 0.125))
+
+
+def test_short_file_streaming_is_identical_with_pyin(tmp_path):
+    path = tmp_path / "clip.wav"
+    _write_clip(path)
+    full, sr = audio.load_audio(path)
+
+    offline = notes.extract_notes(full, sr=sr, bpm=120.0, min_note_beats=0.125)
+    streamed = streaming.extract_notes_from_file(path, bpm=120.0, min_note_beats=0.125)
+    assert _pairs(streamed) == _pairs(offline)
+
+
+@pytest.mark.parametrize("source_sr,analysis_sr", [(48000, 22050), (44100, 16000)])
+def test_decimated_streaming_matches_in_memory(tmp_path, source_sr, analysis_sr):
+    path = tmp_path / "clip.wav"
+    _write_clip(path, sr=source_sr)
+    full, sr = audio.load_audio(path)
+
+    offline = notes.analyze(full, sr, f0_engine="nccf", analysis_sr=analysis_sr)
+    streamed, _ = streaming.analyze_file(path, f0_engine="nccf", block_seconds=0.3, analysis_sr=analysis_sr)
+
+    assert (streamed.sr, streamed.hop_length) == (offline.sr, offline.hop_length) == (
+        analysis_sr,
+        notes.hop_length_for(analysis_sr),
+    )
+    np.testing.assert_array_equal(np.isnan(offline.f0), np.isnan(streamed.f0))
+    np.testing.assert_allclose(streamed.f0, offline.f0, rtol=1e-5, equal_nan=True)
+    np.testing.assert_allclose(streamed.rms, offline.rms, atol=1e-6)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from tts2sv import cli, notes, pipeline, sweep
+from tts2sv.notetable import quantize_ticks
+
+
+def _segments(durations):
+    durations = np.asarray(durations, dtype=np.float64)
+    return notes.Segments(
+        duration_sec=durations,
+        pitch=np.full(len(durations), 60, dtype=np.int32),
+        gap_sec=np.zeros(len(durations)),
+        energy=np.ones(len(durations)),
+        count=len(durations),
+    )
+
+
+def test_parse_values_lists_and_ranges():
+    assert sweep.parse_values("90, 100,120") == [90.0, 100.0, 120.0]
+    assert sweep.parse_values("80:82:0.5") == [80.0, 80.5, 81.0, 81.5, 82.0]
+    for bad in ("", "1:2", "3:1:1", "0,1"):
+        with pytest.raises(ValueError):
+            sweep.parse_values(bad)
+
+
+def test_rank_prefers_the_tempo_the_durations_were_played_at():
+    # Eighths and quarters at 120 bpm, slightly humanised.
+    segments = _segments([0.25, 0.26, 0.5, 0.24, 0.51, 1.0])
+    ranked = sweep.rank_segments(segments, 6, bpms=range(90, 151), grids=[0.25], min_notes=[0.125])
+    assert len(ranked) == 61
+    assert ranked[0].bpm == 120.0
+    assert ranked[0].shortfall == 0
+    assert [cand.score for cand in ranked] == sorted(cand.score for cand in ranked)
+
+
+def test_rank_scores_match_single_quantisation():
+    segments = _segments(np.random.default_rng(0).uniform(0.05, 0.8, size=40))
+    ranked = sweep.rank_segments(segments, 40, bpms=[97.0, 133.0], grids=[0.125, 0.5], min_notes=[0.25])
+    for cand in ranked:
+        beats = segments.duration_sec * cand.bpm / 60.0
+        ticks = quantize_ticks(beats, cand.min_note_beats, 480, step=cand.grid)
+        error = np.abs(ticks / 480 - beats)
+        assert cand.grid_error == pytest.approx(float((error / cand.grid).mean()))
+        assert cand.error_sec == pytest.approx(float(error.sum() * 60.0 / cand.bpm))
+
+
+def test_shortfall_penalises_notes_too_short_to_split():
+    segments = _segments([0.5, 0.5])
+    best, worst = sweep.rank_segments(segments, 8, bpms=[60.0, 240.0], grids=[0.25], min_notes=[0.25])
+    assert (best.bpm, best.shortfall) == (240.0, 0)  # two beats per note: room for eight quarter-beat pieces
+    assert (worst.bpm, worst.shortfall) == (60.0, 4)
+    assert worst.score > best.score
+
+
+def test_run_sweep_winner_matches_a_single_run(tmp_path):
+    sr = 22050
+    t = np.arange(int(0.45 * sr)) / sr
+    tone = lambda freq: 0.2 * np.sin(2 * np.pi * freq * t)  # noqa: E731
+    gap = np.zeros(int(0.05 * sr))
+    clip = np.concatenate([tone(262), gap, tone(294), gap, tone(330), gap, tone(349), gap]).astype(np.float32)
+    sf.write(tmp_path / "line.wav", clip, sr)
+
+    common = ["--wav", str(tmp_path / "line.wav"), "--text", "la li lu le", "--f0-engine", "nccf", "--formats", "midi"]
+    args = cli.parse_args(common + ["--out-prefix", str(tmp_path / "sweep"), "--sweep-bpm", "100:140:5", "--sweep-top", "2"])
+    outcome = pipeline.run_sweep(args)
+    assert len(outcome.candidates) == 9
+    assert [path.name for result in outcome.results for path in result.outputs] == ["sweep_top1.mid", "sweep_top2.mid"]
+
+    best = outcome.candidates[0]
+    single = cli.parse_args(common + ["--out-prefix", str(tmp_path / "single"), "--bpm", f"{best.bpm:g}"])
+    pipeline.convert(single)
+    assert (tmp_path / "sweep_top1.mid").read_bytes() == (tmp_path / "single.mid").read_bytes()
+    assert "Swept 9 settings" in outcome.report()
+
+
+def test_split_capacity_matches_the_greedy_aligner():
+    from tts2sv.align import _expand_notes
+
+    ticks = np.arange(1, 1000)
+    for min_ticks in (3, 60, 120, 240):
+        capacity = sweep.split_capacity(ticks, min_ticks)
+        for duration, expected in zip(ticks.tolist(), capacity.tolist()):
+            pieces, _, _ = _expand_notes(np.array([duration]), np.array([60]), duration + 1, min_ticks)
+            assert len(pieces) == expected, (duration, min_ticks)
@@ -1,6 +1,15 @@
+import pytest
+
 from tts2sv import text
 
 
+@pytest.fixture(autouse=True)
+def _fresh_word_cache():
+    text.clear_cache()
+    yield
+    text.clear_cache()
+
+
 def test_syllables_without_pyphen():
     result = text.syllabify_text("Hello, world!")
     assert result == ["Hel", "lo", ",", "world", "!"]
@@ -16,3 +25,32 @@ def test_syllables_with_pyphen(monkeypatch):
     monkeypatch.setattr(text, "get_pyphen_dict", lambda lang: DummyDict())
     result = text.syllabify_text("Hello")
     assert result == ["Hel", "lo"]
+
+
+def test_syllabify_many_matches_single_lines_and_counts_hits():
+    lines = ["Hello, world!", "Hello again, world.", "world"]
+    result = text.syllabify_many(lines)
+    assert result == [text.syllabify_text(line) for line in lines]
+    stats = text.cache_stats()
+    assert stats.misses == 3  # hello, world, again
+    assert stats.hits >= 3
+    assert stats.size == 3
+    assert 0.0 < stats.hit_rate < 1.0
+
+
+def test_word_cache_is_per_language(monkeypatch):
+    calls = []
+
+    def fake_dict(lang):
+        calls.append(lang)
+        return None
+
+    monkeypatch.setattr(text, "get_pyphen_dict", fake_dict)
+    text.syllabify_many(["banana banana"], lang="en")
+    text.syllabify_many(["banana"], lang="de")
+    assert calls == ["en", "de"]
+
+
+def test_empty_line_is_rejected():
+    with pytest.raises(ValueError):
+        text.syllabify_many(["ok", "  "])
@@ -1,16 +1,48 @@
-"""tts2sv package exports."""
+"""tts2sv package exports.
+
+Submodules are imported lazily (PEP 562) so ``import tts2sv`` and CLI argument
+parsing stay cheap; librosa, numba and music21 are only loaded by the stage that
+needs them.
+"""
 from __future__ import annotations
 
-from . import align, audio, export_midi, export_musicxml, export_ust, notes, text
-from .cli import main
+import importlib
+from typing import Any
 
 __all__ = [
+    "aio",
     "align",
     "audio",
+    "batch",
+    "export",
     "export_midi",
     "export_musicxml",
     "export_ust",
+    "instrumentation",
     "notes",
+    "pipeline",
+    "progress",
+    "server",
+    "sweep",
     "text",
     "main",
 ]
+
+_SUBMODULES = frozenset(__all__) - {"main"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    if name == "main":
+        from .cli import main
+
+        globals()["main"] = main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,189 @@
+"""Asyncio front end to the conversion pipeline.
+
+:func:`convert_many` runs a bounded three-stage pipeline over many parsed
+argument namespaces (``tts2sv.cli.parse_args``):
+
+1. **load** — WAVs are read and decoded on I/O threads, up to ``prefetch``
+   lines ahead of analysis;
+2. **analyse** — syllabification, pitch analysis, note building and alignment
+   run in ``executor`` (a private thread pool by default; pass a
+   ``ProcessPoolExecutor`` to sidestep the GIL), at most ``concurrency`` lines
+   at a time;
+3. **export** — files are written on I/O threads while the next lines are
+   analysed.
+
+Every hand-off is a bounded :class:`asyncio.Queue`, so a slow consumer stalls
+the stages behind it instead of piling up decoded audio. Closing the
+generator early, or cancelling the task iterating it, cancels all stages;
+work already handed to an executor runs to completion but nothing new is
+started. Each line produces exactly the files ``pipeline.convert`` would.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, List, Tuple
+
+from . import pipeline
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_PREFETCH = 2
+
+_DONE = object()
+
+
+@dataclass
+class AioOutcome:
+    """Result of one line of :func:`convert_many`; ``index`` is its position in the input."""
+
+    index: int
+    args: argparse.Namespace
+    result: pipeline.ConversionResult | None = None
+    error: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Job:
+    outcome: AioOutcome
+    started: float
+    loaded: Tuple[Any, int] | None = None
+    prepared: Any = None
+    records: List[Any] | None = None
+
+
+async def convert(args: argparse.Namespace, executor: Executor | None = None) -> pipeline.ConversionResult:
+    """Convert one line without blocking the event loop; errors are raised as in ``pipeline.convert``."""
+    loop = asyncio.get_running_loop()
+    records: List[Any] = []
+    loaded = None
+    if not args.stream:
+        loaded, stages = await loop.run_in_executor(None, _load, args)
+        records += stages
+    prepared, stages = await loop.run_in_executor(executor, _prepare, args, loaded)
+    records += stages
+    result, stages = await loop.run_in_executor(None, _export, args, prepared)
+    result.stages = records + stages
+    return result
+
+
+async def convert_many(
+    jobs: Iterable[argparse.Namespace] | AsyncIterable[argparse.Namespace],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    prefetch: int = DEFAULT_PREFETCH,
+    executor: Executor | None = None,
+) -> AsyncIterator[AioOutcome]:
+    """Convert every namespace in ``jobs``, yielding :class:`AioOutcome` objects as lines finish.
+
+    Outcomes arrive in completion order. A failing line is reported through
+    :attr:`AioOutcome.error` and does not stop the others.
+    """
+    if concurrency < 1 or prefetch < 1:
+        raise ValueError("concurrency and prefetch must be at least 1")
+    loop = asyncio.get_running_loop()
+    io_pool = ThreadPoolExecutor(max_workers=prefetch + concurrency, thread_name_prefix="tts2sv-aio-io")
+    cpu_pool = executor or ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tts2sv-aio-cpu")
+    loaded_q: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
+    prepared_q: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    done_q: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    failures: List[BaseException] = []
+
+    async def load() -> None:
+        try:
+            index = 0
+            async for args in _aiter(jobs):
+                job = _Job(AioOutcome(index=index, args=args), started=time.perf_counter())
+                index += 1
+                if not args.stream:
+                    try:
+                        job.loaded, job.records = await loop.run_in_executor(io_pool, _load, args)
+                    except Exception as exc:
+                        job.outcome.error = f"{type(exc).__name__}: {exc}"
+                await loaded_q.put(job)
+        except Exception as exc:
+            failures.append(exc)
+        for _ in range(concurrency):
+            await loaded_q.put(_DONE)
+
+    async def analyse() -> None:
+        while (job := await loaded_q.get()) is not _DONE:
+            if job.outcome.ok:
+                try:
+                    job.prepared, stages = await loop.run_in_executor(cpu_pool, _prepare, job.outcome.args, job.loaded)
+                    job.records = (job.records or []) + stages
+                except Exception as exc:
+                    job.outcome.error = f"{type(exc).__name__}: {exc}"
+            job.loaded = None  # release the decoded audio before waiting on the export queue
+            await prepared_q.put(job)
+        await prepared_q.put(_DONE)
+
+    async def write() -> None:
+        while (job := await prepared_q.get()) is not _DONE:
+            if job.outcome.ok:
+                try:
+                    result, stages = await loop.run_in_executor(io_pool, _export, job.outcome.args, job.prepared)
+                    result.stages = (job.records or []) + stages
+                    job.outcome.result = result
+                except Exception as exc:
+                    job.outcome.error = f"{type(exc).__name__}: {exc}"
+            job.outcome.seconds = time.perf_counter() - job.started
+            await done_q.put(job.outcome)
+        await done_q.put(_DONE)
+
+    tasks = [asyncio.create_task(load())]
+    tasks += [asyncio.create_task(analyse()) for _ in range(concurrency)]
+    tasks += [asyncio.create_task(write()) for _ in range(concurrency)]
+    try:
+        remaining = concurrency
+        while remaining:
+            item = await done_q.get()
+            if item is _DONE:
+                remaining -= 1
+            else:
+                yield item
+        if failures:
+            raise failures[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        io_pool.shutdown(wait=False, cancel_futures=True)
+        if executor is None:
+            cpu_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _aiter(jobs: Iterable[Any] | AsyncIterable[Any]) -> AsyncIterator[Any]:
+    if hasattr(jobs, "__aiter__"):
+        async for item in jobs:  # type: ignore[union-attr]
+            yield item
+    else:
+        for item in jobs:  # type: ignore[union-attr]
+            yield item
+
+
+# Stage bodies are module-level functions so process pools can pickle them.
+# Each records into its own recorder and returns the records alongside its value.
+
+
+def _load(args: argparse.Namespace):
+    recorder = pipeline._recorder_for(args, None)
+    return pipeline._load(args, recorder), list(recorder.records)
+
+
+def _prepare(args: argparse.Namespace, loaded: Tuple[Any, int] | None):
+    recorder = pipeline._recorder_for(args, None)
+    return pipeline._prepare(args, recorder, loaded), list(recorder.records)
+
+
+def _export(args: argparse.Namespace, prepared) -> Tuple[pipeline.ConversionResult, list]:
+    recorder = pipeline._recorder_for(args, None)
+    syllables, extraction, alignment, bends = prepared
+    exported = pipeline._export(args, recorder, alignment, args.bpm, args.out_prefix, bends)
+    return pipeline._result(syllables, extraction, alignment, exported, bends=bends), list(recorder.records)
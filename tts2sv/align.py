@@ -1,17 +1,39 @@
 """Align syllables to detected notes."""
 from __future__ import annotations
 
+import heapq
+import math
 from dataclasses import dataclass
 from typing import List, Sequence
 
-from .utils import Note, duration_seconds
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from .notetable import DEFAULT_TIMEBASE, NoteTable, as_note_table, beats_to_ticks
+from .utils import QUANTIZATION_STEP, Note
 
 
 @dataclass
 class AlignmentResult:
-    notes: List[Note]
+    notes: NoteTable
     splits_applied: int = 0
     filler_notes: int = 0
+    merges_applied: int = 0
+
+
+@dataclass
+class NoteCues:
+    """Optional per-note evidence from extraction used by the ``dp`` aligner.
+
+    ``onset`` is in ``[0, 1]`` and grows with the silence that precedes a note
+    (a clear word boundary); ``energy`` is the note's mean RMS relative to the
+    loudest note.
+    """
+
+    onset: "np.ndarray"
+    energy: "np.ndarray"
 
 
 class AlignmentError(ValueError):
@@ -19,23 +41,52 @@ class AlignmentError(ValueError):
 
 
 THRESHOLD = 0.3
+FILLER_LYRIC = "—"
+ALIGN_MODES = ("greedy", "dp")
+
+# Dynamic-programming costs; durations are compared as |log(actual / expected)|.
+DURATION_WEIGHT = 1.0
+SPLIT_PENALTY = 0.5
+MERGE_PENALTY = 0.5
+ONSET_WEIGHT = 1.0
+FILLER_PENALTY = 1.0
+PUNCTUATION_WEIGHT = 0.5
+MAX_SPLIT = 4
+MAX_MERGE = 4
+BAND_MIN = 16
+BAND_FRACTION = 0.05
+
+_ASSIGN, _SPLIT, _MERGE, _FILLER = 1, 2, 3, 4
 
 
 def align_syllables_to_notes(
-    notes: Sequence[Note],
+    notes: Sequence[Note] | NoteTable,
     syllables: Sequence[str],
     bpm: float,
     min_note_beats: float,
     strict: bool = False,
+    timebase: int = DEFAULT_TIMEBASE,
+    mode: str = "greedy",
+    cues: NoteCues | None = None,
 ) -> AlignmentResult:
-    if not notes:
+    """Give every syllable a note.
+
+    ``greedy`` repeatedly halves the longest note until there are enough notes
+    and pads leftovers with filler lyrics. ``dp`` searches for the cheapest
+    combination of assigning, splitting and merging notes (and, rarely,
+    leaving a filler note), guided by note durations, syllable lengths and the
+    optional extraction ``cues``.
+    """
+    if not len(notes):
         raise AlignmentError("No notes available for alignment")
     if not syllables:
         raise AlignmentError("No syllables extracted from text")
+    if mode not in ALIGN_MODES:
+        raise ValueError(f"Unknown alignment mode '{mode}' (available: {', '.join(ALIGN_MODES)})")
 
-    notes_list = [Note(start_sec=note.start_sec, duration_beats=note.duration_beats, midi_pitch=note.midi_pitch) for note in notes]
+    table = as_note_table(notes, bpm=bpm, timebase=timebase)
 
-    note_count = len(notes_list)
+    note_count = len(table)
     syll_count = len(syllables)
 
     if syll_count > note_count:
@@ -44,51 +95,272 @@ def align_syllables_to_notes(
             raise AlignmentError(
                 "Syllable count exceeds note count by more than 30% in strict mode",
             )
-        splits_applied = _expand_notes(notes_list, syll_count, min_note_beats)
-    else:
-        splits_applied = 0
 
-    if len(notes_list) < syll_count:
+    min_ticks = int(beats_to_ticks(min_note_beats, table.timebase))
+    if mode == "dp":
+        return _align_dp(table, list(syllables), bpm, min_ticks, cues)
+
+    durations = table.duration
+    pitches = table.pitch
+    splits_applied = 0
+    if syll_count > note_count:
+        durations, pitches, splits_applied = _expand_notes(durations, pitches, syll_count, min_ticks)
+
+    if len(durations) < syll_count:
         raise AlignmentError("Unable to split notes to accommodate all syllables")
 
     filler_notes = 0
-    if len(notes_list) > syll_count:
-        filler_notes = len(notes_list) - syll_count
-        syllables = list(syllables) + ["—"] * filler_notes
+    if len(durations) > syll_count:
+        filler_notes = len(durations) - syll_count
+        syllables = list(syllables) + [FILLER_LYRIC] * filler_notes
 
-    aligned_notes = _assign_lyrics(notes_list, syllables, bpm)
-    return AlignmentResult(notes=aligned_notes, splits_applied=splits_applied, filler_notes=filler_notes)
+    aligned = NoteTable.from_durations(durations, pitches, timebase=table.timebase, bpm=bpm).with_lyrics(syllables)
+    return AlignmentResult(notes=aligned, splits_applied=splits_applied, filler_notes=filler_notes)
 
 
-def _expand_notes(notes: List[Note], target_count: int, min_note_beats: float) -> int:
+def _expand_notes(durations, pitches, target_count: int, min_ticks: int):
+    """Halve the longest note (earliest first on ties) until ``target_count`` notes exist.
+
+    Pieces live in a max-heap keyed by ``(-duration, source note, offset)``,
+    which reproduces the left-to-right tie-breaking of a linear scan in
+    O(log n) per split.
+    """
+    heap = [(-int(duration), idx, 0) for idx, duration in enumerate(durations.tolist())]
+    heapq.heapify(heap)
+    count = len(heap)
     splits = 0
-    while len(notes) < target_count:
-        idx = max(range(len(notes)), key=lambda i: notes[i].duration_beats)
-        note = notes[idx]
-        half_duration = note.duration_beats / 2.0
-        if half_duration < min_note_beats:
+    while count < target_count:
+        neg_duration, idx, offset = heap[0]
+        duration = -neg_duration
+        half = duration // 2
+        if duration < 2 * min_ticks or half == 0:
             break
-        replacement = [
-            Note(start_sec=0.0, duration_beats=half_duration, midi_pitch=note.midi_pitch),
-            Note(start_sec=0.0, duration_beats=half_duration, midi_pitch=note.midi_pitch),
-        ]
-        notes[idx : idx + 1] = replacement
+        heapq.heapreplace(heap, (-(duration - half), idx, offset))
+        heapq.heappush(heap, (-half, idx, offset + duration - half))
+        count += 1
         splits += 1
-    return splits
-
-
-def _assign_lyrics(notes: List[Note], syllables: Sequence[str], bpm: float) -> List[Note]:
-    cumulative_beats = 0.0
-    aligned: List[Note] = []
-    for note, lyric in zip(notes, syllables):
-        start_sec = duration_seconds(cumulative_beats, bpm)
-        aligned.append(
-            Note(
-                start_sec=start_sec,
-                duration_beats=note.duration_beats,
-                midi_pitch=note.midi_pitch,
-                lyric=lyric,
-            )
-        )
-        cumulative_beats += note.duration_beats
-    return aligned
+
+    pieces = sorted(heap, key=lambda item: (item[1], item[2]))
+    new_durations = np.fromiter((-item[0] for item in pieces), dtype=np.int64, count=len(pieces))
+    sources = np.fromiter((item[1] for item in pieces), dtype=np.int64, count=len(pieces))
+    return new_durations, np.asarray(pitches)[sources], splits
+
+
+def syllable_weights(syllables: Sequence[str]) -> "np.ndarray":
+    """Relative expected length of each syllable: its letter count, less for punctuation."""
+    weights = [sum(ch.isalpha() for ch in syllable) or PUNCTUATION_WEIGHT for syllable in syllables]
+    return np.asarray(weights, dtype=np.float64)
+
+
+def _align_dp(
+    table: NoteTable,
+    syllables: List[str],
+    bpm: float,
+    min_ticks: int,
+    cues: NoteCues | None,
+) -> AlignmentResult:
+    durations = table.duration.astype(np.float64)
+    n_notes = len(durations)
+    n_syll = len(syllables)
+
+    weights = syllable_weights(syllables)
+    expected = weights * (durations.sum() / weights.sum())
+    log_expected = np.log(expected)
+    log_durations = np.log(np.maximum(durations, 1.0))
+    onset = np.zeros(n_notes) if cues is None else np.clip(np.asarray(cues.onset, dtype=np.float64), 0.0, 1.0)
+    energy = np.ones(n_notes) if cues is None else np.clip(np.asarray(cues.energy, dtype=np.float64), 0.0, 1.0)
+
+    max_split = max(MAX_SPLIT, math.ceil(n_syll / n_notes) + 2)
+    max_merge = max(MAX_MERGE, math.ceil(n_notes / n_syll) + 2)
+    band = max(BAND_MIN, max_split + max_merge, int(BAND_FRACTION * max(n_notes, n_syll)))
+
+    expected_prefix = np.concatenate([[0.0], np.cumsum(expected)])
+    duration_prefix = np.concatenate([[0.0], np.cumsum(durations)])
+    onset_prefix = np.concatenate([[0.0], np.cumsum(onset)])
+    window_min = {
+        k: np.lib.stride_tricks.sliding_window_view(expected, k).min(axis=1)
+        for k in range(2, max_split + 1)
+        if k <= n_syll
+    }
+
+    def row_band(row: int) -> tuple[int, int]:
+        centre = row * n_syll / n_notes
+        return max(0, int(math.floor(centre)) - band), min(n_syll, int(math.ceil(centre)) + band) + 1
+
+    inf = np.inf
+
+    def new_row():
+        return np.full(n_syll + 1, inf), np.zeros(n_syll + 1, np.int8), np.zeros(n_syll + 1, np.int16)
+
+    # Rows are pushed forward: only the next ``max_merge`` rows are ever pending.
+    pending = {0: new_row()}
+    pending[0][0][0] = 0.0
+    back_kind: List["np.ndarray"] = []
+    back_size: List["np.ndarray"] = []
+    bands: List[tuple[int, int]] = []
+
+    def relax(row: int, lo: int, candidate, kind: int, size: int) -> None:
+        if row not in pending:
+            pending[row] = new_row()
+        costs, kinds, sizes = pending[row]
+        target = costs[lo : lo + len(candidate)]
+        better = candidate < target
+        target[better] = candidate[better]
+        kinds[lo : lo + len(candidate)][better] = kind
+        sizes[lo : lo + len(candidate)][better] = size
+
+    for i in range(n_notes + 1):
+        costs, kinds, sizes = pending.pop(i, None) or new_row()
+        lo, hi = row_band(i)
+        costs[:lo] = inf
+        costs[hi:] = inf
+        back_kind.append(kinds[lo:hi].copy())
+        back_size.append(sizes[lo:hi].copy())
+        bands.append((lo, hi))
+        if i == n_notes:
+            final_cost = costs[n_syll]
+            break
+
+        source = costs[lo:hi]
+        if not np.isfinite(source).any():
+            continue
+        j = np.arange(lo, hi)
+
+        # Filler: note i keeps no syllable.
+        relax(i + 1, lo, source + FILLER_PENALTY * (0.5 + energy[i]), _FILLER, 1)
+
+        # Assign note i to syllable j.
+        ok = j < n_syll
+        if ok.any():
+            jj = j[ok]
+            cost = source[ok] + DURATION_WEIGHT * np.abs(log_durations[i] - log_expected[jj])
+            relax(i + 1, lo + 1, cost, _ASSIGN, 1)
+
+        # Split note i across syllables j .. j+k-1, sized by syllable weight.
+        for k in range(2, max_split + 1):
+            ok = j + k <= n_syll
+            if not ok.any() or durations[i] < k:
+                break
+            jj = j[ok]
+            span = expected_prefix[jj + k] - expected_prefix[jj]
+            smallest_piece = durations[i] * window_min[k][jj] / span
+            feasible = smallest_piece >= max(min_ticks, 1)
+            if not feasible.any():
+                continue
+            cost = source[ok] + SPLIT_PENALTY * (k - 1) + k * DURATION_WEIGHT * np.abs(log_durations[i] - np.log(span))
+            cost = np.where(feasible, cost, inf)
+            relax(i + 1, lo + k, cost, _SPLIT, k)
+
+        # Merge notes i .. i+m-1 into syllable j; crossing clear onsets is expensive.
+        ok = j < n_syll
+        if ok.any():
+            jj = j[ok]
+            for m in range(2, max_merge + 1):
+                if i + m > n_notes:
+                    break
+                merged = duration_prefix[i + m] - duration_prefix[i]
+                crossing = onset_prefix[i + m] - onset_prefix[i + 1]
+                cost = (
+                    source[ok]
+                    + MERGE_PENALTY * (m - 1)
+                    + ONSET_WEIGHT * crossing
+                    + DURATION_WEIGHT * np.abs(math.log(merged) - log_expected[jj])
+                )
+                relax(i + m, lo + 1, cost, _MERGE, m)
+
+    if not np.isfinite(final_cost):
+        raise AlignmentError("Unable to split notes to accommodate all syllables")
+
+    moves = []
+    i, j = n_notes, n_syll
+    while i > 0 or j > 0:
+        lo, _ = bands[i]
+        kind = int(back_kind[i][j - lo])
+        size = int(back_size[i][j - lo])
+        moves.append((kind, size))
+        if kind == _ASSIGN:
+            i, j = i - 1, j - 1
+        elif kind == _SPLIT:
+            i, j = i - 1, j - size
+        elif kind == _MERGE:
+            i, j = i - size, j - 1
+        elif kind == _FILLER:
+            i -= 1
+        else:  # pragma: no cover - defensive
+            raise AlignmentError("Alignment backtracking failed")
+    moves.reverse()
+
+    grid = max(int(beats_to_ticks(QUANTIZATION_STEP, table.timebase)), 1)
+    return _apply_moves(table, syllables, moves, expected, energy, bpm, grid, min_ticks)
+
+
+def _apply_moves(
+    table: NoteTable,
+    syllables: List[str],
+    moves,
+    expected,
+    energy,
+    bpm: float,
+    grid: int,
+    min_ticks: int,
+) -> AlignmentResult:
+    out_durations: List[int] = []
+    out_pitches: List[int] = []
+    lyrics: List[str] = []
+    splits = merges = fillers = 0
+    i = j = 0
+    for kind, size in moves:
+        if kind == _ASSIGN:
+            out_durations.append(int(table.duration[i]))
+            out_pitches.append(int(table.pitch[i]))
+            lyrics.append(syllables[j])
+            i, j = i + 1, j + 1
+        elif kind == _FILLER:
+            out_durations.append(int(table.duration[i]))
+            out_pitches.append(int(table.pitch[i]))
+            lyrics.append(FILLER_LYRIC)
+            fillers += 1
+            i += 1
+        elif kind == _SPLIT:
+            out_durations.extend(_proportional_ticks(int(table.duration[i]), expected[j : j + size], grid, min_ticks))
+            out_pitches.extend([int(table.pitch[i])] * size)
+            lyrics.extend(syllables[j : j + size])
+            splits += size - 1
+            i, j = i + 1, j + size
+        else:
+            group = slice(i, i + size)
+            # The merged note keeps the pitch that carries the most energy.
+            dominant = int(np.argmax(table.duration[group] * (energy[group] + 1e-6)))
+            out_durations.append(int(table.duration[group].sum()))
+            out_pitches.append(int(table.pitch[i + dominant]))
+            lyrics.append(syllables[j])
+            merges += size - 1
+            i, j = i + size, j + 1
+
+    aligned = NoteTable.from_durations(out_durations, out_pitches, timebase=table.timebase, bpm=bpm).with_lyrics(lyrics)
+    return AlignmentResult(notes=aligned, splits_applied=splits, filler_notes=fillers, merges_applied=merges)
+
+
+def _proportional_ticks(total: int, weights, grid: int = 1, min_ticks: int = 0) -> List[int]:
+    """Split ``total`` ticks in proportion to ``weights`` on a ``grid``-tick lattice.
+
+    Whole grid steps are shared out by largest remainders, pieces are topped up
+    to ``min_ticks`` from the longest ones, and any off-grid remainder goes to
+    the last piece so the sum is exact.
+    """
+    steps, leftover = divmod(total, grid)
+    if steps < len(weights):
+        steps, leftover, grid = total, 0, 1
+    shares = np.asarray(weights, dtype=np.float64) / float(np.sum(weights)) * steps
+    units = np.floor(shares).astype(np.int64)
+    remainder = steps - int(units.sum())
+    if remainder:
+        units[np.argsort(-(shares - units), kind="stable")[:remainder]] += 1
+    min_units = max(1, -(-min_ticks // grid))
+    if steps >= min_units * len(units):
+        while units.min() < min_units:
+            units[int(np.argmax(units))] -= 1
+            units[int(np.argmin(units))] += 1
+    ticks = units * grid
+    ticks[-1] += leftover
+    return ticks.tolist()
@@ -1,8 +1,12 @@
 """Audio loading and normalisation utilities."""
 from __future__ import annotations
 
+import hashlib
+import math
+import struct
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator, Tuple
 
 try:  # pragma: no cover - optional dependency at import time
     import numpy as np
@@ -18,10 +22,34 @@ except ImportError:  # pragma: no cover
 MAX_PEAK = 0.99
 TARGET_RMS = 0.1
 EPS = 1e-9
+SCAN_BLOCK_SIZE = 1 << 20
 
 
-def load_audio(path: str | Path) -> Tuple["np.ndarray", int]:
-    """Load a WAV file, downmix to mono, and normalise amplitude."""
+@dataclass
+class AudioStats:
+    """Whole-file normalisation statistics gathered by :func:`scan_audio`."""
+
+    path: Path
+    sr: int
+    length: int
+    peak: float
+    gain: float
+    content_hash: str
+
+    @property
+    def duration_sec(self) -> float:
+        return self.length / self.sr
+
+
+def load_audio(path: str | Path, mmap: bool = True, normalise: bool = True) -> Tuple["np.ndarray", int]:
+    """Load a WAV file, downmix to mono, and normalise amplitude.
+
+    Samples are read as float32 (memory-mapped for plain PCM/float WAV files
+    when ``mmap`` is set) and downmixed, scaled and clipped in place, so at
+    most one full-length float32 array is allocated. When the file is already
+    mono float32 and no gain change is needed (or ``normalise`` is false) the
+    result is a read-only view of the mapped file instead of a copy.
+    """
     if np is None or sf is None:
         raise ImportError("numpy and soundfile are required to load audio")
 
@@ -29,18 +57,224 @@ def load_audio(path: str | Path) -> Tuple["np.ndarray", int]:
     if not file_path.exists():
         raise FileNotFoundError(f"Audio file not found: {file_path}")
 
-    audio, sr = sf.read(str(file_path), always_2d=False)
-    if audio.ndim > 1:
-        audio = np.mean(audio, axis=1)
+    layout = _wav_layout(file_path) if mmap else None
+    if layout is not None:
+        raw = np.memmap(file_path, dtype=layout.dtype, mode="r", offset=layout.offset, shape=(layout.frames, layout.channels))
+        sr = layout.sr
+        if layout.dtype == "<f4" and layout.channels == 1:
+            audio = raw[:, 0]
+            gain = _normalising_gain(audio) if normalise else 1.0
+            if gain == 1.0:
+                return _read_only(audio), sr
+            out = np.empty(audio.shape, dtype=np.float32)
+            np.multiply(audio, np.float32(gain), out=out)
+            np.clip(out, -1.0, 1.0, out=out)
+            return out, sr
+        audio = _downmix_scaled(raw, layout.scale)
+    else:
+        data, sr = sf.read(str(file_path), dtype="float32", always_2d=True)
+        audio = _downmix_scaled(data, 1.0)
 
-    audio = audio.astype(np.float32)
-    peak = float(np.max(np.abs(audio)) + EPS)
-    if peak > 0:
-        audio = audio / peak * MAX_PEAK
+    if normalise:
+        gain = _normalising_gain(audio)
+        if gain != 1.0:
+            audio *= np.float32(gain)
+            np.clip(audio, -1.0, 1.0, out=audio)
+    return audio, sr
 
-    rms = float(np.sqrt(np.mean(np.square(audio)) + EPS))
-    if rms > 0:
-        gain = TARGET_RMS / rms
-        audio = np.clip(audio * gain, -1.0, 1.0)
 
-    return audio, sr
+@dataclass
+class _WavLayout:
+    offset: int
+    frames: int
+    channels: int
+    sr: int
+    dtype: str
+    scale: float
+
+
+_PCM_FORMAT = 1
+_FLOAT_FORMAT = 3
+_EXTENSIBLE_FORMAT = 0xFFFE
+_MEMMAP_DTYPES = {
+    (_PCM_FORMAT, 16): ("<i2", 1.0 / 32768.0),
+    (_PCM_FORMAT, 32): ("<i4", 1.0 / 2147483648.0),
+    (_FLOAT_FORMAT, 32): ("<f4", 1.0),
+}
+
+
+def _wav_layout(path: Path) -> _WavLayout | None:
+    """Locate the sample data of a RIFF/WAVE file that can be mapped directly.
+
+    Returns ``None`` for anything else (compressed formats, 8/24-bit PCM,
+    RF64, malformed headers) so the caller falls back to soundfile.
+    """
+    try:
+        with path.open("rb") as handle:
+            header = handle.read(12)
+            if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+                return None
+            fmt = None
+            file_size = path.stat().st_size
+            while True:
+                chunk = handle.read(8)
+                if len(chunk) < 8:
+                    return None
+                chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+                if chunk_id == b"fmt ":
+                    body = handle.read(size + (size & 1))
+                    if len(body) < 16:
+                        return None
+                    tag, channels, sr, _, block_align, bits = struct.unpack("<HHIIHH", body[:16])
+                    if tag == _EXTENSIBLE_FORMAT and len(body) >= 26:
+                        tag = struct.unpack("<H", body[24:26])[0]
+                    fmt = (tag, channels, sr, block_align, bits)
+                elif chunk_id == b"data":
+                    if fmt is None:
+                        return None
+                    tag, channels, sr, block_align, bits = fmt
+                    dtype = _MEMMAP_DTYPES.get((tag, bits))
+                    if dtype is None or channels < 1 or block_align != channels * bits // 8:
+                        return None
+                    offset = handle.tell()
+                    size = min(size, file_size - offset)
+                    return _WavLayout(offset, size // block_align, channels, sr, dtype[0], dtype[1])
+                else:
+                    handle.seek(size + (size & 1), 1)
+    except (OSError, struct.error):
+        return None
+
+
+def _downmix_scaled(frames: "np.ndarray", scale: float) -> "np.ndarray":
+    """Average the channels of ``frames`` into a new (or reused) float32 array scaled by ``scale``."""
+    channels = frames.shape[1]
+    if frames.dtype == np.float32 and frames.flags.writeable:
+        mono = frames[:, 0] if channels == 1 else np.add(frames[:, 0], frames[:, 1])
+    else:
+        mono = np.empty(frames.shape[0], dtype=np.float32)
+        if channels == 1:
+            np.copyto(mono, frames[:, 0], casting="unsafe")
+        else:
+            np.add(frames[:, 0], frames[:, 1], out=mono, dtype=np.float32, casting="unsafe")
+    for channel in range(2, channels):
+        np.add(mono, frames[:, channel], out=mono, casting="unsafe")
+    factor = scale / channels
+    if factor != 1.0:
+        mono *= np.float32(factor)
+    return mono
+
+
+def _normalising_gain(audio: "np.ndarray", block_size: int = SCAN_BLOCK_SIZE) -> float:
+    """Single gain equivalent to peak-normalising to ``MAX_PEAK`` and then scaling to ``TARGET_RMS``."""
+    if not audio.size:
+        return 1.0
+    peak = max(float(audio.max()), -float(audio.min())) + EPS
+    sum_squares = 0.0
+    for start in range(0, audio.size, block_size):
+        block = audio[start : start + block_size].astype(np.float64)
+        sum_squares += float(np.dot(block, block))
+    scale = MAX_PEAK / peak
+    rms = float(np.sqrt(sum_squares * scale * scale / audio.size + EPS))
+    return scale * (TARGET_RMS / rms) if rms > 0 else scale
+
+
+def _read_only(array: "np.ndarray") -> "np.ndarray":
+    view = array.view(np.ndarray)
+    view.flags.writeable = False
+    return view
+
+
+def resample_ratio(sr: int, target_sr: int) -> Tuple[int, int]:
+    """Smallest ``(up, down)`` with ``sr * up / down == target_sr``."""
+    common = math.gcd(int(sr), int(target_sr))
+    return int(target_sr) // common, int(sr) // common
+
+
+def decimate(samples: "np.ndarray", sr: int, target_sr: int) -> "np.ndarray":
+    """Polyphase-resample ``samples`` from ``sr`` down to ``target_sr`` (a no-op otherwise).
+
+    Output sample ``n`` lies at input time ``n * down / up``, so a block that
+    starts on a multiple of ``down`` resamples onto the same grid as the whole
+    signal.
+    """
+    if target_sr >= sr:
+        return samples
+    from scipy.signal import resample_poly
+
+    up, down = resample_ratio(sr, target_sr)
+    return np.asarray(resample_poly(samples, up, down), dtype=np.float32)
+
+
+def scan_audio(path: str | Path, block_size: int = SCAN_BLOCK_SIZE) -> AudioStats:
+    """Stream a file once to collect the peak and RMS that :func:`load_audio` normalises with.
+
+    Only one block is held in memory at a time. The returned statistics let
+    :func:`read_normalised` reproduce ``load_audio``'s output for any slice.
+    """
+    if np is None or sf is None:
+        raise ImportError("numpy and soundfile are required to load audio")
+
+    file_path = Path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {file_path}")
+
+    peak = 0.0
+    sum_squares = 0.0
+    length = 0
+    digest = hashlib.blake2b(digest_size=20)
+    with sf.SoundFile(str(file_path)) as handle:
+        sr = handle.samplerate
+        for block in handle.blocks(blocksize=block_size, dtype="float64", always_2d=True):
+            mono = _downmix(block)
+            digest.update(memoryview(np.ascontiguousarray(mono)).cast("B"))
+            if mono.size:
+                peak = max(peak, float(np.max(np.abs(mono))))
+                wide = mono.astype(np.float64)
+                sum_squares += float(np.dot(wide, wide))
+            length += mono.size
+
+    peak += EPS
+    scale = MAX_PEAK / peak
+    gain = 1.0
+    if length:
+        rms = float(np.sqrt(sum_squares * scale * scale / length + EPS))
+        if rms > 0:
+            gain = TARGET_RMS / rms
+    return AudioStats(path=file_path, sr=sr, length=length, peak=peak, gain=gain, content_hash=digest.hexdigest())
+
+
+def read_normalised(stats: AudioStats, start: int, stop: int, handle=None) -> "np.ndarray":
+    """Read samples ``[start, stop)`` normalised exactly as :func:`load_audio` would."""
+    if handle is None:
+        with sf.SoundFile(str(stats.path)) as own_handle:
+            return read_normalised(stats, start, stop, own_handle)
+
+    handle.seek(start)
+    block = _downmix(handle.read(stop - start, dtype="float64", always_2d=True))
+    block = block / stats.peak * MAX_PEAK
+    return np.clip(block * stats.gain, -1.0, 1.0)
+
+
+def iter_normalised_blocks(
+    stats: AudioStats,
+    block_size: int,
+    context: int = 0,
+) -> Iterator[Tuple[int, int, "np.ndarray"]]:
+    """Yield ``(start, core_start, samples)`` for consecutive blocks of ``block_size`` samples.
+
+    Each block is extended by up to ``context`` samples on both sides (clamped
+    to the file) so frame-based analysis sees the same neighbourhood at block
+    seams as it would on the whole signal. ``start`` is the file offset of
+    ``samples[0]``; ``core_start`` the offset where the block proper begins.
+    """
+    with sf.SoundFile(str(stats.path)) as handle:
+        for core_start in range(0, max(stats.length, 1), block_size):
+            start = max(core_start - context, 0)
+            stop = min(core_start + block_size + context, stats.length)
+            yield start, core_start, read_normalised(stats, start, stop, handle)
+
+
+def _downmix(block: "np.ndarray") -> "np.ndarray":
+    if block.ndim > 1:
+        block = block[:, 0] if block.shape[1] == 1 else np.mean(block, axis=1)
+    return block.astype(np.float32)
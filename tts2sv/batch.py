@@ -0,0 +1,288 @@
+"""Batch conversion of manifest files across a pool of worker processes."""
+from __future__ import annotations
+
+import argparse
+import copy
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Sequence
+
+from . import pipeline, text
+
+RESERVED_KEYS = {"manifest", "workers", "sweep_bpm", "sweep_grid", "sweep_min_note", "sweep_top", "progress_json", "stdin_pcm"}
+PATH_KEYS = ("wav", "out_prefix")
+TRUE_VALUES = {"1", "true", "yes", "on"}
+FALSE_VALUES = {"0", "false", "no", "off", ""}
+
+
+class ManifestError(ValueError):
+    """Raised when a manifest file cannot be parsed."""
+
+
+@dataclass
+class ManifestEntry:
+    """One manifest row translated into CLI arguments."""
+
+    line: int
+    wav: str
+    argv: List[str]
+
+
+@dataclass
+class LineOutcome:
+    """Result of converting one manifest entry."""
+
+    line: int
+    wav: str
+    result: pipeline.ConversionResult | None = None
+    error: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchSummary:
+    """Aggregate outcome of a batch run."""
+
+    outcomes: List[LineOutcome] = field(default_factory=list)
+    elapsed_sec: float = 0.0
+    workers: int = 1
+
+    @property
+    def failed(self) -> List[LineOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+    @property
+    def lines_per_sec(self) -> float:
+        if self.elapsed_sec <= 0:
+            return 0.0
+        return len(self.outcomes) / self.elapsed_sec
+
+    @property
+    def cache_hits(self) -> int:
+        return sum(1 for outcome in self.outcomes if outcome.result is not None and outcome.result.cache_hit)
+
+    @property
+    def cache_misses(self) -> int:
+        return sum(1 for outcome in self.outcomes if outcome.result is not None and outcome.result.cache_hit is False)
+
+    def timings(self) -> dict:
+        """Per-line stage records plus per-stage totals across the batch."""
+        from .instrumentation import aggregate
+
+        lines = [
+            {"line": outcome.line, "wav": outcome.wav, "seconds": outcome.seconds, **outcome.result.timings()}
+            for outcome in self.outcomes
+            if outcome.result is not None
+        ]
+        return {
+            "elapsed_sec": self.elapsed_sec,
+            "workers": self.workers,
+            "lines": lines,
+            "aggregate": aggregate(outcome.result.stages for outcome in self.outcomes if outcome.result is not None),
+        }
+
+    def report(self) -> str:
+        line = (
+            f"Processed {len(self.outcomes)} lines ({len(self.failed)} failed) "
+            f"in {self.elapsed_sec:.2f}s with {self.workers} workers: "
+            f"{self.lines_per_sec:.2f} lines/sec."
+        )
+        if self.cache_hits or self.cache_misses:
+            line += f" Analysis cache: {self.cache_hits} hits / {self.cache_misses} misses."
+        return line
+
+
+def read_manifest(path: str | Path, parser: argparse.ArgumentParser | None = None) -> List[ManifestEntry]:
+    """Read a CSV (with header) or JSONL manifest into argument lists.
+
+    Every row needs ``wav`` and ``text``; any other column matching a CLI
+    option (``out_prefix``, ``bpm``, ``strict`` …) overrides the batch-wide
+    value for that line. Relative paths are resolved against the manifest's
+    directory.
+    """
+    from .cli import build_parser
+
+    manifest_path = Path(path)
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+    parser = parser or build_parser()
+
+    if manifest_path.suffix.lower() in (".jsonl", ".ndjson"):
+        rows = _read_jsonl(manifest_path)
+    else:
+        rows = _read_csv(manifest_path)
+
+    entries: List[ManifestEntry] = []
+    for line, row in rows:
+        row = _resolve_paths(row, manifest_path.parent)
+        if not row.get("wav") or not row.get("text"):
+            raise ManifestError(f"{manifest_path}:{line}: 'wav' and 'text' are required")
+        entries.append(ManifestEntry(line=line, wav=str(row["wav"]), argv=row_to_argv(row, parser)))
+    return entries
+
+
+def row_to_argv(row: Mapping[str, Any], parser: argparse.ArgumentParser) -> List[str]:
+    """Translate a manifest row into the equivalent command line arguments."""
+    actions = {action.dest: action for action in parser._actions if action.option_strings}
+    argv: List[str] = []
+    for raw_key, value in row.items():
+        key = raw_key.strip().replace("-", "_")
+        if key in RESERVED_KEYS:
+            raise ManifestError(f"Manifest rows cannot set '{raw_key}'")
+        action = actions.get(key)
+        if action is None:
+            raise ManifestError(f"Unknown manifest column '{raw_key}'")
+        if value is None:
+            continue
+        flag = f"--{key.replace('_', '-')}"
+        if isinstance(action, argparse.BooleanOptionalAction):
+            argv.append(flag if _to_bool(value, raw_key) else f"--no-{key.replace('_', '-')}")
+        elif isinstance(value, str) and value == "":
+            continue
+        elif isinstance(value, (list, tuple)):
+            argv.extend([flag, ",".join(str(item) for item in value)])
+        else:
+            argv.extend([flag, str(value)])
+    return argv
+
+
+def run_manifest(
+    path: str | Path,
+    defaults: argparse.Namespace,
+    workers: int | None = None,
+) -> BatchSummary:
+    return run_batch(read_manifest(path), defaults=defaults, workers=workers)
+
+
+def run_batch(
+    entries: Sequence[ManifestEntry],
+    defaults: argparse.Namespace,
+    workers: int | None = None,
+) -> BatchSummary:
+    """Convert every entry, reporting per-line failures without stopping the batch.
+
+    ``workers`` defaults to the CPU count; ``1`` runs in-process, which keeps
+    tracebacks and debuggers simple.
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    workers = min(workers, max(len(entries), 1))
+    summary = BatchSummary(workers=workers)
+    started = time.perf_counter()
+
+    if workers == 1:
+        _init_worker(defaults, warm=False)
+        for entry in entries:
+            _record(summary, _convert_entry(entry))
+    else:
+        # Loaded before the pool forks so every worker shares the parsed dictionary.
+        text.preload_dictionaries([getattr(defaults, "lang", "en")])
+        # Lines already run in parallel, so each one only gets its share of the cores
+        # for --pitch-workers instead of starting a full nested pool per worker.
+        pitch_cap = max(1, (os.cpu_count() or 1) // workers)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(defaults, True, pitch_cap),
+        ) as executor:
+            futures = [executor.submit(_convert_entry, entry) for entry in entries]
+            for future in as_completed(futures):
+                _record(summary, future.result())
+
+    summary.outcomes.sort(key=lambda outcome: outcome.line)
+    summary.elapsed_sec = time.perf_counter() - started
+    return summary
+
+
+_WORKER_DEFAULTS: argparse.Namespace | None = None
+_PITCH_WORKER_CAP: int | None = None
+
+
+def _init_worker(defaults: argparse.Namespace, warm: bool = True, pitch_cap: int | None = None) -> None:
+    global _WORKER_DEFAULTS, _PITCH_WORKER_CAP
+    _WORKER_DEFAULTS = defaults
+    _PITCH_WORKER_CAP = pitch_cap
+    if warm:
+        try:
+            pipeline.warm_up()
+        except Exception:  # pragma: no cover - the real conversion reports the error
+            pass
+
+
+def _convert_entry(entry: ManifestEntry) -> LineOutcome:
+    from .cli import build_parser, validate
+
+    started = time.perf_counter()
+    outcome = LineOutcome(line=entry.line, wav=entry.wav)
+    try:
+        namespace = copy.copy(_WORKER_DEFAULTS) if _WORKER_DEFAULTS is not None else None
+        parser = build_parser()
+        args = parser.parse_args(entry.argv, namespace=namespace)
+        validate(parser, args)
+        if _PITCH_WORKER_CAP is not None and args.pitch_workers:
+            args.pitch_workers = min(args.pitch_workers, _PITCH_WORKER_CAP)
+        outcome.result = pipeline.convert(args)
+    except SystemExit as exc:
+        outcome.error = f"invalid options (exit {exc.code})"
+    except Exception as exc:
+        outcome.error = f"{type(exc).__name__}: {exc}"
+    outcome.seconds = time.perf_counter() - started
+    return outcome
+
+
+def _record(summary: BatchSummary, outcome: LineOutcome) -> None:
+    summary.outcomes.append(outcome)
+    if not outcome.ok:
+        print(f"line {outcome.line} ({outcome.wav}): {outcome.error}", file=sys.stderr)
+
+
+def _read_jsonl(path: Path) -> Iterable[tuple[int, dict]]:
+    with path.open(encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ManifestError(f"{path}:{line_no}: {exc}") from exc
+            if not isinstance(row, dict):
+                raise ManifestError(f"{path}:{line_no}: expected a JSON object")
+            yield line_no, row
+
+
+def _read_csv(path: Path) -> Iterable[tuple[int, dict]]:
+    with path.open(encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            if not any((value or "").strip() for value in row.values()):
+                continue
+            yield reader.line_num, {key: value for key, value in row.items() if key is not None}
+
+
+def _resolve_paths(row: Mapping[str, Any], base: Path) -> dict:
+    resolved = {key.strip().replace("-", "_"): value for key, value in row.items()}
+    for key in PATH_KEYS:
+        value = resolved.get(key)
+        if value and not Path(str(value)).is_absolute():
+            resolved[key] = str(base / str(value))
+    return resolved
+
+
+def _to_bool(value: Any, key: str) -> bool:
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise ManifestError(f"Cannot interpret {value!r} as a boolean for '{key}'")
@@ -0,0 +1,139 @@
+"""Content-addressed on-disk cache for pitch/energy analysis.
+
+Entries are keyed by a hash of the audio samples plus every analysis parameter
+(engine, hop, pitch bounds, sample rate), so tempo, quantisation, text and
+export options can change freely without invalidating them. Each entry is a
+single compressed ``.npz`` written atomically, which keeps concurrent writers
+from several processes safe: readers only ever see complete files, and the
+last writer of an identical key simply wins.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+SUFFIX = ".npz"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+class AnalysisCache:
+    """Size-bounded LRU cache of analysis arrays stored under ``root``."""
+
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if np is None:
+            raise ImportError("numpy is required for the analysis cache")
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.stats = CacheStats()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def key(self, audio, params: Mapping[str, object]) -> str:
+        samples = np.ascontiguousarray(audio)
+        content = hashlib.blake2b(memoryview(samples).cast("B"), digest_size=20).hexdigest()
+        return self.key_for_content(content, {**params, "dtype": samples.dtype.str, "length": int(samples.size)})
+
+    def key_for_content(self, content_hash: str, params: Mapping[str, object]) -> str:
+        """Key for audio already hashed elsewhere, e.g. while streaming a file."""
+        header = {"version": CACHE_VERSION, "content": content_hash, "params": params}
+        payload = json.dumps(header, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=20).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{SUFFIX}"
+
+    def load(self, key: str) -> Dict[str, "np.ndarray"] | None:
+        path = self.path_for(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except (OSError, ValueError, zipfile.BadZipFile):
+            # Truncated or foreign file: drop it and recompute.
+            _unlink(path)
+            self.stats.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except FileNotFoundError:  # pragma: no cover - evicted concurrently
+            pass
+        self.stats.hits += 1
+        return arrays
+
+    def store(self, key: str, arrays: Mapping[str, "np.ndarray"]) -> Path:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez_compressed(handle, **arrays)
+            os.replace(tmp_name, path)
+        except BaseException:
+            _unlink(Path(tmp_name))
+            raise
+        self.stats.writes += 1
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits ``max_bytes``."""
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if _unlink(path):
+                removed += 1
+            total -= size
+        self.stats.evictions += removed
+        return removed
+
+    def size_bytes(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def clear(self) -> None:
+        for _, path, _ in self._entries():
+            _unlink(path)
+
+    def _entries(self) -> List[Tuple[float, Path, int]]:
+        entries: List[Tuple[float, Path, int]] = []
+        for path in self.root.glob(f"*/*{SUFFIX}"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removed by another process
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+
+def _unlink(path: Path) -> bool:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        return False
+    return True
@@ -2,53 +2,349 @@
 from __future__ import annotations
 
 import argparse
-from pathlib import Path
+import os
+import signal
+import sys
 from typing import Sequence
 
-from . import align, audio, export_midi, export_musicxml, export_ust, notes, text
+CANCELLED_EXIT_CODE = 130
 
 
-def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Convert a TTS line into SynthV/UTAU formats")
-    parser.add_argument("--wav", required=True, help="Path to the input WAV file")
-    parser.add_argument("--text", required=True, help="Exact text that was synthesised")
+    parser.add_argument("--wav", help="Path to the input WAV file")
+    parser.add_argument("--text", help="Exact text that was synthesised")
     parser.add_argument("--out-prefix", default="./tts_line", help="Prefix for output files")
     parser.add_argument("--bpm", type=float, default=120.0, help="Tempo for quantisation")
     parser.add_argument("--lang", default="en", help="Language code for syllabification")
     parser.add_argument("--min-note-beats", type=float, default=0.125, help="Minimum note duration in beats")
     parser.add_argument("--timebase", type=int, default=480, help="Ticks per quarter for UST/MIDI")
-    parser.add_argument("--strict", action="store_true", help="Fail when syllable/note mismatch is too large")
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--grid-beats",
+        type=float,
+        default=0.25,
+        help="Quantisation grid in beats (default: 0.25, a sixteenth note)",
+    )
+    parser.add_argument(
+        "--f0-engine",
+        default="pyin",
+        help="Pitch tracker: pyin (accurate, slow), yin, or nccf (NumPy only, fastest)",
+    )
+    parser.add_argument(
+        "--analysis-sr",
+        type=int,
+        default=None,
+        help="Decimate to this rate before pitch/RMS analysis, e.g. 16000 (default: the file's rate)",
+    )
+    parser.add_argument(
+        "--hop-ms",
+        type=float,
+        default=None,
+        help="Analysis frame period in milliseconds (default: ~11.6, i.e. 256 samples at 22.05 kHz)",
+    )
+    parser.add_argument(
+        "--pitch-workers",
+        type=int,
+        default=None,
+        help="Track pitch only in energy-gated regions, split across this many processes (in-memory mode)",
+    )
+    parser.add_argument(
+        "--coarse-to-fine",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Bound each region's pitch search with a cheap first pass; much faster with pyin (in-memory mode)",
+    )
+    parser.add_argument(
+        "--stream",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Analyse the WAV in blocks so memory stays bounded for long recordings",
+    )
+    parser.add_argument(
+        "--block-seconds",
+        type=float,
+        default=30.0,
+        help="Block length for --stream analysis",
+    )
+    parser.add_argument(
+        "--stdin-pcm",
+        action="store_true",
+        help="Read raw PCM from stdin instead of --wav and print notes as JSON lines while it arrives "
+        "(needs --pcm-rate and --f0-engine yin or nccf)",
+    )
+    parser.add_argument("--pcm-rate", type=int, default=None, help="Sample rate of the --stdin-pcm stream")
+    parser.add_argument(
+        "--pcm-format",
+        choices=("s16le", "s32le", "f32le"),
+        default="s16le",
+        help="Sample format of the --stdin-pcm stream (default: s16le)",
+    )
+    parser.add_argument("--pcm-channels", type=int, default=1, help="Interleaved channels in the --stdin-pcm stream")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=50.0,
+        help="Analyse the --stdin-pcm stream every this many milliseconds of audio (default: 50)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("TTS2SV_CACHE_DIR"),
+        help="Reuse pitch analysis of identical audio from this directory (default: $TTS2SV_CACHE_DIR)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=512.0,
+        help="Size limit of the analysis cache; least recently used entries are evicted",
+    )
+    parser.add_argument(
+        "--align-mode",
+        choices=("greedy", "dp"),
+        default="greedy",
+        help="Syllable alignment: greedy halving of the longest note, or dp (split/merge search using note cues)",
+    )
+    parser.add_argument(
+        "--formats",
+        type=_formats,
+        default=("musicxml", "midi", "ust"),
+        help="Comma-separated outputs to write: musicxml, midi, ust (default: all three)",
+    )
+    parser.add_argument(
+        "--split-semitones",
+        type=float,
+        default=None,
+        help="Also start a new note inside a voiced run where the pitch moves by more than this (off by default)",
+    )
+    parser.add_argument(
+        "--split-frames",
+        type=int,
+        default=8,
+        help="Frames the pitch must stay moved before --split-semitones starts a new note (default: 8, ~93 ms)",
+    )
+    parser.add_argument(
+        "--pitch-curve",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Also export the speech pitch contour as per-note bends (UST Mode2 points, MIDI pitch bend)",
+    )
+    parser.add_argument(
+        "--pitch-curve-cents",
+        type=float,
+        default=10.0,
+        help="Largest deviation from the measured contour allowed when simplifying it, in cents",
+    )
+    parser.add_argument(
+        "--pitch-curve-max-pps",
+        type=float,
+        default=40.0,
+        help="Budget in bend points per second; the tolerance is raised until the curve fits (0 = no budget)",
+    )
+    parser.add_argument(
+        "--strict",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Fail when syllable/note mismatch is too large",
+    )
+    parser.add_argument(
+        "--timings-json",
+        help="Write per-stage wall/CPU time and counts to this JSON file (aggregated over lines in --manifest mode)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Also record each stage's peak traced memory in --timings-json (slows allocation-heavy stages)",
+    )
+    parser.add_argument(
+        "--progress-json",
+        action="store_true",
+        help="Print JSON-line progress events (stage, fraction, ETA) on stdout; SIGINT/SIGTERM cancel cleanly",
+    )
+    parser.add_argument(
+        "--sweep-bpm",
+        type=_sweep_values,
+        help="Analyse once and rank these tempos, e.g. 80:160:2 or 90,100,120 (default: --bpm)",
+    )
+    parser.add_argument(
+        "--sweep-grid",
+        type=_sweep_values,
+        help="Quantisation grids in beats to include in the sweep, e.g. 0.125,0.25 (default: --grid-beats)",
+    )
+    parser.add_argument(
+        "--sweep-min-note",
+        type=_sweep_values,
+        help="Minimum note lengths in beats to include in the sweep (default: --min-note-beats)",
+    )
+    parser.add_argument(
+        "--sweep-top",
+        type=int,
+        default=1,
+        help="Export the N best sweep settings (N > 1 writes <out-prefix>_top1 ... _topN)",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="CSV or JSONL file listing wav/text/out_prefix rows (plus per-line option overrides) to convert in batch",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --manifest mode (defaults to the number of CPU cores)",
+    )
+    return parser
+
+
+def _formats(value: str) -> tuple[str, ...]:
+    from .export import parse_formats
+
+    try:
+        return parse_formats(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _sweep_values(value: str) -> list[float]:
+    from .sweep import parse_values
+
+    try:
+        return parse_values(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def sweeping(args: argparse.Namespace) -> bool:
+    return bool(args.sweep_bpm or args.sweep_grid or args.sweep_min_note)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.manifest is None and (args.text is None or (args.wav is None and not args.stdin_pcm)):
+        parser.error("--wav (or --stdin-pcm) and --text are required unless --manifest is given")
+    if args.manifest is not None and sweeping(args):
+        parser.error("--sweep-* options are not supported with --manifest")
+    if args.manifest is not None and args.progress_json:
+        parser.error("--progress-json is not supported with --manifest")
+    validate(parser, args)
+    return args
+
+
+def validate(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Cross-option checks shared by the CLI, the server and every batch row."""
+    _check_f0_engine(parser, args)
+    if args.bpm <= 0:
+        parser.error("--bpm must be positive")
+    if args.stream and (args.pitch_workers or args.coarse_to_fine):
+        parser.error("--pitch-workers and --coarse-to-fine only apply to in-memory analysis, not --stream")
+    if args.stdin_pcm:
+        _check_stdin_pcm(parser, args)
+
+
+def _check_f0_engine(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Reject an unregistered ``--f0-engine``; the default is skipped so parsing stays free of NumPy."""
+    if args.f0_engine == parser.get_default("f0_engine"):
+        return
+    from .f0 import available_engines
+
+    if args.f0_engine not in available_engines():
+        parser.error(f"unknown --f0-engine '{args.f0_engine}' (available: {', '.join(available_engines())})")
+
+
+def _check_stdin_pcm(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    from .f0 import FRAME_KERNELS
+
+    conflicts = {
+        "--wav": args.wav is not None,
+        "--manifest": args.manifest is not None,
+        "--stream": args.stream,
+        "--sweep-*": sweeping(args),
+        "--progress-json": args.progress_json,
+        "--pitch-workers": bool(args.pitch_workers),
+        "--coarse-to-fine": args.coarse_to_fine,
+        "--analysis-sr": args.analysis_sr is not None,
+    }
+    used = [flag for flag, given in conflicts.items() if given]
+    if used:
+        parser.error(f"{', '.join(used)} cannot be combined with --stdin-pcm")
+    if args.pcm_rate is None or args.pcm_rate <= 0:
+        parser.error("--stdin-pcm needs a positive --pcm-rate")
+    if args.pcm_channels < 1:
+        parser.error("--pcm-channels must be at least 1")
+    if args.latency_ms <= 0:
+        parser.error("--latency-ms must be positive")
+    if args.f0_engine not in FRAME_KERNELS:
+        parser.error(f"--stdin-pcm needs a frame-wise --f0-engine ({', '.join(sorted(FRAME_KERNELS))})")
 
 
 def main(argv: Sequence[str] | None = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["serve"]:
+        from . import server
+
+        server.main(argv[1:])
+        return
+
     args = parse_args(argv)
 
-    audio_data, sr = audio.load_audio(args.wav)
-    syllables = text.syllabify_text(args.text, lang=args.lang)
-    extraction = notes.extract_notes(audio_data, sr=sr, bpm=args.bpm, min_note_beats=args.min_note_beats)
-    alignment = align.align_syllables_to_notes(
-        extraction.notes,
-        syllables,
-        bpm=args.bpm,
-        min_note_beats=args.min_note_beats,
-        strict=args.strict,
-    )
+    if args.manifest is not None:
+        from . import batch
 
-    prefix = Path(args.out_prefix)
-    export_musicxml.export_musicxml(alignment.notes, bpm=args.bpm, out_path=prefix.with_suffix(".musicxml"))
-    export_midi.export_midi(alignment.notes, bpm=args.bpm, out_path=prefix.with_suffix(".mid"))
-    export_ust.export_ust(
-        alignment.notes,
-        bpm=args.bpm,
-        timebase=args.timebase,
-        out_path=prefix.with_suffix(".ust"),
-    )
+        summary = batch.run_manifest(args.manifest, defaults=args, workers=args.workers)
+        print(summary.report())
+        if args.timings_json:
+            from .instrumentation import write_json
 
-    print(
-        f"Exported {len(alignment.notes)} notes / {len(syllables)} syllables "
-        f"(splits: {alignment.splits_applied}, filler notes: {alignment.filler_notes})."
-    )
+            write_json(summary.timings(), args.timings_json)
+        if summary.failed:
+            raise SystemExit(1)
+        return
+
+    if args.stdin_pcm:
+        from . import live
+
+        result = live.run(args)
+        if args.timings_json:
+            from .instrumentation import write_json
+
+            write_json(result.timings(), args.timings_json)
+        return
+
+    from . import pipeline
+    from .progress import NULL_PROGRESS, Cancelled
+
+    progress = _progress_reporter() if args.progress_json else NULL_PROGRESS
+    try:
+        if sweeping(args):
+            outcome = pipeline.run_sweep(args, progress=progress)
+        else:
+            result = pipeline.convert(args, progress=progress)
+    except Cancelled:
+        print('{"event": "cancelled"}' if args.progress_json else "Cancelled.", flush=True)
+        raise SystemExit(CANCELLED_EXIT_CODE)
+
+    if sweeping(args):
+        print(outcome.report())
+        if args.timings_json:
+            from .instrumentation import write_json
+
+            write_json(outcome.timings(), args.timings_json)
+        return
+
+    print(result.summary())
+    if args.timings_json:
+        from .instrumentation import write_json
+
+        write_json(result.timings(), args.timings_json)
+
+
+def _progress_reporter():
+    """JSON-line progress on stdout, cancelled by SIGINT/SIGTERM at the next chunk boundary."""
+    from .progress import CancelToken, Progress, json_lines
+
+    token = CancelToken()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: token.cancel())
+    return Progress(on_event=json_lines(sys.stdout), cancel=token)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+"""Coarse-to-fine pitch tracking with per-region frequency bounds.
+
+The trackers search the full ``FMIN_MIDI``–``FMAX_MIDI`` range (five
+octaves), although one TTS voice rarely leaves an octave or so. A cheap
+first pass (the ``nccf`` kernel on a signal decimated to ``COARSE_SR``, at
+``COARSE_HOP_FACTOR`` times the hop, over gated frames only) estimates where
+each gated region is voiced and which pitches it covers. The accurate
+tracker then runs per region (:func:`tts2sv.regions.track_pitch_regions`)
+with ``fmin``/``fmax`` narrowed to that range plus ``MARGIN_SEMITONES``,
+which shrinks pyin's pitch-state space and the lag range of yin/nccf.
+
+A region falls back to the full range whenever the coarse pass is unsure:
+too few voiced coarse frames, or a spread wider than ``MAX_SPAN_SEMITONES``
+(typically octave jumps). Regions without any periodicity at all are left
+unvoiced. :func:`compare` measures the speed-up and agreement against the
+full-range pass on a given recording.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from . import f0 as f0_engines, progress
+from .framing import Framing
+
+COARSE_SR = 8000
+COARSE_HOP_FACTOR = 4
+MARGIN_SEMITONES = 3.0
+MAX_SPAN_SEMITONES = 24.0
+MIN_VOICED_FRAMES = 3  # coarse frames, ~140 ms at the default hop
+UNVOICED_PROB = 0.45  # no coarse frame this periodic: nothing to track
+AGREEMENT_CENTS = 50.0
+
+
+@dataclass
+class RegionRange:
+    """Frame range ``[first, last)`` and the pitch range chosen for it."""
+
+    first: int
+    last: int
+    status: str  # "narrowed", "fallback" or "unvoiced"
+    fmin: float | None = None
+    fmax: float | None = None
+
+    @property
+    def semitones(self) -> float:
+        if self.fmin is None or self.fmax is None:
+            return 0.0
+        return float(12.0 * np.log2(self.fmax / self.fmin))
+
+
+class CoarseRanges:
+    """Coarse pitch estimate of ``audio`` answering per-region ``(fmin, fmax)`` queries.
+
+    Instances are the ``bounds`` callback of
+    :func:`tts2sv.regions.track_pitch_regions`; every answer is recorded in
+    :attr:`regions`.
+    """
+
+    def __init__(self, audio, sr: int, hop_length: int, mask, fmin: float, fmax: float) -> None:
+        from .audio import decimate
+
+        self.fmin, self.fmax = fmin, fmax
+        self.regions: List[RegionRange] = []
+        rate = min(int(sr), COARSE_SR)
+        coarse_hop = max(int(round(hop_length * COARSE_HOP_FACTOR * rate / sr)), 1)
+        samples = decimate(audio, sr, rate)
+        framing = Framing(samples, coarse_hop, f0_engines.frame_length_for(rate, fmin))
+        mask = np.asarray(mask, dtype=bool)
+        # Fine frame nearest to each coarse frame centre (non-decreasing).
+        self._fine = np.minimum(
+            np.round(np.arange(framing.n_frames) * coarse_hop * sr / (rate * hop_length)).astype(int),
+            mask.size - 1,
+        )
+        # Weighted zero: the coarse pass is cancellable but not counted as analysed frames.
+        with progress.span(0, 1):
+            track = f0_engines._track_frames(
+                f0_engines.FRAME_KERNELS["nccf"], framing, rate, fmin, fmax, select=mask[self._fine]
+            )
+        self.f0, self.voiced_prob = track.f0, track.voiced_prob
+
+    def __call__(self, first: int, last: int) -> Tuple[float, float] | None:
+        lo, hi = np.searchsorted(self._fine, [first, last])
+        f0, prob = self.f0[lo:hi], self.voiced_prob[lo:hi]
+        midi = f0_engines.hz_to_midi(f0[~np.isnan(f0)])
+        if midi.size == 0 and (prob.size == 0 or prob.max() < UNVOICED_PROB):
+            self.regions.append(RegionRange(first, last, "unvoiced"))
+            return None
+        low, high = np.percentile(midi, [5, 95]) if midi.size else (0.0, np.inf)
+        if midi.size < MIN_VOICED_FRAMES or high - low > MAX_SPAN_SEMITONES:
+            self.regions.append(RegionRange(first, last, "fallback", self.fmin, self.fmax))
+            return self.fmin, self.fmax
+        fmin = max(float(f0_engines.midi_to_hz(low - MARGIN_SEMITONES)), self.fmin)
+        fmax = min(float(f0_engines.midi_to_hz(high + MARGIN_SEMITONES)), self.fmax)
+        self.regions.append(RegionRange(first, last, "narrowed", fmin, fmax))
+        return fmin, fmax
+
+    def counts(self) -> dict:
+        """Regions per status and the semitones searched over the narrowed ones, for stage records."""
+        counts = {f"regions_{status}": 0 for status in ("narrowed", "fallback", "unvoiced")}
+        for region in self.regions:
+            counts[f"regions_{region.status}"] += 1
+        counts["narrowed_semitones"] = round(sum(r.semitones for r in self.regions if r.status == "narrowed"), 1)
+        return counts
+
+
+@dataclass
+class Agreement:
+    """Coarse-to-fine analysis measured against the full-range pass over the same audio."""
+
+    full_sec: float
+    coarse_sec: float
+    voicing: float  # share of gated frames with the same voicing decision
+    pitch: float  # share of frames voiced in both within AGREEMENT_CENTS
+    notes: float  # share of frames inside a note (in either run) given the same note pitch
+    counts: dict = field(default_factory=dict)
+
+    @property
+    def speedup(self) -> float:
+        return self.full_sec / self.coarse_sec if self.coarse_sec > 0 else float("inf")
+
+    def report(self) -> str:
+        narrowed = self.counts.get("regions_narrowed", 0)
+        mean_range = self.counts.get("narrowed_semitones", 0.0) / narrowed if narrowed else 0.0
+        return (
+            f"coarse-to-fine {self.coarse_sec:.2f}s vs full range {self.full_sec:.2f}s ({self.speedup:.1f}x); "
+            f"voicing {self.voicing:.1%}, pitch within {AGREEMENT_CENTS:g} cents {self.pitch:.1%}, "
+            f"note frames {self.notes:.1%}; regions {narrowed} narrowed (~{mean_range:.0f} semitones), "
+            f"{self.counts.get('regions_fallback', 0)} full range, {self.counts.get('regions_unvoiced', 0)} unvoiced"
+        )
+
+
+def compare(audio, sr: int, f0_engine: str = "pyin", **options) -> Agreement:
+    """Analyse ``audio`` with and without coarse-to-fine bounds and measure both.
+
+    ``options`` are passed to :func:`tts2sv.notes.analyze` for both runs.
+    Agreement is taken over frames passing the note energy gate, the only
+    ones note building uses.
+    """
+    from . import notes
+
+    started = time.perf_counter()
+    full = notes.analyze(audio, sr, f0_engine=f0_engine, **options)
+    full_sec = time.perf_counter() - started
+    started = time.perf_counter()
+    narrowed = notes.analyze(audio, sr, f0_engine=f0_engine, coarse_to_fine=True, **options)
+    coarse_sec = time.perf_counter() - started
+
+    gated = full.rms >= notes.energy_gate(full.rms)
+    voiced_full = ~np.isnan(full.f0) & gated
+    voiced_narrowed = ~np.isnan(narrowed.f0) & gated
+    both = voiced_full & voiced_narrowed
+    cents = 1200.0 * np.abs(np.log2(narrowed.f0[both] / full.f0[both]))
+
+    seconds = float(len(audio) / sr)
+    labels_full = _note_labels(notes.find_note_segments(full, seconds), full.f0.size)
+    labels_narrowed = _note_labels(notes.find_note_segments(narrowed, seconds), full.f0.size)
+    in_note = (labels_full > 0) | (labels_narrowed > 0)
+    return Agreement(
+        full_sec=full_sec,
+        coarse_sec=coarse_sec,
+        voicing=float(np.mean(voiced_full[gated] == voiced_narrowed[gated])) if gated.any() else 1.0,
+        pitch=float(np.mean(cents < AGREEMENT_CENTS)) if cents.size else 1.0,
+        notes=float(np.mean(labels_full[in_note] == labels_narrowed[in_note])) if in_note.any() else 1.0,
+        counts=narrowed.coarse or {},
+    )
+
+
+def _note_labels(segments, n_frames: int) -> "np.ndarray":
+    """MIDI pitch of the segment covering each frame, 0 outside every segment."""
+    labels = np.zeros(n_frames, dtype=int)
+    for (first, last), pitch in zip(segments.bounds.tolist(), segments.pitch.tolist()):
+        labels[first : last + 1] = pitch
+    return labels
@@ -0,0 +1,127 @@
+"""Export stage: write several output formats from one shared note table."""
+from __future__ import annotations
+
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from . import progress
+from .notetable import DEFAULT_TIMEBASE, NoteTable, as_note_table
+from .utils import Note
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pitchcurve import NoteBends
+
+SUFFIXES = {"musicxml": ".musicxml", "midi": ".mid", "ust": ".ust"}
+FORMATS = tuple(SUFFIXES)
+ALIASES = {"xml": "musicxml", "mid": "midi"}
+
+
+@dataclass
+class ExportResult:
+    """Written files and the wall time each exporter took, keyed by format."""
+
+    outputs: Dict[str, Path] = field(default_factory=dict)
+    seconds: Dict[str, float] = field(default_factory=dict)
+
+    def timings(self) -> str:
+        return ", ".join(f"{fmt} {self.seconds[fmt]:.3f}s" for fmt in self.outputs)
+
+
+def parse_formats(value: str | Iterable[str]) -> Tuple[str, ...]:
+    """Normalise ``"musicxml,mid"`` (or a list) to canonical format names in a fixed order."""
+    items = value.split(",") if isinstance(value, str) else list(value)
+    wanted = set()
+    for item in items:
+        name = item.strip().lower().lstrip(".")
+        if not name:
+            continue
+        name = ALIASES.get(name, name)
+        if name not in SUFFIXES:
+            raise ValueError(f"Unknown export format '{item.strip()}' (available: {', '.join(FORMATS)})")
+        wanted.add(name)
+    if not wanted:
+        raise ValueError("At least one export format is required")
+    return tuple(fmt for fmt in FORMATS if fmt in wanted)
+
+
+def export_all(
+    notes: Sequence[Note] | NoteTable,
+    bpm: float,
+    out_prefix: str | Path,
+    formats: Iterable[str] = FORMATS,
+    timebase: int = DEFAULT_TIMEBASE,
+    bends: "NoteBends | None" = None,
+) -> ExportResult:
+    """Write each requested format next to ``out_prefix``.
+
+    The note table is built once and shared read-only by the exporters, which
+    run concurrently on threads when more than one format is requested. Only
+    the exporter modules that are needed get imported. ``bends`` (see
+    :mod:`tts2sv.pitchcurve`) go into the MIDI and UST files; MusicXML has no
+    place for them. Each finished file is reported to the active progress
+    stage; if the run is cancelled meanwhile, every file this call started is
+    removed again before :class:`tts2sv.progress.Cancelled` propagates.
+    """
+    formats = parse_formats(formats)
+    table = as_note_table(notes, bpm=bpm, timebase=timebase)
+    prefix = Path(out_prefix)
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+
+    started_paths: List[Path] = []
+
+    def run(fmt: str) -> Tuple[Path, float]:
+        progress.checkpoint()
+        started = time.perf_counter()
+        target = prefix.with_suffix(SUFFIXES[fmt])
+        started_paths.append(target)
+        path = _WRITERS[fmt](table, bpm, timebase, target, bends)
+        seconds = time.perf_counter() - started
+        progress.advance(1)
+        return path, seconds
+
+    try:
+        if len(formats) == 1:
+            done = {formats[0]: run(formats[0])}
+        else:
+            with ThreadPoolExecutor(max_workers=len(formats), thread_name_prefix="tts2sv-export") as executor:
+                # Writers run in copies of this context so they see the active progress stage.
+                futures = {fmt: executor.submit(contextvars.copy_context().run, run, fmt) for fmt in formats}
+                done = {fmt: future.result() for fmt, future in futures.items()}
+    except progress.Cancelled:
+        for path in started_paths:
+            path.unlink(missing_ok=True)
+        raise
+
+    result = ExportResult()
+    for fmt in formats:
+        result.outputs[fmt], result.seconds[fmt] = done[fmt]
+    return result
+
+
+def _write_musicxml(table: NoteTable, bpm: float, timebase: int, path: Path, bends: "NoteBends | None") -> Path:
+    from .export_musicxml import export_musicxml
+
+    return export_musicxml(table, bpm=bpm, out_path=path)
+
+
+def _write_midi(table: NoteTable, bpm: float, timebase: int, path: Path, bends: "NoteBends | None") -> Path:
+    from .export_midi import export_midi
+
+    return export_midi(table, bpm=bpm, out_path=path, timebase=timebase, bends=bends)
+
+
+def _write_ust(table: NoteTable, bpm: float, timebase: int, path: Path, bends: "NoteBends | None") -> Path:
+    from .export_ust import export_ust
+
+    return export_ust(table, bpm=bpm, timebase=timebase, out_path=path, bends=bends)
+
+
+_WRITERS: Dict[str, Callable[[NoteTable, float, int, Path, "NoteBends | None"], Path]] = {
+    "musicxml": _write_musicxml,
+    "midi": _write_midi,
+    "ust": _write_ust,
+}
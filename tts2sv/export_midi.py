@@ -1,16 +1,166 @@
-"""MIDI exporter using music21."""
+"""Standard MIDI File exporter.
+
+Notes are written straight to a single-track (format 0) SMF using the same
+tick grid as the UST exporter, so no music21 object graph is needed. The
+music21 route is kept as :func:`export_midi_music21` for comparison.
+"""
 from __future__ import annotations
 
+import math
+import struct
 from pathlib import Path
-from typing import Sequence
+from typing import TYPE_CHECKING, List, Sequence, Tuple
 
-from .export_musicxml import build_stream
+from .notetable import DEFAULT_TIMEBASE, NoteTable, as_note_table, reflow
 from .utils import Note
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .pitchcurve import NoteBends
+
+TRACK_NAME = "Voice"
+CHANNEL = 0
+VELOCITY = 90
+MAX_DIVISION = 0x7FFF
+BEND_RANGE_SEMITONES = 12  # announced via RPN 0 whenever bends are written
+BEND_CENTER = 0x2000
+
+_META = 0xFF
+_META_TRACK_NAME = 0x03
+_META_LYRIC = 0x05
+_META_END_OF_TRACK = 0x2F
+_META_TEMPO = 0x51
+_META_TIME_SIGNATURE = 0x58
+
+
+def export_midi(
+    notes: Sequence[Note] | NoteTable,
+    bpm: float,
+    out_path: str | Path,
+    timebase: int = DEFAULT_TIMEBASE,
+    bends: "NoteBends | None" = None,
+) -> Path:
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(encode_midi(notes, bpm=bpm, timebase=timebase, bends=bends))
+    return path
+
+
+def encode_midi(
+    notes: Sequence[Note] | NoteTable,
+    bpm: float,
+    timebase: int = DEFAULT_TIMEBASE,
+    bends: "NoteBends | None" = None,
+) -> bytes:
+    """Serialise ``notes`` as a format-0 SMF with ``timebase`` ticks per quarter note.
+
+    ``bends`` adds pitch-bend events (range ``BEND_RANGE_SEMITONES``). MIDI
+    holds each bend value until the next one, so the straight segments between
+    simplified points are drawn as steps no taller than the simplification
+    tolerance.
+    """
+    if bpm <= 0:
+        raise ValueError("BPM must be positive")
+    if not 0 < timebase <= MAX_DIVISION:
+        raise ValueError(f"MIDI timebase must be between 1 and {MAX_DIVISION}")
+
+    table = as_note_table(notes, bpm=bpm, timebase=timebase)
+    lengths = table.ticks_at(timebase).clip(min=1)  # UST clamps the same way
+    starts = reflow(lengths).tolist()
+    lengths = lengths.tolist()
+    pitches = table.pitch.clip(0, 127).tolist()
+
+    track = bytearray()
+    track += b"\x00" + _meta(_META_TRACK_NAME, TRACK_NAME.encode("ascii"))
+    track += b"\x00" + _meta(_META_TIME_SIGNATURE, bytes((4, 2, 24, 8)))
+    track += b"\x00" + _meta(_META_TEMPO, round(60_000_000 / bpm).to_bytes(3, "big"))
+    if bends is not None:
+        control = 0xB0 | CHANNEL
+        # RPN 0 (pitch-bend sensitivity) = BEND_RANGE_SEMITONES, then deselect the RPN.
+        for number, value in ((101, 0), (100, 0), (6, BEND_RANGE_SEMITONES), (38, 0), (101, 127), (100, 127)):
+            track += b"\x00" + bytes((control, number, value))
+
+    note_on = 0x90 | CHANNEL
+    note_off = 0x80 | CHANNEL
+    cursor = 0
+    current_bend = BEND_CENTER
+    for idx in range(len(lengths)):
+        # Notes are back to back, so each note's off event shares the next one's tick.
+        events = []
+        if bends is not None:
+            # The first point's bend holds from the note-on; notes without points play unbent.
+            events = _bend_events(bends, idx, starts[idx], lengths[idx]) or [(starts[idx], BEND_CENTER)]
+            events[0] = (starts[idx], events[0][1])
+        for tick, value in events[:1]:
+            if value != current_bend:
+                track += _varlen(tick - cursor) + _pitch_bend(value)
+                cursor, current_bend = tick, value
+        track += _varlen(starts[idx] - cursor)
+        lyric = table.lyric(idx)
+        if lyric is not None:
+            track += _meta(_META_LYRIC, lyric.encode("utf-8")) + b"\x00"
+        track += bytes((note_on, pitches[idx], VELOCITY))
+        cursor = starts[idx]
+        for tick, value in events[1:]:
+            if value != current_bend:
+                track += _varlen(tick - cursor) + _pitch_bend(value)
+                cursor, current_bend = tick, value
+        end = starts[idx] + lengths[idx]
+        track += _varlen(end - cursor)
+        track += bytes((note_off, pitches[idx], 0))
+        cursor = end
+    track += b"\x00" + _meta(_META_END_OF_TRACK, b"")
+
+    header = b"MThd" + struct.pack(">IHHH", 6, 0, 1, timebase)
+    return header + b"MTrk" + struct.pack(">I", len(track)) + bytes(track)
+
+
+def export_midi_music21(notes: Sequence[Note] | NoteTable, bpm: float, out_path: str | Path) -> Path:
+    """Write MIDI through music21 (slower; kept for benchmarks and cross-checks)."""
+    from .export_musicxml import build_stream
 
-def export_midi(notes: Sequence[Note], bpm: float, out_path: str | Path) -> Path:
     score = build_stream(notes, bpm)
     path = Path(out_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     score.write("midi", fp=str(path))
     return path
+
+
+def _bend_events(bends: "NoteBends", idx: int, start: int, length: int) -> List[Tuple[int, int]]:
+    """``(tick, 14-bit value)`` pairs for note ``idx``, with straight segments rendered as small steps."""
+    position, cents = bends.note(idx)
+    if not len(position):
+        return []
+    ticks = [start + min(int(round(float(pos) * length)), length - 1) for pos in position]
+    cents = [float(value) for value in cents]
+    step = max(bends.epsilon_cents, 1.0)
+    events = [(ticks[0], _bend_value(cents[0]))]
+    for (t0, c0), (t1, c1) in zip(zip(ticks, cents), zip(ticks[1:], cents[1:])):
+        pieces = max(1, min(t1 - t0, math.ceil(abs(c1 - c0) / step)))
+        for piece in range(1, pieces + 1):
+            events.append((t0 + (t1 - t0) * piece // pieces, _bend_value(c0 + (c1 - c0) * piece / pieces)))
+    return events
+
+
+def _bend_value(cents: float) -> int:
+    value = BEND_CENTER + round(cents / (BEND_RANGE_SEMITONES * 100.0) * BEND_CENTER)
+    return min(max(value, 0), 0x3FFF)
+
+
+def _pitch_bend(value: int) -> bytes:
+    return bytes((0xE0 | CHANNEL, value & 0x7F, value >> 7))
+
+
+def _meta(kind: int, payload: bytes) -> bytes:
+    return bytes((_META, kind)) + _varlen(len(payload)) + payload
+
+
+def _varlen(value: int) -> bytes:
+    """MIDI variable-length quantity: 7 bits per byte, high bit set on all but the last."""
+    if value < 0:
+        raise ValueError("MIDI delta times cannot be negative")
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(out))
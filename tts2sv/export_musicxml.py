@@ -1,11 +1,90 @@
-"""MusicXML exporter."""
+"""MusicXML exporter.
+
+Notes are streamed straight to a partwise MusicXML file, one ``<measure>``
+at a time, with ``divisions`` equal to the note table's timebase so every
+duration stays an exact integer. Notes crossing a 4/4 barline, or lasting a
+value no single (dotted) note type can show, are split into tied notes;
+the lyric goes on the first of them. Pitch spelling, accidentals and the
+clef follow music21's defaults, whose route is kept as
+:func:`export_musicxml_music21` for comparison.
+"""
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Sequence
+from typing import IO, Any, List, Sequence, Tuple
+from xml.sax.saxutils import escape
 
+from .notetable import NoteTable, as_note_table
 from .utils import Note
 
+BEATS_PER_MEASURE = 4
+PART_NAME = "Voice"
+MIDI_PROGRAM = 54  # 1-based General MIDI "Voice Oohs", as music21's Vocalist
+
+# music21's default spelling of each pitch class: (step, alter).
+SPELLING = (
+    ("C", 0), ("C", 1), ("D", 0), ("E", -1), ("E", 0), ("F", 0),
+    ("F", 1), ("G", 0), ("G", 1), ("A", 0), ("B", -1), ("B", 0),
+)  # fmt: skip
+STEPS = "CDEFGAB"
+ACCIDENTALS = {-1: "flat", 0: "natural", 1: "sharp"}
+# (quarter notes, type) from the longest value down; dotted values are derived.
+NOTE_TYPES = (
+    (4.0, "whole"), (2.0, "half"), (1.0, "quarter"), (0.5, "eighth"),
+    (0.25, "16th"), (0.125, "32nd"), (0.0625, "64th"), (0.03125, "128th"),
+)  # fmt: skip
+
+_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 4.0 Partwise//EN" "http://www.musicxml.org/dtds/partwise.dtd">
+<score-partwise version="4.0">
+  <identification>
+    <encoding>
+      <software>tts2sv</software>
+    </encoding>
+  </identification>
+  <part-list>
+    <score-part id="P1">
+      <part-name>{name}</part-name>
+      <score-instrument id="P1-I1">
+        <instrument-name>{name}</instrument-name>
+      </score-instrument>
+      <midi-instrument id="P1-I1">
+        <midi-channel>1</midi-channel>
+        <midi-program>{program}</midi-program>
+      </midi-instrument>
+    </score-part>
+  </part-list>
+  <part id="P1">
+"""
+_ATTRIBUTES = """      <attributes>
+        <divisions>{divisions}</divisions>
+        <time>
+          <beats>{beats}</beats>
+          <beat-type>4</beat-type>
+        </time>
+        <clef>
+          <sign>{sign}</sign>
+          <line>{line}</line>
+        </clef>
+      </attributes>
+      <direction placement="above">
+        <direction-type>
+          <metronome>
+            <beat-unit>quarter</beat-unit>
+            <per-minute>{bpm:g}</per-minute>
+          </metronome>
+        </direction-type>
+        <sound tempo="{bpm:g}"/>
+      </direction>
+"""
+_FOOTER = """      <barline location="right">
+        <bar-style>light-heavy</bar-style>
+      </barline>
+    </measure>
+  </part>
+</score-partwise>
+"""
+
 _MUSIC21_IMPORT_ERROR = "music21 is required for MusicXML export"
 _MUSIC21_MODULES: tuple[Any, ...] | None = None
 
@@ -23,20 +102,76 @@ def _load_music21() -> tuple[Any, ...]:
     return _MUSIC21_MODULES
 
 
-def build_stream(notes: Sequence[Note], bpm: float) -> Any:
+def export_musicxml(notes: Sequence[Note] | NoteTable, bpm: float, out_path: str | Path) -> Path:
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="\n") as stream:
+        write_musicxml(notes, bpm, stream)
+    return path
+
+
+def write_musicxml(notes: Sequence[Note] | NoteTable, bpm: float, stream: IO[str]) -> None:
+    """Write ``notes`` as a single-part 4/4 score to the text ``stream``, one measure at a time."""
+    if bpm <= 0:
+        raise ValueError("BPM must be positive")
+    table = as_note_table(notes, bpm=bpm)
+    divisions = table.timebase
+    measure_ticks = BEATS_PER_MEASURE * divisions
+    values = _note_values(divisions)
+    lengths = table.duration.clip(min=1).tolist()  # MIDI and UST clamp the same way
+    pitches = table.pitch.clip(0, 127).tolist()
+    sign, line = _clef(pitches)
+
+    stream.write(_HEADER.format(name=PART_NAME, program=MIDI_PROGRAM))
+    stream.write('    <measure number="1">\n')
+    stream.write(_ATTRIBUTES.format(divisions=divisions, beats=BEATS_PER_MEASURE, sign=sign, line=line, bpm=bpm))
+    number, room = 1, measure_ticks
+    shown: dict = {}  # alteration last shown for each step in this measure (music21 ignores the octave)
+    parts: List[str] = []
+    for idx, length in enumerate(lengths):
+        step, alter = SPELLING[pitches[idx] % 12]
+        octave = pitches[idx] // 12 - 1
+        pitch_xml = _pitch(step, alter, octave)
+        lyric = table.lyric(idx)
+        remaining, first = length, True
+        while remaining:
+            if not room:
+                stream.write("".join(parts) + "    </measure>\n")
+                number += 1
+                parts = [f'    <measure number="{number}">\n']
+                room, shown = measure_ticks, {}
+            take = min(remaining, room)
+            for ticks, kind, dots in _split(take, values):
+                last = ticks == remaining
+                accidental = None
+                if first and shown.get(step, 0) != alter:
+                    accidental = ACCIDENTALS[alter]
+                if first:
+                    shown[step] = alter
+                parts.append(_note(pitch_xml, ticks, kind, dots, accidental, not first, not last, lyric if first else None))
+                remaining -= ticks
+                room -= ticks
+                first = False
+    stream.write("".join(parts) + _FOOTER)
+
+
+def build_stream(notes: Sequence[Note] | NoteTable, bpm: float) -> Any:
     instrument, meter, stream, tempo, note = _load_music21()
 
     part = stream.Part()
-    part.insert(0, instrument.Voice())
+    part.insert(0, instrument.Vocalist())
     part.insert(0, tempo.MetronomeMark(number=bpm))
     part.insert(0, meter.TimeSignature("4/4"))
 
-    for n in notes:
+    table = as_note_table(notes, bpm=bpm)
+    durations = table.duration_beats
+    for idx in range(len(table)):
         m21_note = note.Note()
-        m21_note.pitch.midi = n.midi_pitch
-        m21_note.quarterLength = n.duration_beats
-        if n.lyric is not None:
-            m21_note.addLyric(n.lyric)
+        m21_note.pitch.midi = int(table.pitch[idx])
+        m21_note.quarterLength = float(durations[idx])
+        lyric = table.lyric(idx)
+        if lyric is not None:
+            m21_note.addLyric(lyric)
         part.append(m21_note)
 
     score = stream.Score()
@@ -44,9 +179,80 @@ def build_stream(notes: Sequence[Note], bpm: float) -> Any:
     return score
 
 
-def export_musicxml(notes: Sequence[Note], bpm: float, out_path: str | Path) -> Path:
+def export_musicxml_music21(notes: Sequence[Note] | NoteTable, bpm: float, out_path: str | Path) -> Path:
+    """Write MusicXML through music21 (slower; kept for benchmarks and cross-checks)."""
     score = build_stream(notes, bpm)
     path = Path(out_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     score.write("musicxml", fp=str(path))
     return path
+
+
+def _note_values(divisions: int) -> List[Tuple[int, str, int]]:
+    """``(ticks, type, dots)`` of every plain, dotted or double-dotted value exact at ``divisions``, longest first."""
+    values = []
+    for quarters, kind in NOTE_TYPES:
+        for dots, scale in ((2, 1.75), (1, 1.5), (0, 1.0)):
+            ticks = quarters * scale * divisions
+            if ticks == int(ticks) and ticks >= 1:
+                values.append((int(ticks), kind, dots))
+    return sorted(values, key=lambda value: -value[0])
+
+
+def _split(ticks: int, values: List[Tuple[int, str, int]]) -> List[Tuple[int, str | None, int]]:
+    """Greedy decomposition into note values; a remainder no type can show keeps its bare duration."""
+    pieces: List[Tuple[int, str | None, int]] = []
+    for value, kind, dots in values:
+        while ticks >= value:
+            pieces.append((value, kind, dots))
+            ticks -= value
+    if ticks:
+        pieces.append((ticks, None, 0))
+    return pieces
+
+
+def _clef(pitches: List[int]) -> Tuple[str, int]:
+    """Treble or bass, from the average staff height as in ``music21.clef.bestClef``."""
+    if not pitches:
+        return "G", 2
+    total = 0
+    for pitch in pitches:
+        height = (pitch // 12 - 1) * 7 + STEPS.index(SPELLING[pitch % 12][0]) + 1
+        total += height + 3 if height > 33 else height - 3 if height < 24 else height
+    return ("G", 2) if total / len(pitches) > 28 else ("F", 4)
+
+
+def _pitch(step: str, alter: int, octave: int) -> str:
+    alter_xml = f"          <alter>{alter}</alter>\n" if alter else ""
+    return f"        <pitch>\n          <step>{step}</step>\n{alter_xml}          <octave>{octave}</octave>\n        </pitch>\n"
+
+
+def _note(
+    pitch_xml: str,
+    ticks: int,
+    kind: str | None,
+    dots: int,
+    accidental: str | None,
+    tie_stop: bool,
+    tie_start: bool,
+    lyric: str | None,
+) -> str:
+    out = ["      <note>\n", pitch_xml, f"        <duration>{ticks}</duration>\n"]
+    ties = [tie for tie, wanted in (("stop", tie_stop), ("start", tie_start)) if wanted]
+    out.extend(f'        <tie type="{tie}"/>\n' for tie in ties)
+    if kind is not None:
+        out.append(f"        <type>{kind}</type>\n")
+    out.extend("        <dot/>\n" for _ in range(dots))
+    if accidental is not None:
+        out.append(f"        <accidental>{accidental}</accidental>\n")
+    if ties:
+        out.append("        <notations>\n")
+        out.extend(f'          <tied type="{tie}"/>\n' for tie in ties)
+        out.append("        </notations>\n")
+    if lyric is not None:
+        out.append(
+            '        <lyric number="1">\n          <syllabic>single</syllabic>\n'
+            f"          <text>{escape(lyric)}</text>\n        </lyric>\n"
+        )
+    out.append("      </note>\n")
+    return "".join(out)
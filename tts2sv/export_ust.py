@@ -2,22 +2,30 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Sequence
+from typing import TYPE_CHECKING, List, Sequence
 
+from .notetable import NoteTable, as_note_table
 from .utils import Note
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .pitchcurve import NoteBends
+
 
 HEADER = "[#SETTING]"
 TRACK_END = "[#TRACKEND]"
 
 
 def export_ust(
-    notes: Sequence[Note],
+    notes: Sequence[Note] | NoteTable,
     bpm: float,
     timebase: int,
     out_path: str | Path,
     project_name: str = "tts2sv",
+    bends: "NoteBends | None" = None,
 ) -> Path:
+    """Write a UST; ``bends`` adds Mode2 pitch points (``PBS``/``PBW``/``PBY``/``PBM``) to each note."""
+    table = as_note_table(notes, bpm=bpm, timebase=timebase)
+    lengths = table.ticks_at(timebase)
     path = Path(out_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -34,24 +42,26 @@ def export_ust(
         ]
     )
 
-    for idx, note in enumerate(notes):
+    for idx in range(len(table)):
         index = f"[# {idx:04d}]".replace(" ", "")
-        lyric = _normalise_lyric(note.lyric)
-        length = max(int(round(note.duration_beats * timebase)), 1)
+        lyric = _normalise_lyric(table.lyric(idx))
+        length = max(int(lengths[idx]), 1)
         lines.extend(
             [
                 index,
                 f"Lyric={lyric}",
-                f"NoteNum={note.midi_pitch}",
+                f"NoteNum={int(table.pitch[idx])}",
                 f"Length={length}",
                 "PreUtterance=",
                 "VoiceOverlap=",
                 "Intensity=100",
                 "Modulation=0",
                 "PBType=5",
-                "",
             ]
         )
+        if bends is not None:
+            lines.extend(_pitch_points(bends, idx, length * 60_000.0 / (bpm * timebase)))
+        lines.append("")
 
     lines.append(TRACK_END)
 
@@ -59,6 +69,25 @@ def export_ust(
     return path
 
 
+def _pitch_points(bends: "NoteBends", idx: int, length_ms: float) -> List[str]:
+    """Mode2 pitch lines for note ``idx``: times in ms from the note start, pitches in tenths of a semitone."""
+    position, cents = bends.note(idx)
+    if not len(position):
+        return []
+    ms = (position * length_ms).round(1)
+    pitch = (cents / 10.0).round(1)
+    lines = [f"PBS={_number(ms[0])};{_number(pitch[0])}"]
+    if len(ms) > 1:
+        lines.append("PBW=" + ",".join(_number(width) for width in (ms[1:] - ms[:-1]).round(1)))
+        lines.append("PBY=" + ",".join(_number(value) for value in pitch[1:]))
+        lines.append("PBM=" + ",".join(["s"] * (len(ms) - 1)))  # straight segments, as simplified
+    return lines
+
+
+def _number(value: float) -> str:
+    return f"{float(value) + 0.0:g}"  # + 0.0 folds -0 into 0
+
+
 def _normalise_lyric(lyric: str | None) -> str:
     if lyric is None or lyric.strip() == "":
         return "-"
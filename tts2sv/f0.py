@@ -0,0 +1,230 @@
+"""Pluggable fundamental-frequency (f0) trackers.
+
+Every engine takes ``(audio, sr, fmin, fmax, hop_length)`` and returns a
+:class:`PitchTrack` on the centred ``hop_length`` frame grid used by librosa,
+i.e. ``1 + len(audio) // hop_length`` frames with frame ``i`` centred on sample
+``i * hop_length``. Unvoiced frames carry ``NaN`` in ``f0``. Chunked engines
+report each finished chunk to :func:`tts2sv.progress.advance`, which is also
+where a cancelled run stops.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from . import progress
+from .framing import Framing
+
+FRAME_LENGTH = 2048  # at FRAME_REFERENCE_SR (~93 ms); scaled to other rates
+FRAME_REFERENCE_SR = 22050
+CHUNK_FRAMES = 512
+YIN_TROUGH_THRESHOLD = 0.1
+YIN_VOICING_THRESHOLD = 0.25
+NCCF_VOICING_THRESHOLD = 0.6
+NCCF_OCTAVE_RATIO = 0.9
+EPS = 1e-12
+
+
+@dataclass
+class PitchTrack:
+    """Frame-wise f0 estimate and voicing confidence."""
+
+    f0: "np.ndarray"
+    voiced_prob: "np.ndarray"
+
+
+F0Engine = Callable[["np.ndarray", int, float, float, int], PitchTrack]
+
+ENGINES: Dict[str, F0Engine] = {}
+
+
+def register_engine(name: str) -> Callable[[F0Engine], F0Engine]:
+    """Decorator registering an f0 engine under ``name``."""
+
+    def decorator(func: F0Engine) -> F0Engine:
+        ENGINES[name] = func
+        return func
+
+    return decorator
+
+
+def available_engines() -> List[str]:
+    return sorted(ENGINES)
+
+
+def get_engine(name: str) -> F0Engine:
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown f0 engine '{name}' (available: {', '.join(available_engines())})") from None
+
+
+def track_pitch(
+    audio,
+    sr: int,
+    fmin: float,
+    fmax: float,
+    hop_length: int,
+    engine: str = "pyin",
+    framing: Framing | None = None,
+    select=None,
+) -> PitchTrack:
+    """Run the named engine over ``audio``.
+
+    Frame-wise engines (:data:`FRAME_KERNELS`) read their frames from
+    ``framing`` when given (a :class:`tts2sv.framing.Framing` of ``audio``)
+    and only analyse the frames where the boolean ``select`` is set; the
+    others stay unvoiced. Engines that smooth across frames (pyin) always see
+    the whole signal and ignore both.
+    """
+    if np is None:
+        raise ImportError("numpy is required for pitch tracking")
+    kernel = FRAME_KERNELS.get(engine)
+    if kernel is None:
+        return get_engine(engine)(audio, sr, fmin, fmax, hop_length)
+    framing = framing or Framing(audio, hop_length, frame_length_for(sr, fmin))
+    return _track_frames(kernel, framing, sr, fmin, fmax, select)
+
+
+def frame_length_for(sr: int, fmin: float) -> int:
+    """Analysis frame length at ``sr``.
+
+    The power of two closest to ``FRAME_LENGTH``'s duration at ``sr``, grown
+    until half a frame covers the longest period.
+    """
+    lag_max = int(np.ceil(sr / fmin))
+    frame_length = 1 << max(int(round(math.log2(FRAME_LENGTH * sr / FRAME_REFERENCE_SR))), 1)
+    while frame_length // 2 + lag_max + 1 > frame_length:
+        frame_length *= 2
+    return frame_length
+
+
+def midi_to_hz(midi):
+    return 440.0 * 2.0 ** ((np.asarray(midi, dtype=np.float64) - 69.0) / 12.0)
+
+
+def hz_to_midi(hz):
+    return 69.0 + 12.0 * np.log2(np.asarray(hz, dtype=np.float64) / 440.0)
+
+
+@register_engine("pyin")
+def _pyin(audio, sr: int, fmin: float, fmax: float, hop_length: int) -> PitchTrack:
+    from .notes import _load_librosa
+
+    librosa = _load_librosa()
+    f0, _, voiced_prob = librosa.pyin(
+        audio,
+        fmin=fmin,
+        fmax=fmax,
+        sr=sr,
+        frame_length=frame_length_for(sr, fmin),
+        hop_length=hop_length,
+    )
+    return PitchTrack(f0=f0, voiced_prob=voiced_prob)
+
+
+@register_engine("yin")
+def _yin(audio, sr: int, fmin: float, fmax: float, hop_length: int) -> PitchTrack:
+    """Plain YIN: cumulative-mean-normalised difference with absolute threshold."""
+    return _track_frames(_yin_chunk, Framing(audio, hop_length, frame_length_for(sr, fmin)), sr, fmin, fmax)
+
+
+@register_engine("nccf")
+def _nccf(audio, sr: int, fmin: float, fmax: float, hop_length: int) -> PitchTrack:
+    """Normalised cross-correlation peak picking; NumPy only, no librosa."""
+    return _track_frames(_nccf_chunk, Framing(audio, hop_length, frame_length_for(sr, fmin)), sr, fmin, fmax)
+
+
+def _yin_chunk(chunk, sr: int, window: int, lag_min: int, lag_max: int):
+    corr, energy_head, energy_lag = _lag_terms(chunk, window, lag_max)
+    diff = energy_head[:, None] + energy_lag[:, 1:] - 2.0 * corr[:, 1:]
+    np.maximum(diff, 0.0, out=diff)
+    cmndf = diff * np.arange(1, lag_max + 1) / np.maximum(np.cumsum(diff, axis=1), EPS)
+
+    search = cmndf[:, lag_min - 1 :]
+    is_trough = np.zeros_like(search, dtype=bool)
+    is_trough[:, 1:-1] = (search[:, 1:-1] <= search[:, :-2]) & (search[:, 1:-1] <= search[:, 2:])
+    below = is_trough & (search < YIN_TROUGH_THRESHOLD)
+    first = np.where(below.any(axis=1), below.argmax(axis=1), search.argmin(axis=1))
+
+    best = search[np.arange(search.shape[0]), first]
+    period = _refine(search, first) + lag_min
+    voiced = (best < YIN_VOICING_THRESHOLD) & (energy_head > EPS)
+    return np.where(voiced, sr / period, np.nan), np.clip(1.0 - best, 0.0, 1.0) * (energy_head > EPS)
+
+
+def _nccf_chunk(chunk, sr: int, window: int, lag_min: int, lag_max: int):
+    corr, energy_head, energy_lag = _lag_terms(chunk, window, lag_max)
+    norm = np.sqrt(np.maximum(energy_head[:, None] * energy_lag, EPS))
+    nccf = (corr / norm)[:, lag_min:]
+
+    peak = nccf.max(axis=1)
+    is_peak = np.zeros_like(nccf, dtype=bool)
+    is_peak[:, 1:-1] = (nccf[:, 1:-1] >= nccf[:, :-2]) & (nccf[:, 1:-1] >= nccf[:, 2:])
+    # Prefer the shortest period close to the global peak to avoid sub-octave picks.
+    strong = is_peak & (nccf >= NCCF_OCTAVE_RATIO * peak[:, None])
+    first = np.where(strong.any(axis=1), strong.argmax(axis=1), nccf.argmax(axis=1))
+
+    best = nccf[np.arange(nccf.shape[0]), first]
+    period = _refine(-nccf, first) + lag_min
+    voiced = (best >= NCCF_VOICING_THRESHOLD) & (energy_head > EPS)
+    return np.where(voiced, sr / period, np.nan), np.clip(best, 0.0, 1.0)
+
+
+# Engines without smoothing across frames, so any subset of frames can be tracked on its own.
+FRAME_KERNELS = {"yin": _yin_chunk, "nccf": _nccf_chunk}
+
+
+def _track_frames(kernel, framing: Framing, sr: int, fmin: float, fmax: float, select=None) -> PitchTrack:
+    lag_min = max(int(np.floor(sr / fmax)), 2)
+    lag_max = int(np.ceil(sr / fmin))
+    frame_length = frame_length_for(sr, fmin)
+    frames = framing.frames(frame_length)
+    n = frames.shape[0]
+    f0 = np.full(n, np.nan)
+    voiced_prob = np.zeros(n)
+
+    if select is None:
+        chunks = [slice(start, start + CHUNK_FRAMES) for start in range(0, n, CHUNK_FRAMES)]
+    else:
+        rows = np.flatnonzero(np.asarray(select, dtype=bool)[:n])
+        chunks = [rows[start : start + CHUNK_FRAMES] for start in range(0, rows.size, CHUNK_FRAMES)]
+        progress.advance(n - rows.size)
+    for rows in chunks:
+        chunk = frames[rows].astype(np.float64)
+        f0[rows], voiced_prob[rows] = kernel(chunk, sr, frame_length // 2, lag_min, lag_max)
+        progress.advance(chunk.shape[0])
+    return PitchTrack(f0=f0, voiced_prob=voiced_prob)
+
+
+def _lag_terms(frames, window: int, lag_max: int):
+    """Cross-correlation of each frame's first ``window`` samples against lags 0..lag_max."""
+    n_fft = 1 << int(np.ceil(np.log2(frames.shape[1] + window)))
+    head = np.fft.rfft(frames[:, :window], n=n_fft)
+    full = np.fft.rfft(frames, n=n_fft)
+    corr = np.fft.irfft(np.conj(head) * full, n=n_fft)[:, : lag_max + 1]
+
+    squares = np.square(frames)
+    cumulative = np.concatenate([np.zeros((frames.shape[0], 1)), np.cumsum(squares, axis=1)], axis=1)
+    energy_head = cumulative[:, window]
+    lags = np.arange(lag_max + 1)
+    energy_lag = cumulative[:, lags + window] - cumulative[:, lags]
+    return corr, energy_head, energy_lag
+
+
+def _refine(curve, index):
+    """Parabolic interpolation around the minimum at ``index`` for sub-sample lags."""
+    rows = np.arange(curve.shape[0])
+    left = curve[rows, np.clip(index - 1, 0, curve.shape[1] - 1)]
+    centre = curve[rows, index]
+    right = curve[rows, np.clip(index + 1, 0, curve.shape[1] - 1)]
+    denom = left - 2.0 * centre + right
+    offset = np.where(np.abs(denom) > EPS, 0.5 * (left - right) / np.where(denom == 0, 1.0, denom), 0.0)
+    interior = (index > 0) & (index < curve.shape[1] - 1)
+    return index + np.where(interior, np.clip(offset, -1.0, 1.0), 0.0)
@@ -0,0 +1,62 @@
+"""Shared framing front end for energy and pitch analysis.
+
+A :class:`Framing` pads the signal once, into a float32 buffer like the
+loaded audio, and hands out zero-copy strided views of centred frames (frame
+``i`` centred on sample ``i * hop_length``, as librosa frames with
+``center=True``) for any frame length. RMS gating and the frame-wise pitch
+trackers read the same buffer, so nothing is framed or padded twice, and the
+tracker can be pointed at just the frames that pass the energy gate.
+Consumers upcast one chunk of frames at a time to compute in float64.
+"""
+from __future__ import annotations
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+CHUNK_FRAMES = 2048
+
+
+class Framing:
+    """Centred ``hop_length`` frames of ``audio`` for frame lengths up to ``max_frame_length``."""
+
+    def __init__(self, audio, hop_length: int, max_frame_length: int) -> None:
+        if np is None:
+            raise ImportError("numpy is required for framing")
+        self.hop_length = hop_length
+        self.n_frames = 1 + len(audio) // hop_length
+        self._pad = max_frame_length // 2 + 1
+        self._padded = np.zeros(len(audio) + 2 * self._pad, dtype=np.float32)
+        self._padded[self._pad : self._pad + len(audio)] = audio
+
+    def frames(self, frame_length: int) -> "np.ndarray":
+        """``(n_frames, frame_length)`` read-only view; index it by chunk to materialise frames."""
+        start = self._pad - frame_length // 2
+        view = np.lib.stride_tricks.sliding_window_view(self._padded[start:], frame_length)
+        return view[:: self.hop_length][: self.n_frames]
+
+    def rms(self, frame_length: int) -> "np.ndarray":
+        """Root mean square of every frame, matching ``librosa.feature.rms`` with zero padding.
+
+        Each frame's sum of squares is computed on its own, so a frame gets
+        the same value whichever block of a longer file it is computed in.
+        """
+        frames = self.frames(frame_length)
+        power = np.empty(self.n_frames)
+        for start in range(0, self.n_frames, CHUNK_FRAMES):
+            chunk = frames[start : start + CHUNK_FRAMES].astype(np.float64)
+            power[start : start + chunk.shape[0]] = np.einsum("ij,ij->i", chunk, chunk)
+        return np.sqrt(power / frame_length).astype(np.float32)
+
+
+def dilate(mask, frames: int) -> "np.ndarray":
+    """``mask`` grown by ``frames`` on both sides."""
+    mask = np.asarray(mask, dtype=bool)
+    if frames <= 0 or not mask.any():
+        return mask.copy()
+    hits = np.concatenate([[0], np.cumsum(mask)])
+    idx = np.arange(mask.size)
+    lo = np.maximum(idx - frames, 0)
+    hi = np.minimum(idx + frames + 1, mask.size)
+    return hits[hi] > hits[lo]
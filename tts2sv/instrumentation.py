@@ -0,0 +1,164 @@
+"""Per-stage timing, CPU and memory records for pipeline runs.
+
+A :class:`Recorder` hands out stage contexts::
+
+    recorder = Recorder(trace_memory=True, on_record=print)
+    with recorder.stage("align") as stage:
+        result = align.align_syllables_to_notes(...)
+        stage.count(splits=result.splits_applied)
+
+Each finished stage becomes a :class:`StageRecord` (wall time, CPU time,
+free-form counts and, when enabled, the stage's peak traced memory above what
+was allocated when it started). :data:`NULL_RECORDER`
+is the disabled default: its stages are a shared no-op object, so
+instrumented code costs one attribute lookup and a ``with`` when nobody is
+listening. :func:`aggregate` folds records from many runs (e.g. a batch) into
+per-stage totals.
+"""
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping
+
+Number = int | float
+
+
+@dataclass
+class StageRecord:
+    stage: str
+    wall_sec: float = 0.0
+    cpu_sec: float = 0.0
+    peak_bytes: int | None = None
+    counts: Dict[str, Number] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _Stage:
+    __slots__ = ("_recorder", "record", "_wall", "_cpu", "_traced")
+
+    def __init__(self, recorder: "Recorder", name: str) -> None:
+        self._recorder = recorder
+        self.record = StageRecord(stage=name)
+
+    def count(self, **counts: Number) -> None:
+        for key, value in counts.items():
+            self.record.counts[key] = self.record.counts.get(key, 0) + value
+
+    def __enter__(self) -> "_Stage":
+        if self._recorder.trace_memory:
+            tracemalloc.reset_peak()
+            self._traced = tracemalloc.get_traced_memory()[0]
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.record.wall_sec = time.perf_counter() - self._wall
+        self.record.cpu_sec = time.process_time() - self._cpu
+        if self._recorder.trace_memory:
+            self.record.peak_bytes = tracemalloc.get_traced_memory()[1] - self._traced
+        self._recorder._finish(self.record)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def count(self, **counts: Number) -> None:
+        pass
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Recorder:
+    """Collects a :class:`StageRecord` per ``with recorder.stage(name)`` block.
+
+    ``trace_memory`` starts :mod:`tracemalloc` (if it is not already running)
+    and records each stage's peak; it slows allocation-heavy code noticeably,
+    so it is opt-in. ``on_record`` is called with every finished record.
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        trace_memory: bool = False,
+        on_record: Callable[[StageRecord], None] | None = None,
+    ) -> None:
+        self.records: List[StageRecord] = []
+        self.trace_memory = trace_memory
+        self.on_record = on_record
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def _finish(self, record: StageRecord) -> None:
+        self.records.append(record)
+        if self.on_record is not None:
+            self.on_record(record)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": [record.to_dict() for record in self.records],
+            "total_wall_sec": sum(record.wall_sec for record in self.records),
+        }
+
+    def write_json(self, path: str | Path) -> Path:
+        return write_json(self.to_dict(), path)
+
+
+class NullRecorder:
+    """Recorder stand-in that records nothing."""
+
+    enabled = False
+    records: List[StageRecord] = []
+
+    def stage(self, name: str) -> _NullStage:
+        return _NULL_STAGE
+
+
+NULL_RECORDER = NullRecorder()
+
+
+def aggregate(runs: Iterable[Iterable[StageRecord | Mapping[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Per-stage totals over many runs: run count, summed times and counts, max peak memory."""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for records in runs:
+        for record in records:
+            data = record.to_dict() if isinstance(record, StageRecord) else dict(record)
+            entry = totals.setdefault(
+                data["stage"],
+                {"runs": 0, "wall_sec": 0.0, "cpu_sec": 0.0, "max_wall_sec": 0.0, "peak_bytes": None, "counts": {}},
+            )
+            entry["runs"] += 1
+            entry["wall_sec"] += data["wall_sec"]
+            entry["cpu_sec"] += data["cpu_sec"]
+            entry["max_wall_sec"] = max(entry["max_wall_sec"], data["wall_sec"])
+            if data.get("peak_bytes") is not None:
+                entry["peak_bytes"] = max(entry["peak_bytes"] or 0, data["peak_bytes"])
+            for key, value in data.get("counts", {}).items():
+                entry["counts"][key] = entry["counts"].get(key, 0) + value
+    for entry in totals.values():
+        entry["mean_wall_sec"] = entry["wall_sec"] / entry["runs"]
+    return totals
+
+
+def write_json(payload: Mapping[str, Any], path: str | Path) -> Path:
+    out_path = Path(path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return out_path
@@ -0,0 +1,375 @@
+"""Incremental analysis of raw PCM arriving on a pipe (``--stdin-pcm``).
+
+A :class:`LiveSession` analyses the samples received so far every time a
+chunk arrives. Frame ``i`` is final once ``context`` samples past its
+centre have been heard, the same margin :mod:`tts2sv.streaming` pads block
+seams with, so the contours equal those of an offline run over the same
+samples. (Offline normalisation scales the signal and clips it only where a
+sample would exceed full scale; as long as none does, the frame-wise
+trackers and the percentile energy gate see the same contours at any level.)
+
+A voiced run becomes a note as soon as more than ``GAP_TOLERANCE`` of
+unvoiced frames follow it, since nothing heard later can merge into it.
+The energy gate is a percentile over the whole file, so live notes use the
+gate of the audio heard so far; when the stream ends the notes are rebuilt
+from the complete contours exactly as offline (see :func:`run`), and the
+exported files match an offline run on the same audio under the same
+no-clipping condition.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Callable, Dict, Iterator, List, Sequence
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from . import f0 as f0_engines, notes
+from .align import FILLER_LYRIC
+from .notetable import DEFAULT_TIMEBASE
+from .utils import QUANTIZATION_STEP
+
+PCM_FORMATS = {
+    "s16le": ("<i2", 1.0 / 32768.0),
+    "s32le": ("<i4", 1.0 / 2147483648.0),
+    "f32le": ("<f4", 1.0),
+}
+DEFAULT_PCM_FORMAT = "s16le"
+DEFAULT_STEP_MS = 50.0
+
+
+@dataclass
+class LiveNote:
+    """A note finished while the stream was still running."""
+
+    index: int
+    pitch: int
+    start_tick: int
+    duration_ticks: int
+    lyric: str
+    start_sec: float
+    end_sec: float
+    latency_ms: float  # from the arrival of the note's last sample to its emission
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"event": "note", **asdict(self)}
+
+
+class LiveSession:
+    """Feed mono samples in arrival order; :meth:`feed` returns the notes they close.
+
+    Only the frame-wise engines (:data:`tts2sv.f0.FRAME_KERNELS`) can run
+    incrementally; pyin decodes the whole contour at once. ``clock`` is read
+    when a chunk arrives and when a note is emitted, to measure latency.
+    """
+
+    def __init__(
+        self,
+        sr: int,
+        syllables: Sequence[str] = (),
+        f0_engine: str = "nccf",
+        hop_ms: float | None = None,
+        bpm: float = 120.0,
+        min_note_beats: float = 0.125,
+        timebase: int = DEFAULT_TIMEBASE,
+        grid: float = QUANTIZATION_STEP,
+        split_semitones: float | None = None,
+        split_frames: int = notes.DEFAULT_SPLIT_FRAMES,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        from .streaming import context_samples
+
+        if np is None:
+            raise ImportError("numpy is required for live analysis")
+        if f0_engine not in f0_engines.FRAME_KERNELS:
+            raise ValueError(
+                f"Live analysis needs a frame-wise f0 engine ({', '.join(sorted(f0_engines.FRAME_KERNELS))}), "
+                f"not '{f0_engine}'"
+            )
+        self.sr = int(sr)
+        self.f0_engine = f0_engine
+        self.hop_length = notes.hop_length_for(self.sr, hop_ms)
+        self.context = context_samples(self.sr, self.hop_length)
+        self.syllables = list(syllables)
+        self.bpm, self.min_note_beats = bpm, min_note_beats
+        self.timebase, self.grid = timebase, grid
+        self.split_semitones, self.split_frames = split_semitones, split_frames
+        self.clock = clock
+        self.notes: List[LiveNote] = []
+        self.length = 0  # samples received
+        self._buffer = np.empty(0, dtype=np.float32)  # samples from ``_buffer_start`` on
+        self._buffer_start = 0
+        self._f0 = np.empty(0)
+        self._voiced_prob = np.empty(0)
+        self._rms = np.empty(0, dtype=np.float32)
+        self._frames = 0  # frames analysed
+        self._open = 0  # first frame not yet settled into notes
+        self._ticks = 0
+        self._arrivals: deque = deque()  # (samples received, clock) per chunk
+
+    @property
+    def frame_duration(self) -> float:
+        return self.hop_length / self.sr
+
+    @property
+    def duration_sec(self) -> float:
+        return self.length / self.sr
+
+    @property
+    def lookahead_ms(self) -> float:
+        """Audio that must follow a note's last frame before it can be emitted, excluding the chunk size."""
+        return 1000.0 * (self.context / self.sr + notes.GAP_TOLERANCE + self.frame_duration)
+
+    def feed(self, samples) -> List[LiveNote]:
+        """Append mono ``samples`` and return the notes that are now closed."""
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        if not samples.size:
+            return []
+        self._buffer = np.concatenate([self._buffer, samples])
+        self.length += samples.size
+        self._arrivals.append((self.length, self.clock()))
+        ready = (self.length - self.context) // self.hop_length + 1 if self.length >= self.context else 0
+        if ready <= self._frames:
+            return []
+        self._analyse(ready)
+        return self._close(final=False)
+
+    def finish(self) -> List[LiveNote]:
+        """Analyse the frames up to the end of the stream and return the notes still open."""
+        if self.length == 0:
+            raise ValueError("Audio buffer is empty")
+        self._analyse(1 + self.length // self.hop_length)
+        return self._close(final=True)
+
+    def analysis(self) -> notes.Analysis:
+        """Contours of every frame analysed so far, on the offline frame grid."""
+        n = self._frames
+        return notes.Analysis(
+            f0=self._f0[:n].copy(),
+            voiced_prob=self._voiced_prob[:n].copy(),
+            rms=self._rms[:n].copy(),
+            sr=self.sr,
+            hop_length=self.hop_length,
+        )
+
+    def latency(self) -> Dict[str, float]:
+        """Mean and worst emission latency of the live notes, in milliseconds."""
+        values = [note.latency_ms for note in self.notes]
+        if not values:
+            return {"mean_ms": 0.0, "max_ms": 0.0}
+        return {"mean_ms": round(sum(values) / len(values), 3), "max_ms": round(max(values), 3)}
+
+    def _analyse(self, last: int) -> None:
+        """Contours of frames ``[_frames, last)`` from the buffered samples, then drop samples no frame needs."""
+        hop = self.hop_length
+        start = max(self._frames * hop - self.context, 0)  # whole hops: ``context`` is a multiple of ``hop``
+        block = self._buffer[start - self._buffer_start :]
+        frames = 1 + len(block) // hop
+        # Track every frame: the gate that decides which ones matter is not known until the end.
+        result = notes.analyze_block(
+            block,
+            sr=self.sr,
+            f0_engine=self.f0_engine,
+            hop_length=hop,
+            track_mask=np.ones(frames, dtype=bool),
+        )
+        lo, hi = self._frames - start // hop, last - start // hop
+        self._f0 = _append(self._f0, self._frames, result.f0[lo:hi])
+        self._voiced_prob = _append(self._voiced_prob, self._frames, result.voiced_prob[lo:hi])
+        self._rms = _append(self._rms, self._frames, result.rms[lo:hi])
+        self._frames = last
+
+        keep_from = max(last * hop - self.context, 0)
+        if keep_from > self._buffer_start:
+            self._buffer = self._buffer[keep_from - self._buffer_start :].copy()
+            self._buffer_start = keep_from
+
+    def _close(self, final: bool) -> List[LiveNote]:
+        """Emit the notes of every voiced run that a long enough gap has closed (all of them if ``final``)."""
+        first, last = self._open, self._frames
+        rms = self._rms[:last]
+        gate = notes.energy_gate(rms)
+        f0 = self._f0[first:last]
+        voiced = ~np.isnan(f0) & (rms[first:] >= gate)
+        starts, ends = notes._find_segments(voiced, self.frame_duration)
+        cut = last - first
+        if not final and starts.size and (cut - 1 - ends[-1]) * self.frame_duration <= notes.GAP_TOLERANCE:
+            cut = int(starts[-1])  # the last run may still merge with what comes next
+        if cut == 0:
+            return []
+
+        window = notes.Analysis(
+            f0=f0[:cut],
+            voiced_prob=self._voiced_prob[first : first + cut],
+            rms=rms[first : first + cut],
+            sr=self.sr,
+            hop_length=self.hop_length,
+        )
+        segments = notes.find_note_segments(
+            window, cut * self.frame_duration, self.split_semitones, self.split_frames, gate=gate
+        )
+        self._open = first + cut
+        if not segments.bounds.size:
+            return []
+        table = notes.quantize_segments(
+            segments,
+            total_duration_sec=cut * self.frame_duration,
+            bpm=self.bpm,
+            min_note_beats=self.min_note_beats,
+            timebase=self.timebase,
+            grid=self.grid,
+        ).notes
+
+        closed = []
+        for (start, end), pitch, ticks in zip(
+            (segments.bounds + first).tolist(), table.pitch.tolist(), table.duration.tolist()
+        ):
+            index = len(self.notes)
+            end_sample = min((end + 1) * self.hop_length, self.length)
+            while len(self._arrivals) > 1 and self._arrivals[0][0] < end_sample:
+                self._arrivals.popleft()
+            note = LiveNote(
+                index=index,
+                pitch=int(pitch),
+                start_tick=self._ticks,
+                duration_ticks=int(ticks),
+                lyric=self.syllables[index] if index < len(self.syllables) else FILLER_LYRIC,
+                start_sec=round(start * self.frame_duration, 6),
+                end_sec=round((end + 1) * self.frame_duration, 6),
+                latency_ms=round(1000.0 * (self.clock() - self._arrivals[0][1]), 3),
+            )
+            self._ticks += note.duration_ticks
+            self.notes.append(note)
+            closed.append(note)
+        return closed
+
+
+def _append(array: "np.ndarray", size: int, values: "np.ndarray") -> "np.ndarray":
+    """Write ``values`` after the first ``size`` entries of ``array``, doubling its capacity when full."""
+    needed = size + len(values)
+    if needed > array.size:
+        grown = np.empty(max(needed, 2 * array.size), dtype=array.dtype)
+        grown[:size] = array[:size]
+        array = grown
+    array[size:needed] = values
+    return array
+
+
+def read_pcm(
+    stream: IO[bytes],
+    pcm_format: str = DEFAULT_PCM_FORMAT,
+    channels: int = 1,
+    block_frames: int = 1024,
+) -> Iterator["np.ndarray"]:
+    """Mono float32 blocks of up to ``block_frames`` sample frames of raw interleaved PCM from ``stream``.
+
+    Samples are scaled and downmixed as :func:`tts2sv.audio.load_audio`
+    does; a trailing partial frame is dropped.
+    """
+    from .audio import _downmix_scaled
+
+    try:
+        dtype, scale = PCM_FORMATS[pcm_format]
+    except KeyError:
+        raise ValueError(f"Unknown PCM format '{pcm_format}' (available: {', '.join(PCM_FORMATS)})") from None
+    if channels < 1:
+        raise ValueError("channels must be positive")
+    width = np.dtype(dtype).itemsize * channels
+    pending = b""
+    while True:
+        data = stream.read(block_frames * width)
+        if not data:
+            return
+        data = pending + data
+        usable = len(data) - len(data) % width
+        pending = data[usable:]
+        if usable:
+            frames = np.frombuffer(data[:usable], dtype=dtype).reshape(-1, channels)
+            yield _downmix_scaled(frames, scale)
+
+
+def run(
+    args: argparse.Namespace,
+    source: IO[bytes] | None = None,
+    out: IO[str] | None = None,
+    recorder=None,
+):
+    """Convert PCM from ``source`` (stdin) while it arrives, printing JSON lines to ``out`` (stdout).
+
+    Events are ``ready`` (rate, step and look-ahead), one ``note`` per
+    :class:`LiveNote`, and ``final`` once the stream ends: the notes rebuilt
+    from the complete analysis, aligned and exported like an offline
+    conversion, with ``revised`` counting live notes they differ from.
+    Returns the :class:`tts2sv.pipeline.ConversionResult`.
+    """
+    import json
+
+    from . import pipeline
+
+    source = sys.stdin.buffer if source is None else source
+    out = sys.stdout if out is None else out
+
+    def emit(payload: Dict[str, Any]) -> None:
+        out.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        out.flush()
+
+    recorder = pipeline._recorder_for(args, recorder)
+    syllables = pipeline._syllabify(args, recorder)
+    session = LiveSession(
+        args.pcm_rate,
+        syllables,
+        f0_engine=args.f0_engine,
+        hop_ms=args.hop_ms,
+        bpm=args.bpm,
+        min_note_beats=args.min_note_beats,
+        timebase=args.timebase,
+        grid=args.grid_beats,
+        split_semitones=args.split_semitones,
+        split_frames=args.split_frames,
+    )
+    step = max(int(round(args.latency_ms * session.sr / 1000.0)), 1)
+    emit(
+        {
+            "event": "ready",
+            "sr": session.sr,
+            "hop_length": session.hop_length,
+            "step_ms": round(1000.0 * step / session.sr, 3),
+            "lookahead_ms": round(session.lookahead_ms, 3),
+        }
+    )
+    with recorder.stage("analyze") as stage:
+        for samples in read_pcm(source, args.pcm_format, args.pcm_channels, block_frames=step):
+            for note in session.feed(samples):
+                emit(note.to_dict())
+        for note in session.finish():
+            emit(note.to_dict())
+        stage.count(samples=session.length, frames=session._frames, live_notes=len(session.notes))
+
+    extraction, alignment, bends = pipeline._build(args, recorder, syllables, session.analysis(), session.duration_sec)
+    exported = pipeline._export(args, recorder, alignment, args.bpm, args.out_prefix, bends)
+    result = pipeline._result(syllables, extraction, alignment, exported, recorder.records, bends)
+
+    final = list(zip(extraction.notes.pitch.tolist(), extraction.notes.duration.tolist()))
+    live = [(note.pitch, note.duration_ticks) for note in session.notes]
+    revised = sum(a != b for a, b in zip(live, final)) + abs(len(live) - len(final))
+    table = alignment.notes
+    emit(
+        {
+            "event": "final",
+            "notes": [
+                {"pitch": pitch, "duration_ticks": ticks, "lyric": table.lyric(idx)}
+                for idx, (pitch, ticks) in enumerate(zip(table.pitch.tolist(), table.duration.tolist()))
+            ],
+            "revised": revised,
+            "latency": session.latency(),
+            "outputs": [str(path) for path in result.outputs],
+            "summary": result.summary(),
+        }
+    )
+    return result
@@ -2,31 +2,80 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import TYPE_CHECKING, Any
 
 try:  # pragma: no cover - optional dependency
     import numpy as np
 except ImportError:  # pragma: no cover
     np = None  # type: ignore
 
-try:  # pragma: no cover - optional dependency
-    import librosa  # type: ignore
-except ImportError:  # pragma: no cover
-    librosa = None  # type: ignore
+from . import f0 as f0_engines, progress
+from .align import NoteCues
+from .framing import Framing, dilate
+from .pitchcurve import PitchCurve, contour
+from .notetable import DEFAULT_TIMEBASE, NoteTable, quantize_ticks
+from .utils import QUANTIZATION_STEP
 
-from .utils import Note, quantize_beats, sec_to_quarter_length, duration_seconds
+if TYPE_CHECKING:  # pragma: no cover
+    from .cache import AnalysisCache
 
-HOP_LENGTH = 256
+HOP_LENGTH = 256  # samples at REFERENCE_SR; other rates use the same frame period
+REFERENCE_SR = 22050
+DEFAULT_HOP_MS = 1000.0 * HOP_LENGTH / REFERENCE_SR  # ~11.6 ms
+RMS_FRAME_LENGTH = 2048  # samples at REFERENCE_SR (librosa's default), ~93 ms
+FMIN_MIDI = 36  # C2
+FMAX_MIDI = 96  # C7
+DEFAULT_F0_ENGINE = "pyin"
 MIN_FRAMES = 3
+GATE_PERCENTILE = 25
 GAP_TOLERANCE = 0.05  # seconds
+DEFAULT_SPLIT_FRAMES = 8  # ~93 ms at the default hop
+ONSET_GAP_SCALE = 0.1  # seconds of preceding silence for a ~63% onset cue
+
+_LIBROSA_IMPORT_ERROR = "numpy and librosa are required for note extraction"
+_LIBROSA: Any = None
+
+
+def _load_librosa() -> Any:
+    """Lazily import librosa (and with it numba/scipy) only when analysis runs."""
+
+    global _LIBROSA
+    if _LIBROSA is None:
+        try:  # pragma: no cover - exercised in integration
+            import librosa  # type: ignore
+        except ImportError as exc:  # pragma: no cover
+            raise ImportError(_LIBROSA_IMPORT_ERROR) from exc
+        _LIBROSA = librosa
+    return _LIBROSA
 
 
 @dataclass
 class ExtractionSummary:
     """Summary of the note extraction process."""
 
-    notes: List[Note]
+    notes: NoteTable
     total_duration_sec: float
+    cache_hit: bool | None = None
+    cues: NoteCues | None = None
+    segment_count: int = 0
+    curve: PitchCurve | None = None
+
+
+@dataclass
+class Analysis:
+    """Frame-wise pitch and energy contours on the ``hop_length`` grid."""
+
+    f0: "np.ndarray"
+    voiced_prob: "np.ndarray"
+    rms: "np.ndarray"
+    sr: int
+    hop_length: int = HOP_LENGTH
+    cache_hit: bool | None = None
+    coarse: dict | None = None  # coarse-to-fine region counts (:meth:`tts2sv.coarse.CoarseRanges.counts`)
+
+    @property
+    def frame_duration(self) -> float:
+        return self.hop_length / self.sr
 
 
 def extract_notes(
@@ -34,98 +83,448 @@ def extract_notes(
     sr: int,
     bpm: float,
     min_note_beats: float,
+    f0_engine: str = DEFAULT_F0_ENGINE,
+    cache: "AnalysisCache | None" = None,
+    timebase: int = DEFAULT_TIMEBASE,
+    analysis_sr: int | None = None,
+    hop_ms: float | None = None,
+    pitch_workers: int | None = None,
+    coarse_to_fine: bool = False,
 ) -> ExtractionSummary:
-    """Extract quantised notes from the audio waveform."""
-    if np is None or librosa is None:
-        raise ImportError("numpy and librosa are required for note extraction")
+    """Extract quantised notes from the audio waveform.
+
+    ``f0_engine`` names a tracker registered in :mod:`tts2sv.f0`; ``cache``
+    reuses a previous analysis of identical audio and parameters. Note timing
+    is exact in ticks at ``timebase`` ticks per quarter note. ``analysis_sr``,
+    ``hop_ms``, ``pitch_workers`` and ``coarse_to_fine`` are passed on to
+    :func:`analyze`.
+    """
+    analysis = analyze(
+        audio,
+        sr=sr,
+        f0_engine=f0_engine,
+        cache=cache,
+        analysis_sr=analysis_sr,
+        hop_ms=hop_ms,
+        pitch_workers=pitch_workers,
+        coarse_to_fine=coarse_to_fine,
+    )
+    return build_notes(
+        analysis,
+        total_duration_sec=float(len(audio) / sr),
+        bpm=bpm,
+        min_note_beats=min_note_beats,
+        timebase=timebase,
+    )
+
+
+def analysis_rate(sr: int, analysis_sr: int | None = None) -> int:
+    """Rate the contours are computed at: ``analysis_sr`` when it is below ``sr`` (never upsampled)."""
+    if analysis_sr is None or analysis_sr <= 0 or analysis_sr >= sr:
+        return int(sr)
+    return int(analysis_sr)
+
+
+def hop_length_for(sr: int, hop_ms: float | None = None) -> int:
+    """Hop in samples at ``sr`` for a frame period of ``hop_ms`` (default ``DEFAULT_HOP_MS``)."""
+    period = DEFAULT_HOP_MS if hop_ms is None else hop_ms
+    if period <= 0:
+        raise ValueError("hop_ms must be positive")
+    return max(int(round(period * sr / 1000.0)), 1)
+
+
+def rms_frame_length_for(sr: int) -> int:
+    """RMS window at ``sr`` spanning the same time as ``RMS_FRAME_LENGTH`` at ``REFERENCE_SR``."""
+    return max(int(round(RMS_FRAME_LENGTH * sr / REFERENCE_SR)), 1)
+
+
+def analysis_params(
+    sr: int,
+    f0_engine: str = DEFAULT_F0_ENGINE,
+    analysis_sr: int | None = None,
+    hop_ms: float | None = None,
+) -> dict:
+    """Every parameter that influences :func:`analyze`, used as part of cache keys."""
+    rate = analysis_rate(sr, analysis_sr)
+    return {
+        "engine": f0_engine,
+        "sr": int(sr),
+        "analysis_sr": rate,
+        "hop_length": hop_length_for(rate, hop_ms),
+        "rms_frame_length": rms_frame_length_for(rate),
+        "fmin_midi": FMIN_MIDI,
+        "fmax_midi": FMAX_MIDI,
+    }
+
+
+def analyze(
+    audio,
+    sr: int,
+    f0_engine: str = DEFAULT_F0_ENGINE,
+    cache: "AnalysisCache | None" = None,
+    analysis_sr: int | None = None,
+    hop_ms: float | None = None,
+    pitch_workers: int | None = None,
+    coarse_to_fine: bool = False,
+) -> Analysis:
+    """Run pitch tracking and RMS over ``audio``; the tempo-independent half of extraction.
+
+    With ``analysis_sr`` below ``sr`` the signal is decimated once before
+    analysis. The hop is derived from ``hop_ms`` at the analysis rate, so
+    frame times (``Analysis.frame_duration``) stay in original-file seconds.
+    ``pitch_workers`` enables gated, region-parallel pitch tracking and
+    ``coarse_to_fine`` per-region pitch bounds (:mod:`tts2sv.coarse`).
+    """
+    if np is None:
+        raise ImportError(_LIBROSA_IMPORT_ERROR)
     if audio.size == 0:
         raise ValueError("Audio buffer is empty")
 
-    fmin = librosa.note_to_hz("C2")
-    fmax = librosa.note_to_hz("C7")
-    frame_duration = HOP_LENGTH / sr
-    total_duration_sec = float(len(audio) / sr)
+    params = analysis_params(sr, f0_engine, analysis_sr, hop_ms)
+    if pitch_workers:
+        params["regions"] = True
+    if coarse_to_fine:
+        params["coarse"] = True
+    rate, hop_length = params["analysis_sr"], params["hop_length"]
+    key = None
+    if cache is not None:
+        key = cache.key(audio, params)
+        cached = load_cached_analysis(cache, key, rate, hop_length)
+        if cached is not None:
+            return cached
+
+    from .audio import decimate
 
-    f0, _, _ = librosa.pyin(
+    audio = decimate(audio, sr, rate)
+    progress.active().expect(1 + len(audio) // hop_length)
+    analysis = analyze_block(
         audio,
-        fmin=fmin,
-        fmax=fmax,
+        sr=rate,
+        f0_engine=f0_engine,
+        hop_length=hop_length,
+        pitch_workers=pitch_workers,
+        coarse_to_fine=coarse_to_fine,
+    )
+    if cache is not None and key is not None:
+        store_analysis(cache, key, analysis)
+    return analysis
+
+
+def load_cached_analysis(
+    cache: "AnalysisCache",
+    key: str,
+    sr: int,
+    hop_length: int = HOP_LENGTH,
+) -> Analysis | None:
+    arrays = cache.load(key)
+    if arrays is None:
+        return None
+    return Analysis(
+        f0=arrays["f0"],
+        voiced_prob=arrays["voiced_prob"],
+        rms=arrays["rms"],
         sr=sr,
-        hop_length=HOP_LENGTH,
+        hop_length=hop_length,
+        cache_hit=True,
+    )
+
+
+def store_analysis(cache: "AnalysisCache", key: str, analysis: Analysis) -> None:
+    cache.store(key, {"f0": analysis.f0, "voiced_prob": analysis.voiced_prob, "rms": analysis.rms})
+    analysis.cache_hit = False
+
+
+def analyze_block(
+    audio,
+    sr: int,
+    f0_engine: str = DEFAULT_F0_ENGINE,
+    hop_length: int = HOP_LENGTH,
+    pitch_workers: int | None = None,
+    track_mask=None,
+    coarse_to_fine: bool = False,
+) -> Analysis:
+    """Pitch and RMS contours for one contiguous buffer, on centred ``hop_length`` frames.
+
+    The buffer is framed once (:class:`tts2sv.framing.Framing`); RMS and the
+    energy gate come first, and frame-wise trackers then only analyse the
+    frames note building can use (:func:`tracking_mask`, or ``track_mask``
+    when the gate was computed over a longer signal). pyin smooths across
+    frames and still sees the whole buffer. With ``pitch_workers`` set, pitch
+    is only tracked around gated regions, split across that many processes
+    (:func:`tts2sv.regions.track_pitch_regions`); ``coarse_to_fine`` tracks
+    the same regions with pitch bounds from a cheap first pass
+    (:class:`tts2sv.coarse.CoarseRanges`).
+    """
+    fmin = float(f0_engines.midi_to_hz(FMIN_MIDI))
+    fmax = float(f0_engines.midi_to_hz(FMAX_MIDI))
+    rms_frame_length = rms_frame_length_for(sr)
+    framing = Framing(audio, hop_length, max(rms_frame_length, f0_engines.frame_length_for(sr, fmin)))
+    rms = framing.rms(rms_frame_length)
+    bounds = None
+    # Spans the whole block so trackers without chunks (pyin) still report once they finish.
+    with progress.span(len(rms), len(rms)):
+        if pitch_workers or coarse_to_fine:
+            from .regions import track_pitch_regions
+
+            mask = rms >= energy_gate(rms)
+            if coarse_to_fine:
+                from .coarse import CoarseRanges
+
+                bounds = CoarseRanges(audio, sr, hop_length, mask, fmin, fmax)
+            track = track_pitch_regions(
+                audio,
+                sr=sr,
+                fmin=fmin,
+                fmax=fmax,
+                hop_length=hop_length,
+                mask=mask,
+                engine=f0_engine,
+                workers=pitch_workers or 1,
+                bounds=bounds,
+            )
+        else:
+            if track_mask is None:
+                track_mask = tracking_mask(rms, hop_length / sr)
+            track = f0_engines.track_pitch(
+                audio,
+                sr=sr,
+                fmin=fmin,
+                fmax=fmax,
+                hop_length=hop_length,
+                engine=f0_engine,
+                framing=framing,
+                select=track_mask,
+            )
+    return Analysis(
+        f0=track.f0,
+        voiced_prob=track.voiced_prob,
+        rms=rms,
+        sr=sr,
+        hop_length=hop_length,
+        coarse=bounds.counts() if bounds is not None else None,
+    )
+
+
+def tracking_mask(rms, frame_duration: float, gate: float | None = None) -> "np.ndarray":
+    """Frames whose pitch note building can use: those passing the energy gate and any gap it may merge across."""
+    gate = energy_gate(rms) if gate is None else gate
+    return dilate(np.asarray(rms) >= gate, int(GAP_TOLERANCE / frame_duration) + 1)
+
+
+@dataclass
+class Segments:
+    """Voiced segments of an :class:`Analysis`, still in seconds (before any tempo is applied)."""
+
+    duration_sec: "np.ndarray"
+    pitch: "np.ndarray"
+    gap_sec: "np.ndarray"
+    energy: "np.ndarray"
+    count: int = 0
+    bounds: "np.ndarray | None" = None  # inclusive (first, last) analysis frame of each kept segment
+
+
+def build_notes(
+    analysis: Analysis,
+    total_duration_sec: float,
+    bpm: float,
+    min_note_beats: float,
+    timebase: int = DEFAULT_TIMEBASE,
+    grid: float = QUANTIZATION_STEP,
+    pitch_curve: bool = False,
+    split_semitones: float | None = None,
+    split_frames: int = DEFAULT_SPLIT_FRAMES,
+) -> ExtractionSummary:
+    """Gate, segment and quantise an :class:`Analysis` into a :class:`NoteTable`.
+
+    With ``pitch_curve`` the voiced f0 frames are kept as well, on the note
+    tick timeline (:attr:`ExtractionSummary.curve`). ``split_semitones`` and
+    ``split_frames`` are passed on to :func:`find_note_segments`.
+    """
+    segments = find_note_segments(analysis, total_duration_sec, split_semitones, split_frames)
+    return quantize_segments(
+        segments,
+        total_duration_sec=total_duration_sec,
+        bpm=bpm,
+        min_note_beats=min_note_beats,
+        timebase=timebase,
+        grid=grid,
+        cache_hit=analysis.cache_hit,
+        curve_from=analysis if pitch_curve else None,
     )
-    times = librosa.times_like(f0, sr=sr, hop_length=HOP_LENGTH)
 
-    rms = librosa.feature.rms(y=audio, hop_length=HOP_LENGTH)[0]
-    nonzero_rms = rms[rms > 0]
-    if nonzero_rms.size > 0:
-        gate = float(np.percentile(nonzero_rms, 25))
-    else:
-        gate = 0.0
 
+def find_note_segments(
+    analysis: Analysis,
+    total_duration_sec: float,
+    split_semitones: float | None = None,
+    split_frames: int = DEFAULT_SPLIT_FRAMES,
+    gate: float | None = None,
+) -> Segments:
+    """The tempo-independent half of :func:`build_notes`: gating, segmentation and per-note pitch.
+
+    With ``split_semitones`` set, a voiced run is also cut wherever its pitch
+    moves by more than that many semitones and stays there for
+    ``split_frames`` frames (:func:`pitch_change_points`), so a glide or a
+    leap inside one word yields several notes. ``gate`` overrides the
+    :func:`energy_gate` of ``analysis`` when it covers only part of a signal.
+    """
+    f0 = analysis.f0
+    rms = analysis.rms
+    frame_duration = analysis.frame_duration
+
+    gate = energy_gate(rms) if gate is None else gate
     voiced = (~np.isnan(f0)) & (rms >= gate)
-    segments = _find_segments(voiced, frame_duration)
-
-    notes: List[Note] = []
-    for start_idx, end_idx in segments:
-        if end_idx - start_idx + 1 < MIN_FRAMES:
-            continue
-        segment_f0 = f0[start_idx : end_idx + 1]
-        segment_f0 = segment_f0[~np.isnan(segment_f0)]
-        if segment_f0.size == 0:
-            continue
-        pitch_hz = float(np.median(segment_f0))
-        midi_pitch = int(np.round(librosa.hz_to_midi(pitch_hz)))
-        start_time = times[start_idx]
-        end_time = times[end_idx] + frame_duration
-        duration_sec = max(end_time - start_time, frame_duration)
-        duration_beats = quantize_beats(
-            sec_to_quarter_length(duration_sec, bpm),
-            min_note_beats,
-        )
-        notes.append(Note(start_sec=start_time, duration_beats=duration_beats, midi_pitch=midi_pitch))
+    starts, ends = _find_segments(voiced, frame_duration)
+    if split_semitones is not None and starts.size:
+        cuts = pitch_change_points(f0, starts, ends, split_semitones, split_frames)
+        starts = np.sort(np.concatenate([starts, cuts]))
+        ends = np.sort(np.concatenate([ends, cuts - 1]))
+    count = int(starts.size)
 
-    if not notes:
-        duration_beats = quantize_beats(
-            sec_to_quarter_length(total_duration_sec, bpm),
-            min_note_beats,
+    medians, voiced_frames = _segment_medians(f0, starts, ends)
+    keep = (ends - starts + 1 >= MIN_FRAMES) & (voiced_frames > 0)
+    starts, ends, medians = starts[keep], ends[keep], medians[keep]
+    if not starts.size:
+        return Segments(
+            duration_sec=np.array([total_duration_sec], dtype=np.float64),
+            pitch=np.array([60], dtype=np.int32),
+            gap_sec=np.zeros(1),
+            energy=np.ones(1),
+            count=count,
+            bounds=np.empty((0, 2), dtype=np.int64),
         )
-        notes = [Note(start_sec=0.0, duration_beats=duration_beats, midi_pitch=60)]
-
-    notes = _reflow_start_times(notes, bpm)
-    return ExtractionSummary(notes=notes, total_duration_sec=total_duration_sec)
-
-
-def _find_segments(voiced_mask, frame_duration: float) -> List[tuple[int, int]]:
-    segments: List[tuple[int, int]] = []
-    start_idx = None
-    for idx, is_voiced in enumerate(voiced_mask):
-        if is_voiced and start_idx is None:
-            start_idx = idx
-        elif not is_voiced and start_idx is not None:
-            segments.append((start_idx, idx - 1))
-            start_idx = None
-    if start_idx is not None:
-        segments.append((start_idx, len(voiced_mask) - 1))
-
-    if not segments:
-        return []
-
-    merged: List[tuple[int, int]] = [segments[0]]
-    for start, end in segments[1:]:
-        prev_start, prev_end = merged[-1]
-        gap = (start - prev_end - 1) * frame_duration
-        if gap <= GAP_TOLERANCE:
-            merged[-1] = (prev_start, end)
-        else:
-            merged.append((start, end))
-    return merged
-
-
-def _reflow_start_times(notes: List[Note], bpm: float) -> List[Note]:
-    cumulative_beats = 0.0
-    updated: List[Note] = []
-    for note in notes:
-        start_sec = duration_seconds(cumulative_beats, bpm)
-        updated.append(Note(start_sec=start_sec, duration_beats=note.duration_beats, midi_pitch=note.midi_pitch))
-        cumulative_beats += note.duration_beats
-    return updated
+
+    lengths = ends + 1 - starts
+    energy_sum = np.concatenate([[0.0], np.cumsum(rms, dtype=np.float64)])
+    prev_ends = np.concatenate([[-1], ends[:-1]])
+    return Segments(
+        duration_sec=np.maximum(lengths * frame_duration, frame_duration),
+        pitch=np.round(f0_engines.hz_to_midi(medians)).astype(np.int32),
+        gap_sec=(starts - prev_ends - 1) * frame_duration,
+        energy=(energy_sum[ends + 1] - energy_sum[starts]) / lengths,
+        count=count,
+        bounds=np.stack([starts, ends], axis=1).astype(np.int64),
+    )
+
+
+def pitch_change_points(f0, starts, ends, semitones: float, frames: int = DEFAULT_SPLIT_FRAMES) -> "np.ndarray":
+    """First frames of new notes inside the inclusive segments ``[starts, ends]``.
+
+    A frame is a candidate when the mean pitch of the ``frames`` voiced frames
+    from it on differs from the mean of the ``frames`` before it by more than
+    ``semitones``, with both windows inside one segment; the strongest
+    candidate within ``frames`` on either side wins, so consecutive notes are
+    at least ``frames`` long. Window means come from cumulative sums and the
+    suppression takes ``frames`` whole-array maxima, so the cost is linear in
+    the number of frames.
+    """
+    frames = max(int(frames), 1)
+    n = len(f0)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    midi = f0_engines.hz_to_midi(f0)
+    voiced = ~np.isnan(midi)
+    total = np.concatenate([[0.0], np.cumsum(np.where(voiced, midi, 0.0))])
+    count = np.concatenate([[0], np.cumsum(voiced)])
+
+    # Owning segment of every frame (-1 outside), to keep both windows inside one run.
+    positions = np.arange(n)
+    owner = np.searchsorted(starts, positions, side="right") - 1
+    owner[(owner < 0) | (positions > ends[np.maximum(owner, 0)])] = -1
+
+    idx = np.arange(frames, n - frames + 1)
+    if idx.size == 0:
+        return np.empty(0, dtype=np.int64)
+    valid = (owner[idx - frames] >= 0) & (owner[idx - frames] == owner[idx + frames - 1])
+    before_n = count[idx] - count[idx - frames]
+    after_n = count[idx + frames] - count[idx]
+    valid &= (before_n > 0) & (after_n > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        before = (total[idx] - total[idx - frames]) / before_n
+        after = (total[idx + frames] - total[idx]) / after_n
+    score = np.where(valid, np.abs(after - before), 0.0)
+
+    # Non-maximum suppression: beat the previous ``frames`` scores, tie or beat the next ones.
+    previous = np.zeros_like(score)
+    following = np.zeros_like(score)
+    for shift in range(1, min(frames, score.size - 1) + 1):
+        np.maximum(previous[shift:], score[:-shift], out=previous[shift:])
+        np.maximum(following[:-shift], score[shift:], out=following[:-shift])
+    return idx[(score > semitones) & (score > previous) & (score >= following)]
+
+
+def quantize_segments(
+    segments: Segments,
+    total_duration_sec: float,
+    bpm: float,
+    min_note_beats: float,
+    timebase: int = DEFAULT_TIMEBASE,
+    grid: float = QUANTIZATION_STEP,
+    cache_hit: bool | None = None,
+    curve_from: Analysis | None = None,
+) -> ExtractionSummary:
+    """Apply a tempo and quantisation grid to :class:`Segments`.
+
+    ``curve_from`` is the analysis the segments came from; when given, its
+    f0 contour is attached as :attr:`ExtractionSummary.curve`.
+    """
+    if bpm <= 0:
+        raise ValueError("BPM must be positive")
+    beats = segments.duration_sec * (bpm / 60.0)
+    duration_ticks = quantize_ticks(beats, min_note_beats, timebase, step=grid)
+    table = NoteTable.from_durations(duration_ticks, segments.pitch, timebase=timebase, bpm=bpm)
+    energy = segments.energy
+    cues = NoteCues(
+        onset=1.0 - np.exp(-segments.gap_sec / ONSET_GAP_SCALE),
+        energy=energy / max(float(energy.max()), 1e-12),
+    )
+    return ExtractionSummary(
+        notes=table,
+        total_duration_sec=total_duration_sec,
+        cache_hit=cache_hit,
+        cues=cues,
+        segment_count=segments.count,
+        curve=(
+            contour(curve_from.f0, segments.bounds, table)
+            if curve_from is not None and segments.bounds is not None
+            else None
+        ),
+    )
+
+
+def energy_gate(rms) -> float:
+    """RMS level below which frames never become notes: a low percentile of the non-silent frames."""
+    nonzero_rms = rms[rms > 0]
+    if nonzero_rms.size == 0:
+        return 0.0
+    return float(np.percentile(nonzero_rms, GATE_PERCENTILE))
+
+
+def _find_segments(voiced_mask, frame_duration: float) -> tuple["np.ndarray", "np.ndarray"]:
+    """Inclusive ``(starts, ends)`` of the voiced runs, merging runs separated by short gaps."""
+    mask = np.asarray(voiced_mask, dtype=bool)
+    edges = np.flatnonzero(np.diff(np.concatenate([[False], mask, [False]]).astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2] - 1
+    if starts.size == 0:
+        return starts, ends
+    separate = (starts[1:] - ends[:-1] - 1) * frame_duration > GAP_TOLERANCE
+    return starts[np.concatenate([[True], separate])], ends[np.concatenate([separate, [True]])]
+
+
+def _segment_medians(f0, starts, ends) -> tuple["np.ndarray", "np.ndarray"]:
+    """Median of the voiced f0 values of every segment (NaN if none) and their count."""
+    lengths = ends + 1 - starts
+    owner = np.repeat(np.arange(starts.size), lengths)
+    frames = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths) + starts[owner]
+    values = np.asarray(f0, dtype=np.float64)[frames]
+    voiced = ~np.isnan(values)
+    owner, values = owner[voiced], values[voiced]
+    values = values[np.lexsort((values, owner))]
+    counts = np.bincount(owner, minlength=starts.size)
+    first = np.cumsum(counts) - counts
+    lo = first + np.maximum(counts - 1, 0) // 2
+    hi = first + counts // 2
+    medians = np.full(starts.size, np.nan)
+    has = counts > 0
+    medians[has] = (values[lo[has]] + values[np.minimum(hi[has], values.size - 1)]) / 2.0
+    return medians, counts
@@ -0,0 +1,196 @@
+"""Structure-of-arrays note storage with exact integer tick timing."""
+from __future__ import annotations
+
+from typing import Iterator, List, Sequence, overload
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from .utils import QUANTIZATION_STEP, Note, duration_seconds
+
+DEFAULT_TIMEBASE = 480
+NO_LYRIC = -1
+
+
+class NoteTable:
+    """Notes as parallel NumPy columns.
+
+    ``start`` and ``duration`` are integer ticks at ``timebase`` ticks per
+    quarter note, ``pitch`` holds MIDI note numbers and ``lyric_index`` points
+    into ``lyrics`` (``-1`` for no lyric). Iterating or indexing yields
+    :class:`~tts2sv.utils.Note` views so code written against the list-of-notes
+    API keeps working.
+    """
+
+    __slots__ = ("start", "duration", "pitch", "lyric_index", "lyrics", "timebase", "bpm")
+
+    def __init__(
+        self,
+        start,
+        duration,
+        pitch,
+        lyric_index=None,
+        lyrics: Sequence[str] | None = None,
+        timebase: int = DEFAULT_TIMEBASE,
+        bpm: float = 120.0,
+    ) -> None:
+        if np is None:
+            raise ImportError("numpy is required for NoteTable")
+        self.start = np.asarray(start, dtype=np.int64)
+        self.duration = np.asarray(duration, dtype=np.int64)
+        self.pitch = np.asarray(pitch, dtype=np.int32)
+        if lyric_index is None:
+            lyric_index = np.full(len(self.duration), NO_LYRIC)
+        self.lyric_index = np.asarray(lyric_index, dtype=np.int32)
+        self.lyrics: List[str] = list(lyrics or [])
+        self.timebase = int(timebase)
+        self.bpm = float(bpm)
+        if not (len(self.start) == len(self.duration) == len(self.pitch) == len(self.lyric_index)):
+            raise ValueError("NoteTable columns must have equal length")
+
+    @classmethod
+    def from_durations(
+        cls,
+        duration,
+        pitch,
+        lyric_index=None,
+        lyrics: Sequence[str] | None = None,
+        timebase: int = DEFAULT_TIMEBASE,
+        bpm: float = 120.0,
+    ) -> "NoteTable":
+        """Build a table of back-to-back notes; starts are the running sum of durations."""
+        duration = np.asarray(duration, dtype=np.int64)
+        return cls(reflow(duration), duration, pitch, lyric_index, lyrics, timebase, bpm)
+
+    @classmethod
+    def from_notes(cls, notes: Sequence[Note], timebase: int = DEFAULT_TIMEBASE, bpm: float = 120.0) -> "NoteTable":
+        lyrics: List[str] = []
+        lyric_index = np.full(len(notes), NO_LYRIC, dtype=np.int32)
+        for idx, note in enumerate(notes):
+            if note.lyric is not None:
+                lyric_index[idx] = len(lyrics)
+                lyrics.append(note.lyric)
+        start = np.rint(np.array([n.start_sec for n in notes], dtype=np.float64) * bpm / 60.0 * timebase)
+        duration = beats_to_ticks(np.array([n.duration_beats for n in notes], dtype=np.float64), timebase)
+        pitch = np.array([n.midi_pitch for n in notes], dtype=np.int32)
+        return cls(start, duration, pitch, lyric_index, lyrics, timebase, bpm)
+
+    def __len__(self) -> int:
+        return int(self.duration.shape[0])
+
+    def __iter__(self) -> Iterator[Note]:
+        for idx in range(len(self)):
+            yield self._note(idx)
+
+    @overload
+    def __getitem__(self, index: int) -> Note: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "NoteTable": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return NoteTable(
+                self.start[index],
+                self.duration[index],
+                self.pitch[index],
+                self.lyric_index[index],
+                self.lyrics,
+                self.timebase,
+                self.bpm,
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("NoteTable index out of range")
+        return self._note(index)
+
+    def __repr__(self) -> str:
+        return f"NoteTable({len(self)} notes, timebase={self.timebase}, bpm={self.bpm})"
+
+    @property
+    def duration_beats(self) -> "np.ndarray":
+        return self.duration / self.timebase
+
+    @property
+    def start_sec(self) -> "np.ndarray":
+        return self.start / self.timebase * (60.0 / self.bpm)
+
+    @property
+    def end_tick(self) -> int:
+        if not len(self):
+            return 0
+        return int(self.start[-1] + self.duration[-1])
+
+    def lyric(self, index: int) -> str | None:
+        lyric_idx = int(self.lyric_index[index])
+        return None if lyric_idx == NO_LYRIC else self.lyrics[lyric_idx]
+
+    def lyric_list(self) -> List[str | None]:
+        return [self.lyric(idx) for idx in range(len(self))]
+
+    def to_notes(self) -> List[Note]:
+        return list(self)
+
+    def with_lyrics(self, lyrics: Sequence[str]) -> "NoteTable":
+        """Assign ``lyrics`` to the notes in order (extra notes keep no lyric)."""
+        count = min(len(lyrics), len(self))
+        lyric_index = np.full(len(self), NO_LYRIC, dtype=np.int32)
+        lyric_index[:count] = np.arange(count, dtype=np.int32)
+        return NoteTable(self.start, self.duration, self.pitch, lyric_index, lyrics, self.timebase, self.bpm)
+
+    def reflowed(self) -> "NoteTable":
+        """Copy with notes laid back to back from tick 0."""
+        return NoteTable(
+            reflow(self.duration),
+            self.duration,
+            self.pitch,
+            self.lyric_index,
+            self.lyrics,
+            self.timebase,
+            self.bpm,
+        )
+
+    def ticks_at(self, timebase: int) -> "np.ndarray":
+        """Durations rescaled to another ``timebase``."""
+        if timebase == self.timebase:
+            return self.duration.copy()
+        return np.rint(self.duration * (timebase / self.timebase)).astype(np.int64)
+
+    def _note(self, idx: int) -> Note:
+        return Note(
+            start_sec=duration_seconds(float(self.start[idx]) / self.timebase, self.bpm),
+            duration_beats=float(self.duration[idx]) / self.timebase,
+            midi_pitch=int(self.pitch[idx]),
+            lyric=self.lyric(idx),
+        )
+
+
+def as_note_table(notes, bpm: float, timebase: int = DEFAULT_TIMEBASE) -> NoteTable:
+    """Accept either a :class:`NoteTable` or a sequence of :class:`Note` objects."""
+    if isinstance(notes, NoteTable):
+        return notes
+    return NoteTable.from_notes(list(notes), timebase=timebase, bpm=bpm)
+
+
+def reflow(duration) -> "np.ndarray":
+    """Start ticks of back-to-back notes: the exclusive running sum of durations."""
+    duration = np.asarray(duration, dtype=np.int64)
+    start = np.zeros_like(duration)
+    if duration.size > 1:
+        np.cumsum(duration[:-1], out=start[1:])
+    return start
+
+
+def beats_to_ticks(beats, timebase: int) -> "np.ndarray":
+    return np.rint(np.asarray(beats, dtype=np.float64) * timebase).astype(np.int64)
+
+
+def quantize_ticks(beats, minimum: float, timebase: int, step: float = QUANTIZATION_STEP) -> "np.ndarray":
+    """Vectorised :func:`tts2sv.utils.quantize_beats`, returning integer ticks."""
+    beats = np.asarray(beats, dtype=np.float64)
+    quantized = np.round(beats / step) * step
+    quantized = np.where(beats <= 0, minimum, np.maximum(quantized, minimum))
+    return beats_to_ticks(quantized, timebase)
@@ -0,0 +1,385 @@
+"""End-to-end conversion pipeline shared by the CLI front ends."""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from . import align, audio, export, notes, pitchcurve, sweep, text
+from .instrumentation import NULL_RECORDER, NullRecorder, Recorder, StageRecord
+from .progress import NULL_PROGRESS, NullProgress, Progress
+
+
+@dataclass
+class ConversionResult:
+    """Outcome of converting a single WAV/text pair."""
+
+    note_count: int
+    syllable_count: int
+    splits_applied: int = 0
+    filler_notes: int = 0
+    merges_applied: int = 0
+    outputs: List[Path] = field(default_factory=list)
+    cache_hit: bool | None = None
+    export_seconds: Dict[str, float] = field(default_factory=dict)
+    stages: List[StageRecord] = field(default_factory=list)
+    curve_points: int = 0
+    curve_points_per_sec: float = 0.0
+    curve_cents: float = 0.0
+    output_bytes: Dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        line = (
+            f"Exported {self.note_count} notes / {self.syllable_count} syllables "
+            f"(splits: {self.splits_applied}, filler notes: {self.filler_notes}"
+            + (f", merges: {self.merges_applied}" if self.merges_applied else "")
+            + ")."
+        )
+        if self.cache_hit is not None:
+            line += f" Analysis cache {'hit' if self.cache_hit else 'miss'}."
+        if self.export_seconds:
+            line += " Export: " + ", ".join(f"{fmt} {sec:.3f}s" for fmt, sec in self.export_seconds.items()) + "."
+        if self.curve_points:
+            line += (
+                f" Pitch curve: {self.curve_points} points ({self.curve_points_per_sec:.1f}/s, "
+                f"within {self.curve_cents:g} cents); "
+                + ", ".join(f"{fmt} {size / 1024:.1f} KiB" for fmt, size in self.output_bytes.items())
+                + "."
+            )
+        return line
+
+    def timings(self) -> Dict[str, Any]:
+        """Stage records as a JSON-ready dict."""
+        return {
+            "stages": [record.to_dict() for record in self.stages],
+            "total_wall_sec": sum(record.wall_sec for record in self.stages),
+        }
+
+
+def convert(
+    args: argparse.Namespace,
+    recorder: "Recorder | NullRecorder | None" = None,
+    progress: "Progress | NullProgress" = NULL_PROGRESS,
+) -> ConversionResult:
+    """Run load → extract → align → export for one set of parsed CLI options.
+
+    Stages are reported to ``recorder`` (see :mod:`tts2sv.instrumentation`);
+    without one, a recorder is created when ``args.timings_json`` is set and
+    its records are returned in :attr:`ConversionResult.stages`. Analysis and
+    export report to ``progress`` (see :mod:`tts2sv.progress`), whose cancel
+    token is honoured between chunks and stages.
+    """
+    recorder = _recorder_for(args, recorder)
+    syllables, extraction, alignment, bends = _prepare(args, recorder, progress=progress)
+    exported = _export(args, recorder, alignment, args.bpm, args.out_prefix, bends, progress)
+    return _result(syllables, extraction, alignment, exported, recorder.records, bends)
+
+
+@dataclass
+class SweepResult:
+    """Ranked sweep candidates and the conversions exported for the best of them."""
+
+    candidates: List[sweep.SweepCandidate]
+    results: List[ConversionResult] = field(default_factory=list)
+    stages: List[StageRecord] = field(default_factory=list)
+
+    def report(self, limit: int = 10) -> str:
+        lines = [f"Swept {len(self.candidates)} settings:", sweep.format_table(self.candidates, limit)]
+        for rank, result in enumerate(self.results, start=1):
+            cand = self.candidates[rank - 1]
+            lines.append(f"#{rank} (bpm {cand.bpm:g}, grid {cand.grid:g}, min {cand.min_note_beats:g}): {result.summary()}")
+        return "\n".join(lines)
+
+    def timings(self) -> Dict[str, Any]:
+        return {
+            "stages": [record.to_dict() for record in self.stages],
+            "total_wall_sec": sum(record.wall_sec for record in self.stages),
+        }
+
+
+def run_sweep(
+    args: argparse.Namespace,
+    recorder: "Recorder | NullRecorder | None" = None,
+    progress: "Progress | NullProgress" = NULL_PROGRESS,
+) -> SweepResult:
+    """Analyse once, rank every ``--sweep-*`` combination and export the ``--sweep-top`` best.
+
+    With ``--sweep-top 1`` the winner is written to ``--out-prefix``; otherwise
+    rank ``n`` goes to ``<out-prefix>_top<n>``.
+    """
+    recorder = _recorder_for(args, recorder)
+    syllables = _syllabify(args, recorder)
+    analysis, total_duration_sec = _analyze(args, recorder, progress=progress)
+
+    progress.check()
+    with recorder.stage("sweep") as stage:
+        segments = notes.find_note_segments(analysis, total_duration_sec, args.split_semitones, args.split_frames)
+        candidates = sweep.rank_segments(
+            segments,
+            syllable_count=len(syllables),
+            bpms=args.sweep_bpm or [args.bpm],
+            grids=args.sweep_grid or [args.grid_beats],
+            min_notes=args.sweep_min_note or [args.min_note_beats],
+            timebase=args.timebase,
+            reference_bpm=args.bpm,
+        )
+        stage.count(points=len(candidates), segments=segments.count)
+
+    outcome = SweepResult(candidates=candidates)
+    top = max(1, min(args.sweep_top, len(candidates)))
+    for rank, cand in enumerate(candidates[:top], start=1):
+        progress.check()
+        with recorder.stage("build_notes") as stage:
+            extraction = notes.quantize_segments(
+                segments,
+                total_duration_sec=total_duration_sec,
+                bpm=cand.bpm,
+                min_note_beats=cand.min_note_beats,
+                timebase=args.timebase,
+                grid=cand.grid,
+                cache_hit=analysis.cache_hit,
+                curve_from=analysis if args.pitch_curve else None,
+            )
+            stage.count(notes=len(extraction.notes))
+        alignment = _align(args, recorder, extraction, syllables, cand.bpm, cand.min_note_beats)
+        bends = _bends(args, recorder, extraction, alignment)
+        out_prefix = args.out_prefix if top == 1 else f"{args.out_prefix}_top{rank}"
+        exported = _export(args, recorder, alignment, cand.bpm, out_prefix, bends, progress)
+        outcome.results.append(_result(syllables, extraction, alignment, exported, recorder.records, bends))
+    outcome.stages = list(recorder.records)
+    return outcome
+
+
+def _recorder_for(args: argparse.Namespace, recorder: "Recorder | NullRecorder | None") -> "Recorder | NullRecorder":
+    if recorder is not None:
+        return recorder
+    if getattr(args, "timings_json", None):
+        return Recorder(trace_memory=getattr(args, "trace_memory", False))
+    return NULL_RECORDER
+
+
+def _syllabify(args: argparse.Namespace, recorder: "Recorder | NullRecorder") -> List[str]:
+    with recorder.stage("syllabify") as stage:
+        syllables = text.syllabify_text(args.text, lang=args.lang)
+        stage.count(syllables=len(syllables))
+    return syllables
+
+
+def _load(args: argparse.Namespace, recorder: "Recorder | NullRecorder") -> Tuple[Any, int]:
+    with recorder.stage("load_audio") as stage:
+        audio_data, sr = audio.load_audio(args.wav)
+        stage.count(samples=len(audio_data), bytes=audio_data.nbytes)
+    return audio_data, sr
+
+
+def _analyze(
+    args: argparse.Namespace,
+    recorder: "Recorder | NullRecorder",
+    loaded: Tuple[Any, int] | None = None,
+    progress: "Progress | NullProgress" = NULL_PROGRESS,
+) -> Tuple[notes.Analysis, float]:
+    """Compute the pitch/energy analysis of ``args.wav``, streaming it or using ``loaded`` audio if given."""
+    cache = None
+    if args.cache_dir:
+        from .cache import AnalysisCache
+
+        cache = AnalysisCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+    if args.stream:
+        from . import streaming
+
+        with recorder.stage("analyze") as stage, progress.stage("analyze"):
+            analysis, stats = streaming.analyze_file(
+                args.wav,
+                f0_engine=args.f0_engine,
+                block_seconds=args.block_seconds,
+                cache=cache,
+                analysis_sr=args.analysis_sr,
+                hop_ms=args.hop_ms,
+            )
+            stage.count(samples=stats.length, frames=len(analysis.f0), cache_hits=int(bool(analysis.cache_hit)))
+        return analysis, stats.duration_sec
+
+    audio_data, sr = loaded if loaded is not None else _load(args, recorder)
+    with recorder.stage("analyze") as stage, progress.stage("analyze"):
+        analysis = notes.analyze(
+            audio_data,
+            sr=sr,
+            f0_engine=args.f0_engine,
+            cache=cache,
+            analysis_sr=args.analysis_sr,
+            hop_ms=args.hop_ms,
+            pitch_workers=args.pitch_workers,
+            coarse_to_fine=args.coarse_to_fine,
+        )
+        stage.count(frames=len(analysis.f0), cache_hits=int(bool(analysis.cache_hit)), **(analysis.coarse or {}))
+    return analysis, float(len(audio_data) / sr)
+
+
+def _prepare(
+    args: argparse.Namespace,
+    recorder: "Recorder | NullRecorder",
+    loaded: Tuple[Any, int] | None = None,
+    progress: "Progress | NullProgress" = NULL_PROGRESS,
+) -> Tuple[List[str], notes.ExtractionSummary, align.AlignmentResult, pitchcurve.NoteBends | None]:
+    """Everything up to export: syllables, extracted notes, their alignment and optional pitch bends."""
+    syllables = _syllabify(args, recorder)
+    analysis, total_duration_sec = _analyze(args, recorder, loaded, progress)
+    return (syllables, *_build(args, recorder, syllables, analysis, total_duration_sec, progress))
+
+
+def _build(
+    args: argparse.Namespace,
+    recorder: "Recorder | NullRecorder",
+    syllables: List[str],
+    analysis: notes.Analysis,
+    total_duration_sec: float,
+    progress: "Progress | NullProgress" = NULL_PROGRESS,
+) -> Tuple[notes.ExtractionSummary, align.AlignmentResult, pitchcurve.NoteBends | None]:
+    """Notes, alignment and optional pitch bends of a finished analysis."""
+    progress.check()
+    with recorder.stage("build_notes") as stage:
+        extraction = notes.build_notes(
+            analysis,
+            total_duration_sec=total_duration_sec,
+            bpm=args.bpm,
+            min_note_beats=args.min_note_beats,
+            timebase=args.timebase,
+            grid=args.grid_beats,
+            pitch_curve=args.pitch_curve,
+            split_semitones=args.split_semitones,
+            split_frames=args.split_frames,
+        )
+        stage.count(segments=extraction.segment_count, notes=len(extraction.notes))
+
+    progress.check()
+    alignment = _align(args, recorder, extraction, syllables, args.bpm, args.min_note_beats)
+    return extraction, alignment, _bends(args, recorder, extraction, alignment)
+
+
+def _align(
+    args: argparse.Namespace,
+    recorder: "Recorder | NullRecorder",
+    extraction: notes.ExtractionSummary,
+    syllables: List[str],
+    bpm: float,
+    min_note_beats: float,
+) -> align.AlignmentResult:
+    with recorder.stage("align") as stage:
+        alignment = align.align_syllables_to_notes(
+            extraction.notes,
+            syllables,
+            bpm=bpm,
+            min_note_beats=min_note_beats,
+            strict=args.strict,
+            timebase=args.timebase,
+            mode=args.align_mode,
+            cues=extraction.cues,
+        )
+        stage.count(
+            notes=len(alignment.notes),
+            splits=alignment.splits_applied,
+            merges=alignment.merges_applied,
+            filler_notes=alignment.filler_notes,
+        )
+    return alignment
+
+
+def _bends(
+    args: argparse.Namespace,
+    recorder: "Recorder | NullRecorder",
+    extraction: notes.ExtractionSummary,
+    alignment: align.AlignmentResult,
+) -> pitchcurve.NoteBends | None:
+    if extraction.curve is None:
+        return None
+    with recorder.stage("pitch_curve") as stage:
+        bends = pitchcurve.note_bends(
+            extraction.curve,
+            alignment.notes,
+            epsilon_cents=args.pitch_curve_cents,
+            max_points_per_sec=args.pitch_curve_max_pps,
+            seconds=extraction.total_duration_sec,
+        )
+        stage.count(frames=bends.frames, points=bends.points)
+    return bends
+
+
+def _export(
+    args: argparse.Namespace,
+    recorder: "Recorder | NullRecorder",
+    alignment: align.AlignmentResult,
+    bpm: float,
+    out_prefix: str | Path,
+    bends: pitchcurve.NoteBends | None = None,
+    progress: "Progress | NullProgress" = NULL_PROGRESS,
+) -> export.ExportResult:
+    with recorder.stage("export") as stage, progress.stage("export", total=len(args.formats), unit="files"):
+        exported = export.export_all(
+            alignment.notes,
+            bpm=bpm,
+            out_prefix=out_prefix,
+            formats=args.formats,
+            timebase=args.timebase,
+            bends=bends,
+        )
+        if recorder.enabled:
+            for fmt, path in exported.outputs.items():
+                stage.count(**{f"{fmt}_bytes": path.stat().st_size})
+            stage.count(bytes_written=sum(path.stat().st_size for path in exported.outputs.values()))
+    return exported
+
+
+def _result(
+    syllables: List[str],
+    extraction: notes.ExtractionSummary,
+    alignment: align.AlignmentResult,
+    exported: export.ExportResult,
+    stages: Iterable[StageRecord] = (),
+    bends: pitchcurve.NoteBends | None = None,
+) -> ConversionResult:
+    curve = {}
+    if bends is not None:
+        curve = {
+            "curve_points": bends.points,
+            "curve_points_per_sec": bends.points_per_sec,
+            "curve_cents": bends.epsilon_cents,
+            "output_bytes": {fmt: path.stat().st_size for fmt, path in exported.outputs.items()},
+        }
+    return ConversionResult(
+        note_count=len(alignment.notes),
+        syllable_count=len(syllables),
+        splits_applied=alignment.splits_applied,
+        filler_notes=alignment.filler_notes,
+        merges_applied=alignment.merges_applied,
+        outputs=list(exported.outputs.values()),
+        cache_hit=extraction.cache_hit,
+        export_seconds=exported.seconds,
+        stages=list(stages),
+        **curve,
+    )
+
+
+WARM_UP_SECONDS = 0.25
+
+
+def warm_up(pitch_workers: int | None = None) -> None:
+    """Import the heavy dependencies and trigger numba compilation ahead of real work.
+
+    Long-lived processes (batch workers, the analysis server) call this once so
+    the first real conversion does not pay for librosa's JIT warm-up. With
+    ``pitch_workers`` the shared ``--pitch-workers`` pool is started and
+    warmed as well (:func:`tts2sv.regions.warm_pool`).
+    """
+    import numpy as np
+
+    text.preload_dictionaries()
+    sr = 22050
+    t = np.arange(int(WARM_UP_SECONDS * sr), dtype=np.float32) / sr
+    tone = (0.2 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+    notes.extract_notes(tone, sr=sr, bpm=120.0, min_note_beats=0.125)
+    if pitch_workers:
+        from .regions import warm_pool
+
+        warm_pool(pitch_workers)
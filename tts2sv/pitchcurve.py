@@ -0,0 +1,186 @@
+"""Continuous pitch curves as per-note bends, simplified within an error bound.
+
+Note building collapses every segment to its median pitch. With a pitch curve
+enabled, the voiced f0 frames of each segment are also placed on the note
+tick timeline (:func:`contour`). Once syllables are aligned, the curve is cut
+at note boundaries, expressed in cents relative to each note, and reduced
+with Ramer–Douglas–Peucker (:func:`note_bends`). Distances are measured
+vertically, so no dropped frame is further than ``epsilon_cents`` from the
+simplified polyline. All notes are simplified together: each pass finds the
+worst point of every open interval at once with NumPy reductions.
+
+Alignment only splits and merges notes on the extraction timeline, so a
+curve built before alignment stays valid after it.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from . import f0 as f0_engines
+from .notetable import NoteTable
+
+DEFAULT_EPSILON_CENTS = 10.0
+DEFAULT_MAX_POINTS_PER_SEC = 40.0
+MAX_BEND_CENTS = 1200.0
+EPSILON_GROWTH = 1.5
+
+
+@dataclass
+class PitchCurve:
+    """Voiced f0 frames on a note table's tick timeline (fractional ticks, MIDI pitch)."""
+
+    tick: "np.ndarray"
+    pitch: "np.ndarray"
+    end_tick: int
+
+    def __len__(self) -> int:
+        return int(self.tick.shape[0])
+
+
+@dataclass
+class NoteBends:
+    """Simplified bend points for every note of a table.
+
+    Points of note ``i`` are ``offsets[i]:offsets[i + 1]``; ``position`` is the
+    fraction of the note's length (``0 <= position < 1``) and ``cents`` the
+    deviation from the note's pitch.
+    """
+
+    offsets: "np.ndarray"
+    position: "np.ndarray"
+    cents: "np.ndarray"
+    epsilon_cents: float
+    frames: int = 0
+    seconds: float = 0.0
+
+    @property
+    def points(self) -> int:
+        return int(self.position.shape[0])
+
+    @property
+    def points_per_sec(self) -> float:
+        return self.points / self.seconds if self.seconds > 0 else 0.0
+
+    def note(self, idx: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        lo, hi = int(self.offsets[idx]), int(self.offsets[idx + 1])
+        return self.position[lo:hi], self.cents[lo:hi]
+
+    def summary(self) -> str:
+        return (
+            f"{self.points} points from {self.frames} frames "
+            f"({self.points_per_sec:.1f}/s, within {self.epsilon_cents:g} cents)"
+        )
+
+
+def contour(f0, bounds, table: NoteTable) -> PitchCurve:
+    """Place the voiced frames of each note's segment evenly across that note's ticks.
+
+    ``bounds`` holds the inclusive ``(first, last)`` frame of the segment behind
+    every row of ``table`` (see :class:`tts2sv.notes.Segments`).
+    """
+    bounds = np.asarray(bounds, dtype=np.int64).reshape(-1, 2)
+    end_tick = int(table.start[-1] + table.duration[-1]) if len(table) else 0
+    if bounds.shape[0] != len(table) or not len(table):
+        return PitchCurve(tick=np.empty(0), pitch=np.empty(0), end_tick=end_tick)
+    first, last = bounds[:, 0], bounds[:, 1]
+    counts = last - first + 1
+    owner = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    frames = first[owner] + local
+    tick = table.start[owner] + (local + 0.5) / counts[owner] * table.duration[owner]
+    hz = np.asarray(f0, dtype=np.float64)[frames]
+    voiced = ~np.isnan(hz)
+    return PitchCurve(tick=tick[voiced], pitch=f0_engines.hz_to_midi(hz[voiced]), end_tick=end_tick)
+
+
+def note_bends(
+    curve: PitchCurve,
+    table: NoteTable,
+    epsilon_cents: float = DEFAULT_EPSILON_CENTS,
+    max_points_per_sec: float | None = DEFAULT_MAX_POINTS_PER_SEC,
+    seconds: float | None = None,
+) -> NoteBends:
+    """Cut ``curve`` at the notes of ``table`` and simplify it to at most ``epsilon_cents`` of error.
+
+    When the result would exceed ``max_points_per_sec`` over ``seconds`` (the
+    table's length by default), ``epsilon_cents`` is raised step by step until
+    it fits; the tolerance actually used is reported on the result.
+    """
+    if epsilon_cents <= 0:
+        raise ValueError("epsilon_cents must be positive")
+    if seconds is None:
+        seconds = float(table.start_sec[-1] + table.duration_beats[-1] * 60.0 / table.bpm) if len(table) else 0.0
+    end_tick = int(table.start[-1] + table.duration[-1]) if len(table) else 0
+    # Alignment keeps the total length; rescale in case the timebase changed in between.
+    scale = end_tick / curve.end_tick if curve.end_tick else 1.0
+    tick = curve.tick * scale
+    note = np.clip(np.searchsorted(table.start, tick, side="right") - 1, 0, max(len(table) - 1, 0))
+    cents = np.clip((curve.pitch - table.pitch[note]) * 100.0, -MAX_BEND_CENTS, MAX_BEND_CENTS)
+    position = (tick - table.start[note]) / np.maximum(table.duration[note], 1)
+
+    keep = simplify(position, cents, note, epsilon_cents)
+    if max_points_per_sec and seconds > 0:
+        while keep.sum() > max_points_per_sec * seconds and epsilon_cents < MAX_BEND_CENTS:
+            epsilon_cents *= EPSILON_GROWTH
+            keep = simplify(position, cents, note, epsilon_cents)
+
+    offsets = np.zeros(len(table) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(note[keep], minlength=len(table)), out=offsets[1:])
+    return NoteBends(
+        offsets=offsets,
+        position=position[keep],
+        cents=cents[keep],
+        epsilon_cents=float(epsilon_cents),
+        frames=len(curve),
+        seconds=float(seconds),
+    )
+
+
+def simplify(x, y, group, epsilon: float) -> "np.ndarray":
+    """Ramer–Douglas–Peucker over every run of equal ``group`` at once; returns a keep mask.
+
+    ``x`` must be non-decreasing within a group. Both ends of every group are
+    kept, and a point is dropped only if it lies within ``epsilon`` (measured
+    along ``y``) of the chord that replaces it.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    group = np.asarray(group)
+    n = x.shape[0]
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    starts = np.flatnonzero(np.concatenate([[True], group[1:] != group[:-1]]))
+    ends = np.concatenate([starts[1:], [n]]) - 1
+    keep[starts] = True
+    keep[ends] = True
+
+    lo, hi = starts, ends
+    while True:
+        open_ = hi - lo > 1
+        lo, hi = lo[open_], hi[open_]
+        if lo.size == 0:
+            return keep
+        # Interior points of every open interval, flattened.
+        counts = hi - lo - 1
+        owner = np.repeat(np.arange(lo.size), counts)
+        idx = np.repeat(lo + 1, counts) + np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        x0, x1, y0, y1 = x[lo][owner], x[hi][owner], y[lo][owner], y[hi][owner]
+        span = x1 - x0
+        t = np.divide(x[idx] - x0, span, out=np.zeros_like(span), where=span > 0)
+        error = np.abs(y[idx] - (y0 + t * (y1 - y0)))
+        first = np.cumsum(counts) - counts
+        worst = np.maximum.reduceat(error, first)
+        # First interior index reaching each interval's maximum.
+        hit = np.where(error == worst[owner], np.arange(idx.size), idx.size)
+        split = idx[np.minimum.reduceat(hit, first)]
+        refine = worst > epsilon
+        keep[split[refine]] = True
+        lo = np.concatenate([lo[refine], split[refine]])
+        hi = np.concatenate([split[refine], hi[refine]])
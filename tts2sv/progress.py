@@ -0,0 +1,244 @@
+"""Progress events and cooperative cancellation for long conversions.
+
+A :class:`Progress` reporter hands out stage contexts, like
+:class:`tts2sv.instrumentation.Recorder`::
+
+    progress = Progress(on_event=print, cancel=token)
+    with progress.stage("export", total=3, unit="files"):
+        ...
+
+While a stage is open it is the *active* stage of the current context, so
+code deep inside analysis reports through the module-level :func:`advance`
+and :func:`span` without a reporter being threaded through every call. Both
+are no-ops when no stage is active. :func:`advance` also checks the cancel
+token and raises :class:`Cancelled`; the chunk loops call it between chunks,
+so a cancelled run stops at the next chunk boundary and nothing half-computed
+is cached or exported.
+
+Amounts are in the unit of the innermost :func:`span` (e.g. the frames of
+one streaming block) and scaled onto the stage's total, so a tracker only
+needs to count its own frames.
+"""
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Callable, Dict, Iterator
+
+DEFAULT_MIN_INTERVAL = 0.1  # seconds between throttled events of one stage
+
+_ACTIVE: contextvars.ContextVar["_Task | None"] = contextvars.ContextVar("tts2sv_progress", default=None)
+
+
+class Cancelled(Exception):
+    """Raised at the next checkpoint once a conversion's :class:`CancelToken` is set."""
+
+
+class CancelToken:
+    """Thread-safe flag asking a running conversion to stop."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+@dataclass
+class ProgressEvent:
+    stage: str
+    fraction: float
+    done: float
+    total: float | None
+    unit: str
+    elapsed_sec: float
+    eta_sec: float | None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"event": "progress", **asdict(self)}
+
+
+class _Task:
+    __slots__ = ("_progress", "name", "total", "unit", "done", "_scale", "_started", "_last", "_lock", "_token")
+
+    def __init__(self, progress: "Progress", name: str, total: float | None, unit: str) -> None:
+        self._progress = progress
+        self.name = name
+        self.total = total
+        self.unit = unit
+        self.done = 0.0
+        self._scale = 1.0
+        self._lock = threading.Lock()
+
+    def expect(self, total: float) -> None:
+        """Set the stage total once it is known (e.g. after decoding the file header)."""
+        self.total = total
+
+    def advance(self, amount: float = 1) -> None:
+        self._progress.check()
+        with self._lock:
+            self.done += amount * self._scale
+            if self.total is not None:
+                self.done = min(self.done, self.total)
+            now = time.perf_counter()
+            if now - self._last < self._progress.min_interval:
+                return
+            self._last = now
+        self._emit(now)
+
+    @contextmanager
+    def span(self, amount: float, local_total: float) -> Iterator[None]:
+        outer, start = self._scale, self.done
+        self._scale = outer * amount / local_total if local_total > 0 else 0.0
+        try:
+            yield
+        finally:
+            self._scale = outer
+        # Top up whatever the inner code did not report, e.g. trackers without chunks.
+        missing = start + amount * outer - self.done
+        self.advance(missing / outer if outer and missing > 0 else 0.0)
+
+    def _emit(self, now: float) -> None:
+        fraction = min(self.done / self.total, 1.0) if self.total else 0.0
+        elapsed = now - self._started
+        eta = elapsed * (1.0 - fraction) / fraction if fraction > 0 else None
+        self._progress._send(
+            ProgressEvent(
+                stage=self.name,
+                fraction=fraction,
+                done=self.done,
+                total=self.total,
+                unit=self.unit,
+                elapsed_sec=elapsed,
+                eta_sec=eta,
+            )
+        )
+
+    def __enter__(self) -> "_Task":
+        self._progress.check()
+        self._started = self._last = time.perf_counter()
+        self._token = _ACTIVE.set(self)
+        self._emit(self._started)
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        _ACTIVE.reset(self._token)
+        if exc_type is None:
+            if self.total is None:
+                self.total = self.done
+            self.done = self.total
+            self._emit(time.perf_counter())
+
+
+class _NullTask:
+    __slots__ = ()
+
+    def expect(self, total: float) -> None:
+        pass
+
+    def advance(self, amount: float = 1) -> None:
+        pass
+
+    def span(self, amount: float, local_total: float):
+        return nullcontext()
+
+    def __enter__(self) -> "_NullTask":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_TASK = _NullTask()
+
+
+class Progress:
+    """Emits :class:`ProgressEvent` objects to ``on_event`` and honours ``cancel``.
+
+    Events within a stage are throttled to one per ``min_interval`` seconds;
+    the first and last event of every stage are always sent.
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        on_event: Callable[[ProgressEvent], None] | None = None,
+        cancel: CancelToken | None = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+    ) -> None:
+        self.on_event = on_event
+        self.cancel = cancel
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, total: float | None = None, unit: str = "frames") -> _Task:
+        return _Task(self, name, total, unit)
+
+    def check(self) -> None:
+        """Raise :class:`Cancelled` if the cancel token has been set."""
+        if self.cancel is not None and self.cancel.cancelled:
+            raise Cancelled("Conversion cancelled")
+
+    def _send(self, event: ProgressEvent) -> None:
+        if self.on_event is not None:
+            with self._lock:
+                self.on_event(event)
+
+
+class NullProgress:
+    """Disabled reporter: stages are a shared no-op and nothing is ever cancelled."""
+
+    enabled = False
+
+    def stage(self, name: str, total: float | None = None, unit: str = "frames") -> _NullTask:
+        return _NULL_TASK
+
+    def check(self) -> None:
+        pass
+
+
+NULL_PROGRESS = NullProgress()
+
+
+def active() -> "_Task | _NullTask":
+    """The stage open in the current context, or a no-op stand-in."""
+    return _ACTIVE.get() or _NULL_TASK
+
+
+def advance(amount: float = 1) -> None:
+    """Report ``amount`` units of work on the active stage; raises :class:`Cancelled` if cancelled."""
+    task = _ACTIVE.get()
+    if task is not None:
+        task.advance(amount)
+
+
+def checkpoint() -> None:
+    """Raise :class:`Cancelled` if the run owning the active stage has been cancelled."""
+    task = _ACTIVE.get()
+    if task is not None:
+        task._progress.check()
+
+
+def span(amount: float, local_total: float):
+    """Map the next ``local_total`` units reported in this block onto ``amount`` units of the enclosing scope."""
+    task = _ACTIVE.get()
+    return task.span(amount, local_total) if task is not None else nullcontext()
+
+
+def json_lines(stream: IO[str], extra: Dict[str, Any] | None = None) -> Callable[[ProgressEvent], None]:
+    """An ``on_event`` callback writing each event as one JSON line to ``stream``."""
+
+    def write(event: ProgressEvent) -> None:
+        stream.write(json.dumps({**(extra or {}), **event.to_dict()}) + "\n")
+        stream.flush()
+
+    return write
@@ -0,0 +1,177 @@
+"""Pitch tracking restricted to energy-gated regions, optionally across processes.
+
+Frames quieter than the note gate (see :func:`tts2sv.notes.energy_gate`) are
+discarded by note building whatever their pitch, so only the louder regions
+need tracking. Regions are padded with context, split into bounded pieces,
+tracked independently (in a process pool when ``workers > 1``) and written
+back onto the global ``hop_length`` frame grid; frames outside every region
+stay unvoiced. A ``bounds`` callback can narrow each piece's pitch range or
+skip the piece (see :mod:`tts2sv.coarse`).
+
+The pool is created on first use and kept for later analyses
+(:func:`worker_pool`); its processes import librosa and compile pyin once,
+when they start, instead of on every call.
+"""
+from __future__ import annotations
+
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from . import f0 as f0_engines, progress
+
+CONTEXT_SECONDS = 0.25
+MAX_PIECE_SECONDS = 4.0
+
+Region = Tuple[int, int]
+PieceBounds = Callable[[int, int], "Tuple[float, float] | None"]
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_WORKERS = 0
+
+
+def candidate_regions(mask, context_frames: int) -> List[Region]:
+    """Half-open frame ranges ``[first, last)`` covering runs of ``mask``, merged when their padding would touch."""
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return []
+    edges = np.flatnonzero(np.diff(np.concatenate([[False], mask, [False]]).astype(np.int8)))
+    starts, stops = edges[0::2], edges[1::2]
+    regions: List[Region] = []
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        if regions and start - regions[-1][1] <= 2 * context_frames:
+            regions[-1] = (regions[-1][0], stop)
+        else:
+            regions.append((start, stop))
+    return regions
+
+
+def split_regions(regions: List[Region], max_frames: int) -> List[Region]:
+    """Cut regions longer than ``max_frames`` into near-equal consecutive pieces."""
+    pieces: List[Region] = []
+    for first, last in regions:
+        count = max(1, -(-(last - first) // max_frames))
+        bounds = np.linspace(first, last, count + 1).round().astype(int).tolist()
+        pieces.extend(zip(bounds[:-1], bounds[1:]))
+    return pieces
+
+
+def track_pitch_regions(
+    audio,
+    sr: int,
+    fmin: float,
+    fmax: float,
+    hop_length: int,
+    mask,
+    engine: str = "pyin",
+    workers: int = 1,
+    bounds: PieceBounds | None = None,
+) -> f0_engines.PitchTrack:
+    """Track pitch only around frames where ``mask`` is set.
+
+    Each piece is analysed with ``CONTEXT_SECONDS`` of real signal (at least
+    half an analysis frame) on both sides, so frames inside it see the same
+    samples as in a whole-signal run; only trackers with temporal smoothing
+    (pyin's Viterbi pass) can differ slightly near piece boundaries.
+
+    ``bounds(first, last)`` is asked for every piece's ``(fmin, fmax)``
+    before tracking starts; ``None`` leaves the piece unvoiced without
+    tracking it.
+    """
+    if np is None:
+        raise ImportError("numpy is required for pitch tracking")
+    n_frames = 1 + len(audio) // hop_length
+    half_frame = f0_engines.frame_length_for(sr, fmin) // 2
+    context = max(-(-half_frame // hop_length), int(round(CONTEXT_SECONDS * sr / hop_length))) + 1
+    max_frames = max(int(MAX_PIECE_SECONDS * sr / hop_length), 1)
+    pieces = split_regions(candidate_regions(np.asarray(mask)[:n_frames], context), max_frames)
+
+    f0 = np.full(n_frames, np.nan)
+    voiced_prob = np.zeros(n_frames)
+    jobs = []
+    for first, last in pieces:
+        piece_range = (fmin, fmax) if bounds is None else bounds(first, last)
+        if piece_range is None:
+            continue
+        lo = max(first - context, 0)
+        hi = min(last + context, n_frames)
+        samples = audio[lo * hop_length : min((hi - 1) * hop_length + 1, len(audio))]
+        jobs.append(((first, last, lo), (samples, sr, *piece_range, hop_length, engine)))
+
+    # Gated and skipped frames cost nothing; report them up front so progress tracks the real work.
+    progress.advance(n_frames - sum(last - first for (first, last, _), _ in jobs))
+    tracks = []
+    if workers > 1 and len(jobs) > 1:
+        futures = [worker_pool(workers).submit(_track_piece, job[1]) for job in jobs]
+        try:
+            for ((first, last, _), _), future in zip(jobs, futures):
+                tracks.append(future.result())
+                progress.advance(last - first)
+        except BaseException as exc:
+            for future in futures:
+                future.cancel()
+            if isinstance(exc, BrokenProcessPool):
+                shutdown_pool()
+            raise
+    else:
+        for (first, last, lo), job in jobs:
+            with progress.span(last - first, 1 + len(job[0]) // hop_length):
+                tracks.append(_track_piece(job))
+
+    for ((first, last, lo), _), track in zip(jobs, tracks):
+        f0[first:last] = track.f0[first - lo : last - lo]
+        voiced_prob[first:last] = track.voiced_prob[first - lo : last - lo]
+    return f0_engines.PitchTrack(f0=f0, voiced_prob=voiced_prob)
+
+
+def _track_piece(job) -> f0_engines.PitchTrack:
+    samples, sr, fmin, fmax, hop_length, engine = job
+    return f0_engines.track_pitch(samples, sr=sr, fmin=fmin, fmax=fmax, hop_length=hop_length, engine=engine)
+
+
+def worker_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared pool of ``workers`` processes, created on first use and reused by later calls."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != workers:
+        shutdown_pool()
+        _POOL = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        _POOL_WORKERS = workers
+    return _POOL
+
+
+def warm_pool(workers: int) -> None:
+    """Start the shared pool now and wait for its workers, so the first analysis finds them ready."""
+    if workers > 1:
+        list(worker_pool(workers).map(_ping, range(workers)))
+
+
+@atexit.register
+def shutdown_pool() -> None:
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown(cancel_futures=True)
+    _POOL, _POOL_WORKERS = None, 0
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import the trackers and compile pyin before the first piece arrives."""
+    from .notes import FMAX_MIDI, FMIN_MIDI, HOP_LENGTH, REFERENCE_SR
+    from .pipeline import WARM_UP_SECONDS
+
+    t = np.arange(int(WARM_UP_SECONDS * REFERENCE_SR)) / REFERENCE_SR
+    tone = (0.2 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+    fmin, fmax = f0_engines.midi_to_hz([FMIN_MIDI, FMAX_MIDI]).tolist()
+    try:
+        f0_engines.track_pitch(tone, sr=REFERENCE_SR, fmin=fmin, fmax=fmax, hop_length=HOP_LENGTH, engine="pyin")
+    except ImportError:  # pragma: no cover - frame-wise engines still work without librosa
+        pass
+
+
+def _ping(_: int) -> None:
+    return None
@@ -0,0 +1,275 @@
+"""Long-lived conversion server speaking JSON lines over stdio or a local socket.
+
+Each request is one JSON object per line::
+
+    {"id": 1, "argv": ["--wav", "line.wav", "--text", "Hello"]}
+    {"id": 2, "options": {"wav": "line.wav", "text": "Hello", "bpm": 96}}
+    {"id": 3, "op": "ping"}
+    {"id": 4, "op": "cancel", "target": 1}
+    {"op": "shutdown"}
+
+``argv`` and ``options`` accept exactly what ``tts2sv.cli.parse_args`` does.
+An optional ``cwd`` resolves relative ``wav``/``out_prefix`` paths. Every
+request is answered with one JSON line carrying the same ``id``. Conversions
+run one at a time on a worker thread, so ``cancel`` ops are read while one is
+in progress; a cancelled conversion stops at the next chunk boundary and
+answers ``{"ok": false, "cancelled": true}`` without leaving output files.
+With ``"progress": true`` a conversion also streams
+``{"id": 1, "event": "progress", ...}`` lines (see :mod:`tts2sv.progress`)
+ahead of its response.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, Mapping, Sequence
+
+from . import pipeline
+from .progress import NULL_PROGRESS, CancelToken, Cancelled, NullProgress, Progress, json_lines
+
+_CONVERT_LOCK = threading.Lock()
+
+
+class RequestError(ValueError):
+    """Raised when a request line is malformed."""
+
+
+def handle_request(request: Mapping[str, Any], progress: "Progress | NullProgress" = NULL_PROGRESS) -> dict:
+    """Process one decoded request and build its response."""
+    request_id = request.get("id")
+    op = request.get("op", "convert")
+    if op == "ping":
+        return {"id": request_id, "ok": True, "pid": os.getpid()}
+    if op != "convert":
+        return {"id": request_id, "ok": False, "error": f"Unknown op '{op}'"}
+
+    args, error = _parse(request)
+    return error if args is None else _convert(request_id, args, progress)
+
+
+def serve_stream(reader: IO[str], writer: IO[str]) -> None:
+    """Answer JSON-line requests from ``reader`` until EOF or a shutdown op.
+
+    Options are validated as lines arrive, so malformed requests are answered
+    in order; valid conversions queue for the worker thread. Queued work is
+    finished before the shutdown acknowledgement (or EOF) ends the session.
+    """
+    writer = _LockedWriter(writer)  # type: ignore[assignment]
+    running: Dict[str, CancelToken] = {}
+    jobs: queue.Queue = queue.Queue()
+    worker = threading.Thread(target=_convert_worker, args=(jobs, writer, running), name="tts2sv-serve", daemon=True)
+    worker.start()
+    shutdown = None
+    try:
+        for line in reader:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise RequestError("Request must be a JSON object")
+            except (json.JSONDecodeError, RequestError) as exc:
+                _write(writer, {"id": None, "ok": False, "error": f"Malformed request: {exc}"})
+                continue
+
+            op = request.get("op", "convert")
+            if op == "shutdown":
+                shutdown = request
+                break
+            if op == "cancel":
+                token = running.get(_job_key(request.get("target")))
+                if token is not None:
+                    token.cancel()
+                _write(writer, {"id": request.get("id"), "ok": token is not None})
+            elif op == "convert":
+                args, error = _parse(request)
+                if args is None:
+                    _write(writer, error)
+                    continue
+                token = running[_job_key(request.get("id"))] = CancelToken()
+                jobs.put((request, args, token))
+            else:
+                _write(writer, handle_request(request))
+    finally:
+        jobs.put(None)
+        worker.join()
+    if shutdown is not None:
+        _write(writer, {"id": shutdown.get("id"), "ok": True})
+
+
+def serve_socket(path: str | None = None, port: int | None = None) -> None:
+    """Serve connections on a Unix socket (``path``) or on localhost ``port``."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            reader = (line.decode("utf-8") for line in self.rfile)
+            writer = _SocketWriter(self.wfile)
+            serve_stream(reader, writer)  # type: ignore[arg-type]
+
+    if path is not None:
+        socket_path = Path(path)
+        if socket_path.exists():
+            socket_path.unlink()
+        server: socketserver.BaseServer = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+        print(f"tts2sv server listening on {socket_path}", file=sys.stderr)
+    else:
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", port or 0), Handler)
+        print(f"tts2sv server listening on 127.0.0.1:{server.server_address[1]}", file=sys.stderr)
+
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:  # pragma: no cover - interactive shutdown
+            pass
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="tts2sv serve",
+        description="Keep tts2sv warm and answer JSON-line conversion requests",
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--socket", help="Listen on this Unix domain socket instead of stdio")
+    target.add_argument("--port", type=int, help="Listen on this localhost TCP port instead of stdio")
+    parser.add_argument("--no-warm-up", action="store_true", help="Skip importing and compiling the analysis stack at start-up")
+    parser.add_argument(
+        "--pitch-workers",
+        type=int,
+        default=None,
+        help="Start and warm this many region-tracking processes up front for requests using --pitch-workers",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if not args.no_warm_up:
+        pipeline.warm_up(args.pitch_workers)
+
+    if args.socket is not None or args.port is not None:
+        serve_socket(path=args.socket, port=args.port)
+        return
+
+    _write(sys.stdout, {"event": "ready", "pid": os.getpid()})
+    serve_stream(sys.stdin, sys.stdout)
+
+
+def _parse(request: Mapping[str, Any]) -> tuple[argparse.Namespace | None, dict | None]:
+    try:
+        return _request_args(request), None
+    except SystemExit as exc:
+        return None, {"id": request.get("id"), "ok": False, "error": f"invalid options (exit {exc.code})"}
+    except Exception as exc:
+        return None, {"id": request.get("id"), "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def _convert(request_id: Any, args: argparse.Namespace, progress: "Progress | NullProgress") -> dict:
+    started = time.perf_counter()
+    try:
+        with _CONVERT_LOCK:
+            result = pipeline.convert(args, progress=progress)
+    except Cancelled:
+        return {"id": request_id, "ok": False, "cancelled": True, "error": "Cancelled"}
+    except Exception as exc:
+        return {"id": request_id, "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    return {
+        "id": request_id,
+        "ok": True,
+        "result": {
+            "notes": result.note_count,
+            "syllables": result.syllable_count,
+            "splits_applied": result.splits_applied,
+            "filler_notes": result.filler_notes,
+            "outputs": [str(path) for path in result.outputs],
+            "export_seconds": result.export_seconds,
+            "curve_points": result.curve_points,
+            "stages": [record.to_dict() for record in result.stages],
+            "summary": result.summary(),
+            "seconds": time.perf_counter() - started,
+        },
+    }
+
+
+def _convert_worker(jobs: queue.Queue, writer: IO[str], running: Dict[str, CancelToken]) -> None:
+    while (job := jobs.get()) is not None:
+        request, args, token = job
+        request_id = request.get("id")
+        on_event = json_lines(writer, extra={"id": request_id}) if request.get("progress") else None
+        response = _convert(request_id, args, Progress(on_event=on_event, cancel=token))
+        if running.get(_job_key(request_id)) is token:
+            del running[_job_key(request_id)]
+        _write(writer, response)
+
+
+def _job_key(request_id: Any) -> str:
+    return json.dumps(request_id, sort_keys=True)
+
+
+def _request_args(request: Mapping[str, Any]) -> argparse.Namespace:
+    from .batch import row_to_argv
+    from .cli import build_parser as build_cli_parser, parse_args, sweeping
+
+    if "argv" in request:
+        argv = [str(token) for token in request["argv"]]
+    elif "options" in request:
+        argv = row_to_argv(request["options"], build_cli_parser())
+    else:
+        raise RequestError("Request needs 'argv' or 'options'")
+
+    args = parse_args(argv)
+    if args.manifest is not None:
+        raise RequestError("Batch manifests are not supported by the server")
+    if args.stdin_pcm:
+        raise RequestError("--stdin-pcm is not supported by the server")
+    if sweeping(args):
+        raise RequestError("--sweep-* options are not supported by the server")
+    if args.timings_json:
+        raise RequestError("--timings-json is not supported by the server; stage records are in the response")
+
+    cwd = request.get("cwd")
+    if cwd:
+        if not Path(args.wav).is_absolute():
+            args.wav = str(Path(cwd) / args.wav)
+        if not Path(args.out_prefix).is_absolute():
+            args.out_prefix = str(Path(cwd) / args.out_prefix)
+    return args
+
+
+def _write(writer: IO[str], payload: Mapping[str, Any]) -> None:
+    writer.write(json.dumps(payload) + "\n")
+    writer.flush()
+
+
+class _LockedWriter:
+    """Serialises whole-line writes from the reader and worker threads."""
+
+    def __init__(self, writer: IO[str]) -> None:
+        self._writer = writer
+        self._lock = threading.Lock()
+
+    def write(self, data: str) -> None:
+        with self._lock:
+            self._writer.write(data)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._writer.flush()
+
+
+class _SocketWriter:
+    def __init__(self, wfile: Any) -> None:
+        self._wfile = wfile
+
+    def write(self, data: str) -> None:
+        self._wfile.write(data.encode("utf-8"))
+
+    def flush(self) -> None:
+        self._wfile.flush()
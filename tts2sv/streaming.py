@@ -0,0 +1,142 @@
+"""Memory-bounded analysis of long recordings.
+
+The file is read twice in blocks: once to gather the normalisation statistics
+(:func:`tts2sv.audio.scan_audio`) and once to analyse each block. Blocks are
+aligned to whole hops (at the analysis rate, when decimating) and padded with
+enough context that every frame sees exactly the samples it would see in the
+in-memory path, so only the frame-wise contours (a few bytes per hop) grow
+with the file length. Frame-wise trackers add a cheap RMS-only pass up front
+so that, as in memory, they skip the frames below the file's energy gate.
+"""
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from . import audio, f0 as f0_engines, notes, progress
+from .framing import Framing
+
+DEFAULT_BLOCK_SECONDS = 30.0
+
+
+def context_samples(sr: int, hop_length: int = notes.HOP_LENGTH) -> int:
+    """Context needed on each side of a block at rate ``sr``, rounded up to whole hops."""
+    fmin = float(f0_engines.midi_to_hz(notes.FMIN_MIDI))
+    half_frame = max(f0_engines.frame_length_for(sr, fmin), notes.rms_frame_length_for(sr)) // 2
+    hops = -(-half_frame // hop_length)
+    return (hops + 1) * hop_length
+
+
+def block_samples(sr: int, block_seconds: float, unit: int = notes.HOP_LENGTH) -> int:
+    units = max(int(block_seconds * sr) // unit, 1)
+    return units * unit
+
+
+def alignment_unit(up: int, down: int, hop_length: int) -> int:
+    """Smallest input-sample step that lands on a whole hop after resampling by ``up / down``."""
+    return math.lcm(up, down * hop_length) // up
+
+
+def analyze_file(
+    path: str | Path,
+    f0_engine: str = notes.DEFAULT_F0_ENGINE,
+    block_seconds: float = DEFAULT_BLOCK_SECONDS,
+    cache=None,
+    analysis_sr: int | None = None,
+    hop_ms: float | None = None,
+) -> tuple[notes.Analysis, audio.AudioStats]:
+    """Analyse ``path`` block by block, returning contours on the global frame grid."""
+    if np is None:
+        raise ImportError("numpy is required for streaming analysis")
+
+    stats = audio.scan_audio(path)
+    if stats.length == 0:
+        raise ValueError("Audio buffer is empty")
+
+    params = notes.analysis_params(stats.sr, f0_engine, analysis_sr, hop_ms)
+    rate, hop = params["analysis_sr"], params["hop_length"]
+    key = None
+    if cache is not None:
+        key = cache.key_for_content(stats.content_hash, {**params, "source": "stream", "length": stats.length})
+        cached = notes.load_cached_analysis(cache, key, rate, hop)
+        if cached is not None:
+            return cached, stats
+
+    up, down = audio.resample_ratio(stats.sr, rate)
+    unit = alignment_unit(up, down, hop)
+    n_frames = 1 + (-(-stats.length * up // down)) // hop
+    f0 = np.full(n_frames, np.nan)
+    voiced_prob = np.zeros(n_frames)
+    rms = np.zeros(n_frames, dtype=np.float32)
+    progress.active().expect(n_frames)
+
+    block_size = block_samples(stats.sr, block_seconds, unit)
+    context = -(-context_samples(rate, hop) * down // (up * unit)) * unit
+    if up != down:
+        context += unit  # room for the resampling filter at the block edges
+
+    def blocks():
+        for start, core_start, samples in audio.iter_normalised_blocks(stats, block_size, context):
+            first = core_start * up // down // hop
+            last = min((core_start + block_size) * up // down // hop, n_frames)
+            yield first, last, start * up // down // hop, audio.decimate(samples, stats.sr, rate)
+
+    track_mask = None
+    if f0_engine in f0_engines.FRAME_KERNELS:
+        # The energy gate is a percentile over the whole file, so a cheap RMS-only
+        # pass comes first and lets the trackers skip gated frames in every block.
+        rms_frame_length = notes.rms_frame_length_for(rate)
+        for first, last, offset, samples in blocks():
+            block_rms = Framing(samples, hop, rms_frame_length).rms(rms_frame_length)
+            rms[first:last] = block_rms[first - offset : last - offset]
+        track_mask = np.concatenate([notes.tracking_mask(rms, hop / rate), np.zeros(1, dtype=bool)])
+
+    for first, last, offset, samples in blocks():
+        frames = 1 + len(samples) // hop
+        select = None
+        if track_mask is not None:
+            select = track_mask[np.minimum(np.arange(offset, offset + frames), n_frames)]
+        with progress.span(last - first, frames):
+            block = notes.analyze_block(samples, sr=rate, f0_engine=f0_engine, hop_length=hop, track_mask=select)
+        f0[first:last] = block.f0[first - offset : last - offset]
+        voiced_prob[first:last] = block.voiced_prob[first - offset : last - offset]
+        rms[first:last] = block.rms[first - offset : last - offset]
+
+    analysis = notes.Analysis(f0=f0, voiced_prob=voiced_prob, rms=rms, sr=rate, hop_length=hop)
+    if cache is not None and key is not None:
+        notes.store_analysis(cache, key, analysis)
+    return analysis, stats
+
+
+def extract_notes_from_file(
+    path: str | Path,
+    bpm: float,
+    min_note_beats: float,
+    f0_engine: str = notes.DEFAULT_F0_ENGINE,
+    block_seconds: float = DEFAULT_BLOCK_SECONDS,
+    cache=None,
+    timebase: int = notes.DEFAULT_TIMEBASE,
+    analysis_sr: int | None = None,
+    hop_ms: float | None = None,
+) -> notes.ExtractionSummary:
+    """Streaming counterpart of ``load_audio`` + ``extract_notes``."""
+    analysis, stats = analyze_file(
+        path,
+        f0_engine=f0_engine,
+        block_seconds=block_seconds,
+        cache=cache,
+        analysis_sr=analysis_sr,
+        hop_ms=hop_ms,
+    )
+    return notes.build_notes(
+        analysis,
+        total_duration_sec=stats.duration_sec,
+        bpm=bpm,
+        min_note_beats=min_note_beats,
+        timebase=timebase,
+    )
@@ -0,0 +1,175 @@
+"""Tempo and quantisation-grid sweeps over a single analysis.
+
+Only quantisation depends on ``bpm``, the grid step and ``min_note_beats``,
+so a sweep segments the analysis once (:func:`tts2sv.notes.find_note_segments`)
+and scores every combination in one vectorised pass. Candidates are ranked by
+
+* ``grid_error`` — the mean distance between each note's length in beats and
+  its quantised length, in grid steps (0 when every note lands on the grid,
+  about 0.25 for lengths unrelated to the tempo; notes raised to the minimum
+  length count in full), and
+* ``shortfall`` — syllables that cannot get a note of their own because the
+  greedy aligner's halving (:func:`tts2sv.align.align_syllables_to_notes`)
+  cannot cut the quantised notes into enough pieces of ``min_note_beats``.
+
+``score = grid_error + FIT_WEIGHT * shortfall / syllables``; ties go to the
+coarser grid, then to the tempo nearest the reference ``bpm``.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Sequence
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from .notetable import DEFAULT_TIMEBASE
+from .notes import Segments
+
+FIT_WEIGHT = 1.0
+MAX_CHUNK_ELEMENTS = 1 << 22  # points x notes scored per vectorised block
+MAX_POINTS = 100_000
+
+
+@dataclass
+class SweepCandidate:
+    bpm: float
+    grid: float
+    min_note_beats: float
+    score: float
+    grid_error: float
+    error_sec: float
+    drift_sec: float
+    shortfall: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def parse_values(value: str | Iterable[float]) -> List[float]:
+    """Parse ``"90,100,120"`` or an inclusive ``"start:stop:step"`` range (``"80:160:2"``)."""
+    if not isinstance(value, str):
+        values = [float(item) for item in value]
+    elif ":" in value:
+        parts = value.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"Range '{value}' must be start:stop:step")
+        start, stop, step = (float(part) for part in parts)
+        if step <= 0 or stop < start:
+            raise ValueError(f"Range '{value}' needs start <= stop and a positive step")
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        values = [round(start + idx * step, 9) for idx in range(count)]
+    else:
+        values = [float(item) for item in value.split(",") if item.strip()]
+    if not values:
+        raise ValueError("At least one sweep value is required")
+    if any(item <= 0 for item in values):
+        raise ValueError("Sweep values must be positive")
+    return values
+
+
+def sweep_points(bpms: Sequence[float], grids: Sequence[float], min_notes: Sequence[float]):
+    """Every ``(bpm, grid, min_note_beats)`` combination as three flat arrays."""
+    bpm, grid, min_note = np.meshgrid(
+        np.asarray(bpms, dtype=np.float64),
+        np.asarray(grids, dtype=np.float64),
+        np.asarray(min_notes, dtype=np.float64),
+        indexing="ij",
+    )
+    if bpm.size > MAX_POINTS:
+        raise ValueError(f"Sweep has {bpm.size} points; the limit is {MAX_POINTS}")
+    return bpm.ravel(), grid.ravel(), min_note.ravel()
+
+
+def rank_segments(
+    segments: Segments,
+    syllable_count: int,
+    bpms: Sequence[float],
+    grids: Sequence[float],
+    min_notes: Sequence[float],
+    timebase: int = DEFAULT_TIMEBASE,
+    reference_bpm: float | None = None,
+) -> List[SweepCandidate]:
+    """Score every sweep point against ``segments`` and return them best first.
+
+    Quantisation matches :func:`tts2sv.notetable.quantize_ticks`, so the top
+    candidate reproduces exactly the notes a single run with its settings
+    would build.
+    """
+    if np is None:
+        raise ImportError("numpy is required for sweeps")
+    bpm, grid, min_note = sweep_points(bpms, grids, min_notes)
+    durations = np.asarray(segments.duration_sec, dtype=np.float64)
+    count = len(bpm)
+    grid_error = np.empty(count)
+    error_beats = np.empty(count)
+    total_beats = np.empty(count)
+    capacity = np.empty(count, dtype=np.int64)
+
+    chunk = max(1, MAX_CHUNK_ELEMENTS // max(durations.size, 1))
+    for lo in range(0, count, chunk):
+        hi = min(lo + chunk, count)
+        step = grid[lo:hi, None]
+        minimum = min_note[lo:hi, None]
+        beats = durations[None, :] * (bpm[lo:hi, None] / 60.0)
+        quantized = np.round(beats / step) * step
+        quantized = np.where(beats <= 0, minimum, np.maximum(quantized, minimum))
+        error = np.abs(quantized - beats)
+        error_beats[lo:hi] = error.sum(axis=1)
+        grid_error[lo:hi] = (error / step).mean(axis=1)
+        total_beats[lo:hi] = quantized.sum(axis=1)
+        ticks = np.rint(quantized * timebase)
+        min_ticks = np.maximum(np.rint(minimum * timebase), 1)
+        capacity[lo:hi] = split_capacity(ticks.astype(np.int64), min_ticks.astype(np.int64)).sum(axis=1)
+
+    seconds_per_beat = 60.0 / bpm
+    error_sec = error_beats * seconds_per_beat
+    drift_sec = np.abs(total_beats * seconds_per_beat - durations.sum())
+    shortfall = np.maximum(syllable_count - capacity, 0)
+    score = grid_error + FIT_WEIGHT * shortfall / max(syllable_count, 1)
+
+    reference = float(np.median(bpm)) if reference_bpm is None else float(reference_bpm)
+    order = np.lexsort((np.abs(bpm - reference), -grid, np.round(score, 9)))
+    return [
+        SweepCandidate(
+            bpm=float(bpm[idx]),
+            grid=float(grid[idx]),
+            min_note_beats=float(min_note[idx]),
+            score=float(score[idx]),
+            grid_error=float(grid_error[idx]),
+            error_sec=float(error_sec[idx]),
+            drift_sec=float(drift_sec[idx]),
+            shortfall=int(shortfall[idx]),
+        )
+        for idx in order.tolist()
+    ]
+
+
+def split_capacity(ticks, min_ticks) -> "np.ndarray":
+    """Most pieces the greedy aligner's halving can cut each note of ``ticks`` into.
+
+    A piece is halved (longer half first) while it is at least twice
+    ``min_ticks``, so after ``k`` rounds the pieces are ``ticks >> k`` or one
+    tick longer. Halving stops for good at the first ``k`` where
+    ``ticks >> k`` falls below ``2 * min_ticks``; only the longer pieces
+    of that round can still be halved once more.
+    """
+    ticks = np.asarray(ticks, dtype=np.int64)
+    min_ticks = np.broadcast_to(np.asarray(min_ticks, dtype=np.int64), ticks.shape)
+    rounds = np.floor(np.log2(np.maximum(ticks // min_ticks, 1))).astype(np.int64)
+    pieces = np.left_shift(np.int64(1), rounds)
+    short = ticks >> rounds
+    longer = ticks - short * pieces
+    return pieces + np.where(short + 1 >= 2 * min_ticks, longer, 0)
+
+
+def format_table(candidates: Sequence[SweepCandidate], limit: int = 10) -> str:
+    lines = [f"{'rank':>4} {'bpm':>8} {'grid':>6} {'min':>6} {'score':>7} {'grid err':>8} {'err s':>7} {'drift s':>7} {'short':>5}"]
+    for rank, cand in enumerate(candidates[:limit], start=1):
+        lines.append(
+            f"{rank:>4} {cand.bpm:>8g} {cand.grid:>6g} {cand.min_note_beats:>6g} {cand.score:>7.4f} "
+            f"{cand.grid_error:>8.4f} {cand.error_sec:>7.3f} {cand.drift_sec:>7.3f} {cand.shortfall:>5}"
+        )
+    return "\n".join(lines)
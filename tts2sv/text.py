@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import Iterable, List
+from typing import Iterable, List, Tuple
 
 try:
     import pyphen
@@ -13,6 +14,22 @@ except ImportError:  # pragma: no cover - optional dependency
 
 WORD_RE = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?")
 VOWEL_GROUP_RE = re.compile(r"[aeiouyAEIOUY]+")
+TOKEN_RE = re.compile(r"\w+|[^\w\s]", flags=re.UNICODE)
+FALLBACK_RE = re.compile(r"[^aeiouy]*[aeiouy]+(?:[^aeiouy](?=[^aeiouy]|$))?", flags=re.IGNORECASE)
+WORD_CACHE_SIZE = 65536
+
+
+@dataclass
+class SyllableCacheStats:
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
 
 
 class TextSyllabifier:
@@ -29,43 +46,52 @@ class TextSyllabifier:
         tokens: List[str] = []
         for raw_token in self._tokenize(text):
             if WORD_RE.fullmatch(raw_token):
-                tokens.extend(self._syllabify_word(raw_token))
+                tokens.extend(syllabify_word(raw_token, self.lang))
             else:
                 tokens.append(raw_token)
         return tokens
 
     def _tokenize(self, text: str) -> Iterable[str]:
-        splitter = re.finditer(r"\w+|[^\w\s]", text, flags=re.UNICODE)
-        for match in splitter:
+        for match in TOKEN_RE.finditer(text):
             yield match.group(0)
 
     def _syllabify_word(self, word: str) -> List[str]:
-        hyphenated = self._hyphenate(word)
-        if hyphenated:
-            return [segment for segment in hyphenated.split("-") if segment]
-        return self._fallback_syllables(word)
+        return list(syllabify_word(word, self.lang))
 
     def _fallback_syllables(self, word: str) -> List[str]:
-        syllables = re.findall(
-            r"[^aeiouy]*[aeiouy]+(?:[^aeiouy](?=[^aeiouy]|$))?",
-            word,
-            flags=re.IGNORECASE,
-        )
-        if not syllables:
-            return [word]
-        consumed = sum(len(part) for part in syllables)
-        if consumed < len(word):
-            syllables[-1] = syllables[-1] + word[consumed:]
-        return syllables
+        return _fallback_syllables(word)
 
     def _hyphenate(self, word: str) -> str | None:
-        dictionary = get_pyphen_dict(self.lang)
-        if dictionary is None:
-            return None
-        hyphenated = dictionary.inserted(word)
-        if hyphenated == word:
-            return None
-        return hyphenated
+        return _hyphenate(word, self.lang)
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def syllabify_word(word: str, lang: str = "en") -> Tuple[str, ...]:
+    """Syllables of a single word, memoised per ``(word, lang)`` in a bounded LRU."""
+    hyphenated = _hyphenate(word, lang)
+    if hyphenated:
+        return tuple(segment for segment in hyphenated.split("-") if segment)
+    return tuple(_fallback_syllables(word))
+
+
+def _fallback_syllables(word: str) -> List[str]:
+    syllables = FALLBACK_RE.findall(word)
+    if not syllables:
+        return [word]
+    consumed = sum(len(part) for part in syllables)
+    if consumed < len(word):
+        syllables[-1] = syllables[-1] + word[consumed:]
+    return syllables
+
+
+def _hyphenate(word: str, lang: str) -> str | None:
+    dictionary = get_pyphen_dict(lang)
+    if dictionary is None:
+        return None
+    hyphenated = dictionary.inserted(word)
+    if hyphenated == word:
+        return None
+    return hyphenated
 
 
 @lru_cache(maxsize=None)
@@ -78,6 +104,32 @@ def get_pyphen_dict(lang: str):  # type: ignore[no-untyped-def]
         return pyphen.Pyphen(lang="en")
 
 
+def preload_dictionaries(langs: Iterable[str] = ("en",)) -> None:
+    """Load pyphen dictionaries up front, e.g. before forking workers so they share them."""
+    for lang in langs:
+        get_pyphen_dict(lang)
+
+
+@lru_cache(maxsize=None)
+def _syllabifier(lang: str) -> TextSyllabifier:
+    return TextSyllabifier(lang=lang)
+
+
 def syllabify_text(text: str, lang: str = "en") -> List[str]:
     """Convenience wrapper to syllabify a line of text."""
-    return TextSyllabifier(lang=lang).syllabify(text)
+    return _syllabifier(lang).syllabify(text)
+
+
+def syllabify_many(lines: Iterable[str], lang: str = "en") -> List[List[str]]:
+    """Syllabify many lines with one syllabifier; repeated words hit the word cache."""
+    syllabifier = _syllabifier(lang)
+    return [syllabifier.syllabify(line) for line in lines]
+
+
+def cache_stats() -> SyllableCacheStats:
+    info = syllabify_word.cache_info()
+    return SyllableCacheStats(hits=info.hits, misses=info.misses, size=info.currsize, maxsize=info.maxsize or 0)
+
+
+def clear_cache() -> None:
+    syllabify_word.cache_clear()